@@ -0,0 +1,324 @@
+"""
+Hand image atlas and rendered-text cache.
+
+All hand images are decoded and scaled once, then packed into one atlas
+surface together with their mirrored copies. Builds ship that atlas
+prebuilt as a raw-pixel pack (see pack_assets.py) that is memory-mapped at
+start instead of decoding PNGs. The game blits subsurfaces of
+that atlas, so drawing a frame never flips, scales or converts an image.
+Rendered text is kept in a small LRU cache for the same reason.
+
+The hand pump shown before a reveal is prerendered the same way: a
+PumpSheet holds the fist at every tilt of the pump, normal and mirrored,
+rotated once when the sheet is built.
+"""
+import mmap
+import os
+import struct
+import sys
+from collections import OrderedDict
+
+import pygame
+
+GRAY = (200, 200, 200)
+BLACK = (0, 0, 0)
+
+# Hand images are forced to these sizes
+HAND_SIZE = (200, 100)
+LOWER_HAND_SIZE = (200, 50)
+HAND_NUMBERS = range(0, 7)
+
+TEXT_CACHE_SIZE = 256
+
+# Scaled copies of the atlas kept, e.g. for switching window and fullscreen
+SCALED_ATLAS_CACHE_SIZE = 4
+
+# The pump tilts the fist up about its wrist by up to PUMP_ANGLE degrees,
+# in PUMP_FRAMES steps. The wrist is at the image's outer edge, this far
+# down as a fraction of its height.
+PUMP_ANGLE = 12
+PUMP_FRAMES = 9
+PUMP_WRIST_Y = 0.3
+
+# Prebuilt atlas written by pack_assets.py. Layout: header, one entry per
+# image (name, mirrored, x, y, width, height), then width * height raw
+# pixels. Entries are rects into the pixel block.
+PACK_PATH = "nimages/hands.pack"
+PACK_MAGIC = b"HCPK"
+PACK_VERSION = 1
+PACK_HEADER = struct.Struct("<4sHHHH")
+PACK_ENTRY = struct.Struct("<b?HHHH")
+PACK_PIXEL_FORMAT = "BGRA"
+
+
+def resource_path(relative_path):
+    """ Get absolute path to resource, works for dev and for PyInstaller """
+    try:
+        # PyInstaller creates a temp folder and stores path in _MEIPASS
+        base_path = sys._MEIPASS
+    except Exception:
+        base_path = os.path.abspath(".")
+
+    return os.path.join(base_path, relative_path)
+
+
+def load_image(name, size):
+    """Load and scale nimages/hands[name].png, or draw a labelled fallback."""
+    image_path = resource_path(f"nimages/hands[{name}].png")
+    try:
+        image_surface = pygame.image.load(image_path)
+        # Force scale the image to the new, fixed dimensions
+        return pygame.transform.scale(image_surface, size)
+    except pygame.error:
+        print(
+            f"Warning: Could not load image at {image_path}. Using fallback surface."
+        )
+        # Create a fallback surface with the hand number displayed
+        width, height = size
+        fallback_surface = pygame.Surface((width, height))
+        fallback_surface.fill(GRAY)
+        font = pygame.font.Font(None, 48)
+        text = font.render(str(name), True, BLACK)
+        text_rect = text.get_rect(center=(width / 2, height / 2))
+        fallback_surface.blit(text, text_rect)
+        return fallback_surface
+
+
+class HandAtlas:
+    """
+    Every hand image, scaled and mirrored, packed into one surface.
+
+    The atlas has two columns: images as loaded on the left, mirrored on
+    the right. Rows are hands[0]..hands[6] followed by the lower hand.
+    """
+
+    def __init__(self, surface, rects, source=None):
+        # rects maps (name, mirrored) to the image's area in the atlas
+        self.surface = surface
+        self.rects = rects
+        # What backs the surface pixels (e.g. an mmap); kept alive with it
+        self.source = source
+        # Subsurfaces share the atlas pixels; nothing is copied
+        self.hands = {}
+        self.mirrored_hands = {}
+        for (name, mirrored), rect in rects.items():
+            images = self.mirrored_hands if mirrored else self.hands
+            images[name] = surface.subsurface(rect)
+        self.lower_hand = self.hands.pop(-1)
+        self.mirrored_lower_hand = self.mirrored_hands.pop(-1)
+        self.scaled_atlases = {}
+        self.pump_sheet = None
+
+    @property
+    def pump(self):
+        """PumpSheet of this atlas's fist, built on first use."""
+        if self.pump_sheet is None:
+            self.pump_sheet = PumpSheet.build(self)
+        return self.pump_sheet
+
+    def scaled(self, scale):
+        """This atlas with every image resized by scale, cached per scale."""
+        if scale == 1:
+            return self
+        atlas = self.scaled_atlases.get(scale)
+        if atlas is None:
+            atlas = self.build_scaled(scale)
+            if len(self.scaled_atlases) >= SCALED_ATLAS_CACHE_SIZE:
+                del self.scaled_atlases[next(iter(self.scaled_atlases))]
+            self.scaled_atlases[scale] = atlas
+        return atlas
+
+    def build_scaled(self, scale):
+        # Images are scaled one by one so none picks up its neighbours'
+        # edge pixels
+        def edge(value):
+            return round(value * scale)
+
+        width, height = self.surface.get_size()
+        surface = pygame.Surface((edge(width), edge(height)), pygame.SRCALPHA)
+        rects = {}
+        for key, rect in self.rects.items():
+            scaled_rect = pygame.Rect(edge(rect.x), edge(rect.y),
+                                      edge(rect.right) - edge(rect.x),
+                                      edge(rect.bottom) - edge(rect.y))
+            image = pygame.transform.smoothscale(
+                self.surface.subsurface(rect), scaled_rect.size)
+            surface.blit(image, scaled_rect)
+            rects[key] = scaled_rect
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        return HandAtlas(surface, rects)
+
+    @classmethod
+    def load(cls, pack_path=None):
+        """Use the prebuilt asset pack when there is one, else the PNGs."""
+        pack_path = pack_path or resource_path(PACK_PATH)
+        if os.path.exists(pack_path):
+            try:
+                return cls.from_pack(pack_path)
+            except (OSError, ValueError) as error:
+                print(f"Warning: Could not read {pack_path} ({error}). "
+                      "Loading images instead.")
+        return cls.build()
+
+    @classmethod
+    def build(cls, images=None):
+        """Build the atlas from scaled images (loaded from PNGs by default)."""
+        # images maps a name (0..6 or -1) to an already scaled surface
+        if images is None:
+            images = load_images()
+        width = HAND_SIZE[0]
+        rows = [(i, HAND_SIZE) for i in HAND_NUMBERS]
+        rows.append((-1, LOWER_HAND_SIZE))
+
+        atlas = pygame.Surface((2 * width, sum(h for _, (_, h) in rows)),
+                               pygame.SRCALPHA)
+        rects = {}
+        y = 0
+        for name, (w, h) in rows:
+            image = images[name]
+            atlas.blit(image, (0, y))
+            atlas.blit(pygame.transform.flip(image, True, False), (width, y))
+            rects[name, False] = pygame.Rect(0, y, w, h)
+            rects[name, True] = pygame.Rect(width, y, w, h)
+            y += h
+
+        if pygame.display.get_surface() is not None:
+            atlas = atlas.convert_alpha()
+        return cls(atlas, rects)
+
+    @classmethod
+    def from_pack(cls, path):
+        """Memory-map an asset pack and use its pixels in place."""
+        with open(path, "rb") as pack_file:
+            data = mmap.mmap(pack_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, width, height, count = PACK_HEADER.unpack_from(
+                data)
+            if magic != PACK_MAGIC or version != PACK_VERSION:
+                raise ValueError("not a hand asset pack")
+            rects = {}
+            offset = PACK_HEADER.size
+            for _ in range(count):
+                name, mirrored, x, y, w, h = PACK_ENTRY.unpack_from(
+                    data, offset)
+                rects[name, bool(mirrored)] = pygame.Rect(x, y, w, h)
+                offset += PACK_ENTRY.size
+            size = width * height * 4
+            if len(data) != offset + size:
+                raise ValueError("truncated pixel data")
+            pixels = memoryview(data)[offset:]
+            # Pixels are stored in the usual display byte order, so the
+            # surface is used as is rather than converted
+            surface = pygame.image.frombuffer(pixels, (width, height),
+                                              PACK_PIXEL_FORMAT)
+        except Exception:
+            data.close()
+            raise
+        return cls(surface, rects, source=data)
+
+    def save_pack(self, path):
+        """Write the atlas as raw pixels behind a header of image rects."""
+        width, height = self.surface.get_size()
+        with open(path, "wb") as pack_file:
+            pack_file.write(PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, width,
+                                             height, len(self.rects)))
+            for (name, mirrored), rect in sorted(self.rects.items()):
+                pack_file.write(PACK_ENTRY.pack(name, mirrored, *rect))
+            pack_file.write(pygame.image.tobytes(self.surface,
+                                                 PACK_PIXEL_FORMAT))
+
+
+class PumpSheet:
+    """
+    The resting fist at each tilt of the pump, packed into one surface.
+
+    frames[mirrored][i] is (image, offset) for tilt i of PUMP_FRAMES: the
+    image blitted at the hand's usual position moved by offset keeps the
+    wrist in place. Images are subsurfaces of the sheet, cropped to their
+    visible pixels, so playing the pump is only blits.
+    """
+
+    def __init__(self, surface, frames):
+        self.surface = surface
+        self.frames = frames
+
+    @classmethod
+    def build(cls, atlas):
+        rows = []
+        for mirrored, fist in ((False, atlas.hands[0]),
+                               (True, atlas.mirrored_hands[0])):
+            width, height = fist.get_size()
+            # The bowler's wrist is on the right and tilts the other way
+            wrist = pygame.math.Vector2(width if mirrored else 0,
+                                        height * PUMP_WRIST_Y)
+            center = pygame.math.Vector2(width, height) / 2
+            row = []
+            for i in range(PUMP_FRAMES):
+                angle = PUMP_ANGLE * i / (PUMP_FRAMES - 1)
+                angle = -angle if mirrored else angle
+                image = pygame.transform.rotozoom(fist, angle, 1)
+                # Where the wrist ends up in the rotated image, which is
+                # centred on the original
+                turned = (wrist - center).rotate(-angle) + \
+                    pygame.math.Vector2(image.get_size()) / 2
+                crop = image.get_bounding_rect()
+                offset = (round(wrist.x - turned.x) + crop.x,
+                          round(wrist.y - turned.y) + crop.y)
+                row.append((image.subsurface(crop), offset))
+            rows.append(row)
+
+        # One shelf per side
+        width = max(sum(image.get_width() for image, _ in row)
+                    for row in rows)
+        heights = [max(image.get_height() for image, _ in row)
+                   for row in rows]
+        sheet = pygame.Surface((width, sum(heights)), pygame.SRCALPHA)
+        frames = ([], [])
+        y = 0
+        for mirrored, row in enumerate(rows):
+            x = 0
+            for image, offset in row:
+                sheet.blit(image, (x, y))
+                frames[mirrored].append((image.get_rect(topleft=(x, y)),
+                                         offset))
+                x += image.get_width()
+            y += heights[mirrored]
+        if pygame.display.get_surface() is not None:
+            sheet = sheet.convert_alpha()
+        return cls(sheet, tuple(tuple((sheet.subsurface(rect), offset)
+                                      for rect, offset in row)
+                                for row in frames))
+
+
+def load_images():
+    """Load every hand image from its PNG, scaled to its fixed size."""
+    images = {i: load_image(i, HAND_SIZE) for i in HAND_NUMBERS}
+    images[-1] = load_image(-1, LOWER_HAND_SIZE)
+    return images
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces keyed by (text, font, color)."""
+
+    def __init__(self, size=TEXT_CACHE_SIZE):
+        self.size = size
+        self.surfaces = OrderedDict()
+        self.renders = 0
+
+    def render(self, text, font, color):
+        key = (text, font, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            return surface
+        surface = font.render(text, True, color)
+        self.renders += 1
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.size:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """Drop every cached surface, e.g. once its fonts are replaced."""
+        self.surfaces.clear()
@@ -0,0 +1,8 @@
+"""
+Performance benchmarks for Odd or Even Hand Cricket.
+
+    python -m benchmarks           rendering, input, assets and rules
+    python -m benchmarks.game      just the pygame side (dummy video driver)
+    python -m benchmarks.rules     just the rules and simulation
+    python -m benchmarks.import_time
+"""
@@ -0,0 +1,47 @@
+"""
+Run the whole benchmark suite headless and optionally check for regressions.
+
+    python -m benchmarks --output results.json
+    python -m benchmarks --compare baseline.json   # exit 1 on a regression
+    python -m benchmarks --quick                   # fewer iterations
+
+A baseline is just an earlier --output file.
+"""
+import argparse
+import sys
+
+from benchmarks import decisions, game, report, rules
+from benchmarks.timing import calibration, ms
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description=__doc__.split("\n")[1])
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE",
+                        help="compare against an earlier results file")
+    parser.add_argument("--threshold", type=float,
+                        default=report.DEFAULT_THRESHOLD,
+                        help="relative slowdown counted as a regression")
+    parser.add_argument("--quick", action="store_true")
+    args = parser.parse_args()
+
+    results = {report.CALIBRATION: ms(calibration())}
+    results.update(game.run(args.quick))
+    results.update(rules.run(args.quick))
+    results.update(decisions.run(args.quick))
+    if args.output:
+        report.save(args.output, results)
+
+    if not args.compare:
+        report.print_results(results)
+        return
+    regressions = report.compare(results, report.load(args.compare),
+                                 args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Decisions per second of each batched strategy: one position per call, as
+in a live match, and a whole array of positions per call, as in bulk
+evaluation. Also whole matches per second between two strategies.
+
+    python -m benchmarks.decisions
+"""
+import numpy as np
+
+from benchmarks.timing import per_call, rate
+from montecarlo import simulate_strategies
+from strategies import STRATEGIES, positions
+
+
+def sample_positions(n, rng):
+    """n positions spread over both innings, sides and plausible scores."""
+    sample = positions(n)
+    sample["innings"] = rng.integers(1, 3, size=n)
+    sample["batting"] = rng.integers(0, 2, size=n) == 1
+    sample["score"] = rng.integers(0, 60, size=n)
+    chase = sample["innings"] == 2
+    sample["target"] = np.where(chase, sample["score"] +
+                                rng.integers(1, 40, size=n), 0)
+    sample["balls"] = rng.integers(0, 30, size=n)
+    return sample
+
+
+def bench_strategy(strategy, quick):
+    rng = np.random.default_rng(0)
+    one = sample_positions(1, rng)
+    size = 100_000 if quick else 1_000_000
+    bulk = sample_positions(size, rng)
+    # Warm up, e.g. to load the policy table
+    strategy.pick(one, rng)
+    single = per_call(lambda: strategy.pick(one, rng), 500 if quick else 5000)
+    batch = per_call(lambda: strategy.pick(bulk, rng), 1, 3 if quick else 5)
+    return rate(1, single, "decisions/s"), rate(size, batch, "decisions/s")
+
+
+def bench_matches(quick):
+    count = 20_000 if quick else 200_000
+    seconds = per_call(lambda: simulate_strategies(
+        count, STRATEGIES["policy"], STRATEGIES["uniform"], seed=0), 1, 3)
+    return rate(count, seconds, "matches/s")
+
+
+def run(quick=False):
+    results = {}
+    for name, strategy in STRATEGIES.items():
+        single, batch = bench_strategy(strategy, quick)
+        results[f"decide_{name}_single"] = single
+        results[f"decide_{name}_batch"] = batch
+    results["strategy_matches"] = bench_matches(quick)
+    return results
+
+
+if __name__ == "__main__":
+    from benchmarks.report import print_results
+
+    print_results(run())
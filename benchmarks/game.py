@@ -0,0 +1,219 @@
+"""
+Rendering, input and asset benchmarks, on the SDL dummy video driver.
+
+    python -m benchmarks.game
+"""
+import os
+import random
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from benchmarks.timing import ms, per_call, per_call_with_setup, share, us
+from engine import TOSS_STATE, CHOOSE_STATE, PLAYING_STATE, RESULT_STATE
+from replay import CALL, TOSS, CHOOSE, BALL
+
+# Computer pick time and frame step for the latency benchmark
+SLOW_AI_S = 0.05
+FRAME_MS = 16
+
+STATE_NAMES = {TOSS_STATE: "toss", CHOOSE_STATE: "choose",
+               PLAYING_STATE: "playing", RESULT_STATE: "result"}
+
+
+def new_game():
+    from main import HandCricketGame
+
+    return HandCricketGame(log_path=None, replay_path=None,
+                           opponent_path=None, stats_path=None, seed=0)
+
+
+def prepare(game, state, seed=0):
+    """Play game forward from a fresh match until it reaches state."""
+    while True:
+        game.restart_game(seed=seed)
+        seed += 1
+        if state == TOSS_STATE:
+            return
+        game.apply_action(CALL, "Odd")
+        game.apply_action(TOSS, 1)
+        game.scheduler.flush()
+        if game.current_state != CHOOSE_STATE:
+            continue  # Computer won the toss; try the next seed
+        if state == CHOOSE_STATE:
+            return
+        game.apply_action(CHOOSE, "Bat")
+        if state == PLAYING_STATE:
+            return
+        while game.current_state == PLAYING_STATE:
+            game.apply_action(BALL, [3, None])
+            game.scheduler.flush()
+        return
+
+
+def bench_draw(game, quick):
+    results = {}
+    for state, name in STATE_NAMES.items():
+        prepare(game, state)
+        game.draw()
+        results[f"draw_{name}"] = ms(per_call(game.draw, 20 if quick else 200))
+    prepare(game, PLAYING_STATE)
+    game.draw()
+    results["render_unchanged"] = us(per_call(game.render,
+                                              200 if quick else 2000))
+    return results
+
+
+def bench_input(game, quick):
+    results = {}
+    prepare(game, PLAYING_STATE)
+    blank = (5, 150)
+    results["handle_click_miss"] = us(per_call(
+        lambda: game.handle_click(blank), 1000 if quick else 20000))
+
+    triangle = game.triangle_buttons[2]
+    number = (sum(x for x, _ in triangle) / 3, sum(y for _, y in triangle) / 3)
+
+    def ready():
+        game.scheduler.flush()
+        if game.current_state != PLAYING_STATE:
+            prepare(game, PLAYING_STATE)
+
+    results["handle_click_ball"] = us(per_call_with_setup(
+        ready, lambda: game.handle_click(number), 200 if quick else 5000))
+
+    # Points on a grid over the hexagon, tested against every triangle
+    left, top, width, height = game.hex_rect
+    tests = [((x, y), tri) for x in range(left, left + width, 8)
+             for y in range(top, top + height, 8)
+             for tri in game.triangle_buttons]
+
+    def test_all():
+        for point, tri in tests:
+            game.point_in_triangle(point, tri)
+
+    results["point_in_triangle"] = us(
+        per_call(test_all, 2 if quick else 20) / len(tests))
+    return results
+
+
+def bench_reveal(quick):
+    """
+    Frame times while the hand pump plays, stepped by a 60 FPS clock. The
+    spread matters as much as the mean: an uneven frame is a visible hitch.
+    """
+    from profiler import FrameProfiler, percentile
+
+    game = new_game()
+    prepare(game, PLAYING_STATE)
+    game.draw()
+    # Built up front, as main() does while the toss screen waits
+    game.preload()
+    # Time frames with the profiler, counting any transform done per frame
+    profiler = FrameProfiler(history=100_000)
+    for function in ("flip", "scale", "smoothscale", "rotate", "rotozoom"):
+        profiler.count_calls(pygame.transform, function, "transforms")
+    profiler.enable()
+    frames_drawn, pixels_pushed = game.frames_drawn, game.pixels_pushed
+    for _ in range(5 if quick else 50):
+        if game.current_state != PLAYING_STATE:
+            prepare(game, PLAYING_STATE)
+            game.draw()
+        game.apply_action(BALL, [3, None])
+        while game.revealing:
+            game.scheduler.update(1000 / 60)
+            profiler.begin_frame()
+            game.render()
+            profiler.end_frame()
+        game.scheduler.flush()
+    profiler.disable()
+    frames = list(profiler.frame_ms)
+    transforms = sum(profiler.counters["transforms"])
+    if transforms:
+        print(f"Warning: {transforms} transforms while the pump played")
+    # What dirty rects save: the frames that pushed anything, and the share
+    # of the window pushed per frame
+    pushed = game.frames_drawn - frames_drawn
+    area = game.layout.width * game.layout.height
+    return {"reveal_frame_mean": ms(statistics.fmean(frames) / 1e3),
+            "reveal_frame_stdev": ms(statistics.pstdev(frames) / 1e3),
+            "reveal_frame_p99": ms(percentile(frames, 99) / 1e3),
+            "reveal_frames_pushed": share(pushed, len(frames)),
+            "reveal_pixels_pushed": share(game.pixels_pushed - pixels_pushed,
+                                          len(frames) * area)}
+
+
+def bench_latency(quick):
+    """
+    Click to feedback and to result with a computer that takes
+    SLOW_AI_S to pick, its balls decided on the worker thread while the
+    frames go on.
+    """
+    game = new_game()
+    rng = random.Random(0)
+
+    def slow_pick(match):
+        time.sleep(SLOW_AI_S)
+        return rng.randint(1, 6)
+
+    game.start_worker()
+    triangle = game.triangle_buttons[2]
+    number = (sum(x for x, _ in triangle) / 3, sum(y for _, y in triangle) / 3)
+    latency = game.latency
+    for _ in range(5 if quick else 40):
+        if game.current_state != PLAYING_STATE:
+            prepare(game, PLAYING_STATE)
+            game.match.computer = slow_pick
+            game.draw()
+        results = len(latency.result)
+        game.handle_click(number)
+        while len(latency.result) == results:
+            game.scheduler.update(FRAME_MS)
+            game.pump()
+            game.render()
+            # Let the worker run, as the frame cap would
+            time.sleep(0.001)
+        game.scheduler.flush()
+    game.close()
+    return {"click_feedback_slow_ai": ms(statistics.median(latency.feedback)
+                                         / 1e3),
+            "click_result_slow_ai": ms(statistics.median(latency.result)
+                                       / 1e3)}
+
+
+def bench_assets(quick):
+    from assets import HandAtlas
+
+    results = {"load_hand_images": ms(per_call(HandAtlas.build, 1,
+                                               2 if quick else 5))}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "hands.pack")
+        HandAtlas.build().save_pack(path)
+
+        def load_pack():
+            HandAtlas.from_pack(path).source.close()
+
+        results["load_hand_pack"] = ms(per_call(load_pack, 5 if quick else 50))
+    return results
+
+
+def run(quick=False):
+    game = new_game()
+    results = {}
+    results.update(bench_draw(game, quick))
+    results.update(bench_input(game, quick))
+    results.update(bench_reveal(quick))
+    results.update(bench_latency(quick))
+    results.update(bench_assets(quick))
+    return results
+
+
+if __name__ == "__main__":
+    from benchmarks.report import print_results
+
+    print_results(run())
@@ -0,0 +1,76 @@
+"""
+Import-time and startup benchmark.
+
+Each measurement runs in a fresh interpreter so nothing is already cached
+in sys.modules:
+
+    python -m benchmarks.import_time
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = ["engine", "montecarlo", "solver", "tournament", "assets", "main"]
+
+IMPORT_SNIPPET = """
+import sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+pygame = sys.modules.get("pygame")
+display = bool(pygame and pygame.display.get_init())
+print(elapsed, "pygame" in sys.modules, display)
+"""
+
+FIRST_FRAME_SNIPPET = """
+import time
+import main
+main.HandCricketGame(log_path=None, replay_path=None,
+                    opponent_path=None, stats_path=None).draw()
+print(time.perf_counter() - main.START_TIME)
+"""
+
+
+def run(snippet, env=None):
+    env = dict(env or os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1")
+    output = subprocess.run([sys.executable, "-c", snippet], cwd=ROOT,
+                            env=env, check=True, capture_output=True,
+                            text=True).stdout
+    return output.splitlines()[-1].split()
+
+
+def measure_import(module, repeat):
+    times = []
+    for _ in range(repeat):
+        elapsed, imports_pygame, display = run(
+            IMPORT_SNIPPET.format(module=module))
+        times.append(float(elapsed))
+    return {
+        "median_ms": statistics.median(times) * 1000,
+        "imports_pygame": imports_pygame == "True",
+        "opens_display": display == "True",
+    }
+
+
+def measure_first_frame(repeat):
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy")
+    times = [float(run(FIRST_FRAME_SNIPPET, env)[0]) for _ in range(repeat)]
+    return statistics.median(times) * 1000
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"{'module':<12}{'import ms':>10}  pygame  display")
+    for module in MODULES:
+        result = measure_import(module, repeat)
+        print(f"{module:<12}{result['median_ms']:>10.1f}  "
+              f"{'yes' if result['imports_pygame'] else 'no':<6}  "
+              f"{'yes' if result['opens_display'] else 'no'}")
+    print(f"\nFirst frame (dummy video): {measure_first_frame(repeat):.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Printing, saving and comparing benchmark results."""
+import json
+
+# A result this much worse than its baseline counts as a regression
+DEFAULT_THRESHOLD = 0.20
+
+CALIBRATION = "calibration"
+
+
+def print_results(results):
+    for name, result in results.items():
+        print(f"{name:<22}{result['value']:>14.3f} {result['unit']}")
+
+
+def save(path, results):
+    with open(path, "w") as results_file:
+        json.dump(results, results_file, indent=2, sort_keys=True)
+
+
+def load(path):
+    with open(path) as results_file:
+        return json.load(results_file)
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Print each result against its baseline and return the regressions.
+
+    change is positive when a result got better, whichever direction
+    better is for that measurement. Both runs time the same fixed workload
+    (calibration) and results are scaled by how fast the machine was, so a
+    busier or throttled machine does not read as a regression.
+    """
+    regressions = []
+    speed = 1.0
+    if CALIBRATION in results and CALIBRATION in baseline:
+        speed = baseline[CALIBRATION]["value"] / results[CALIBRATION]["value"]
+        print(f"Machine speed vs baseline: {speed:.2f}x\n")
+    print(f"{'benchmark':<22}{'baseline':>12}{'now':>12}{'change':>9}")
+    for name, result in results.items():
+        if name == CALIBRATION:
+            continue
+        before = baseline.get(name)
+        if before is None or not before["value"]:
+            print(f"{name:<22}{'-':>12}{result['value']:>12.3f}      new")
+            continue
+        scale = speed if result.get("timed", True) else 1.0
+        if result["higher_is_better"]:
+            change = result["value"] / before["value"] / scale - 1
+        elif result["value"]:
+            change = before["value"] / result["value"] / scale - 1
+        else:
+            # Down to nothing: better, by no finite ratio
+            print(f"{name:<22}{before['value']:>12.3f}{0:>12.3f}"
+                  f"{'better':>9}")
+            continue
+        flag = ""
+        if change < -threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<22}{before['value']:>12.3f}{result['value']:>12.3f}"
+              f"{change:>+9.1%}{flag}")
+    return regressions
@@ -0,0 +1,68 @@
+"""
+Rules and simulation throughput benchmarks; no pygame needed.
+
+    python -m benchmarks.rules
+"""
+import random
+import time
+
+from benchmarks.timing import per_call, rate, us
+from engine import Format, Match, simulate_match
+from opponent import AdaptiveOpponent
+
+
+def bench_engine(quick):
+    count = 2000 if quick else 50000
+    rng = random.Random(0)
+    started = time.perf_counter()
+    for _ in range(count):
+        simulate_match(rng)
+    return rate(count, time.perf_counter() - started, "matches/s")
+
+
+def bench_format(quick):
+    """Ten wickets and five overs an innings: about ten times the balls."""
+    count = 500 if quick else 10000
+    rng = random.Random(0)
+    match_format = Format(10, 5)
+    started = time.perf_counter()
+    for _ in range(count):
+        simulate_match(rng, format=match_format)
+    return rate(count, time.perf_counter() - started, "matches/s")
+
+
+def bench_montecarlo(quick):
+    import montecarlo
+
+    count = 100_000 if quick else 2_000_000
+    started = time.perf_counter()
+    montecarlo.simulate(count, seed=0)
+    return rate(count, time.perf_counter() - started, "matches/s")
+
+
+def bench_opponent(quick):
+    opponent = AdaptiveOpponent()
+    match = Match(random.Random(0), computer=opponent.pick)
+    match.on_ball = opponent.observe
+    match.call_toss("Even")
+    match.play_toss(1, 1)
+    match.choose("Bat")
+    for i in range(200):
+        opponent.observe(match, i % 6 + 1, 1, 0, False)
+    return us(per_call(lambda: opponent.pick(match),
+                       2000 if quick else 100000))
+
+
+def run(quick=False):
+    return {
+        "engine_matches": bench_engine(quick),
+        "format_matches": bench_format(quick),
+        "montecarlo_matches": bench_montecarlo(quick),
+        "opponent_pick": bench_opponent(quick),
+    }
+
+
+if __name__ == "__main__":
+    from benchmarks.report import print_results
+
+    print_results(run())
@@ -0,0 +1,73 @@
+"""
+Small timing helpers shared by the benchmark modules.
+
+Like timeit, garbage collection is off while timing and the fastest of
+several runs is reported: slower runs measure other load on the machine,
+not the code.
+"""
+import gc
+import statistics
+import time
+
+
+def per_call(func, number, repeat=7):
+    """Best seconds per call of func() over repeat runs of number calls."""
+    samples = []
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for _ in range(number):
+                func()
+            samples.append((time.perf_counter() - started) / number)
+    finally:
+        gc.enable()
+    return min(samples)
+
+
+def per_call_with_setup(setup, func, number):
+    """Median seconds of func(), timing each call alone after setup()."""
+    samples = []
+    gc.disable()
+    try:
+        for _ in range(number):
+            setup()
+            started = time.perf_counter()
+            func()
+            samples.append(time.perf_counter() - started)
+    finally:
+        gc.enable()
+    return statistics.median(samples)
+
+
+def result(value, unit, higher_is_better=False, timed=True):
+    # Untimed results (counts, shares) do not depend on the machine's speed
+    return {"value": value, "unit": unit,
+            "higher_is_better": higher_is_better, "timed": timed}
+
+
+def share(part, whole):
+    """part as a percentage of whole, e.g. of the pixels on screen."""
+    return result(100 * part / whole if whole else 0.0, "%", timed=False)
+
+
+def ms(seconds):
+    return result(seconds * 1e3, "ms")
+
+
+def us(seconds):
+    return result(seconds * 1e6, "us")
+
+
+def rate(count, seconds, unit):
+    return result(count / seconds, unit, higher_is_better=True)
+
+
+def calibration():
+    """Seconds for a fixed pure-Python workload, to gauge machine speed."""
+    def work():
+        total = 0
+        for i in range(10000):
+            total += i * i % 7
+        return total
+    return per_call(work, 20, repeat=7)
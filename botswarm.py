@@ -0,0 +1,166 @@
+"""
+Load test for server.py: a swarm of bot clients over localhost.
+
+Every bot plays matches with random numbers through the real protocol,
+commits and reveals included, and queues again after each one until the
+swarm has completed bots / 2 * matches. The swarm reports completed
+matches per second and move latency, measured from sending a COMMIT to
+receiving the STATE that resolves it.
+
+    python botswarm.py --bots 2000 --matches 5       # starts its own server
+    python botswarm.py --port 5555                   # against a running one
+"""
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+
+from engine import TOSS_STATE, CHOOSE_STATE, RESULT_STATE, Match
+from netproto import (JOIN, CALL, CHOOSE, COMMIT, REVEAL, START, STATE,
+                      REVEAL_NOW, ERROR, OPPONENT_LEFT, SIDES, encode, commit,
+                      apply_state, read_message)
+
+
+class SwarmStats:
+
+    def __init__(self, target):
+        self.target = target
+        self.done = asyncio.Event()
+        self.matches = 0
+        self.abandoned = 0
+        self.latencies = []
+
+    def percentile(self, p):
+        ordered = sorted(self.latencies)
+        if not ordered:
+            return 0.0
+        return ordered[min(int(len(ordered) * p / 100), len(ordered) - 1)]
+
+
+async def run_bot(host, port, rng, stats):
+    reader, writer = await asyncio.open_connection(host, port)
+    mirror = Match(human_opponent=True)
+    side = None
+    pending = None
+    committed_at = None
+    writer.write(encode(JOIN))
+    try:
+        while True:
+            kind, fields = await read_message(reader)
+            if kind == START:
+                side = fields[0]
+            elif kind == REVEAL_NOW:
+                writer.write(encode(REVEAL, *pending))
+            elif kind == STATE:
+                if committed_at is not None:
+                    stats.latencies.append(time.perf_counter() - committed_at)
+                    committed_at = None
+                apply_state(mirror, fields)
+                state = mirror.state
+                if state == RESULT_STATE:
+                    if side == 0:
+                        stats.matches += 1
+                        if stats.matches >= stats.target:
+                            stats.done.set()
+                    writer.write(encode(JOIN))
+                elif state == TOSS_STATE:
+                    if side == 0:
+                        writer.write(encode(CALL, rng.randrange(2)))
+                elif state == CHOOSE_STATE:
+                    if SIDES[side] == mirror.toss_winner:
+                        writer.write(encode(CHOOSE, rng.randrange(2)))
+                else:
+                    number = rng.randint(1, 6)
+                    digest, nonce = commit(number)
+                    pending = (number, nonce)
+                    writer.write(encode(COMMIT, digest))
+                    committed_at = time.perf_counter()
+            elif kind == OPPONENT_LEFT:
+                stats.abandoned += 1
+                committed_at = None
+                writer.write(encode(JOIN))
+            elif kind == ERROR:
+                raise RuntimeError(f"server rejected a move (code {fields[0]})")
+    finally:
+        writer.close()
+
+
+async def run_swarm(host, port, bots, matches, seed):
+    stats = SwarmStats(bots // 2 * matches)
+    seeds = random.Random(seed)
+    started = time.perf_counter()
+    tasks = [asyncio.create_task(run_bot(
+        host, port, random.Random(seeds.getrandbits(32)), stats))
+        for _ in range(bots)]
+    done = asyncio.create_task(stats.done.wait())
+    finished, _ = await asyncio.wait([done, *tasks],
+                                     return_when=asyncio.FIRST_COMPLETED)
+    elapsed = time.perf_counter() - started
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    for task in finished:
+        if task is not done:
+            task.result()  # A bot only stops early on an error
+    return stats, elapsed
+
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def start_server(port):
+    """Run server.py in its own process so it does not share our CPU."""
+    process = subprocess.Popen(
+        [sys.executable,
+         os.path.join(os.path.dirname(os.path.abspath(__file__)), "server.py"),
+         "--port", str(port)],
+        stdout=subprocess.PIPE, text=True)
+    process.stdout.readline()  # "Serving on ..."
+    return process
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Bot swarm load test.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int,
+                        help="server to test (default: start one)")
+    parser.add_argument("--bots", type=int, default=1000)
+    parser.add_argument("--matches", type=int, default=5,
+                        help="matches per pair of bots")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if args.bots % 2:
+        parser.error("--bots must be even so every bot gets an opponent")
+
+    server = None
+    port = args.port
+    if port is None:
+        port = free_port()
+        server = start_server(port)
+    try:
+        stats, elapsed = asyncio.run(
+            run_swarm(args.host, port, args.bots, args.matches, args.seed))
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    print(f"{args.bots} bots, {stats.matches} matches in {elapsed:.2f}s: "
+          f"{stats.matches / elapsed:.0f} matches/sec, "
+          f"{len(stats.latencies)} moves, "
+          f"p50 {stats.percentile(50) * 1000:.1f} ms, "
+          f"p99 {stats.percentile(99) * 1000:.1f} ms")
+    if stats.abandoned:
+        print(f"{stats.abandoned} matches abandoned")
+
+
+if __name__ == "__main__":
+    main()
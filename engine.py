@@ -0,0 +1,392 @@
+"""
+Pygame-free rules engine for Odd or Even Hand Cricket.
+
+Match holds the whole state of one Player vs Computer match (or of two
+people, for network play) and exposes the steps a match is made of: toss
+call, toss number, bat/bowl choice and one delivery at a time.
+HandCricketGame in main.py is a view over it; anything that only needs the
+rules (simulation, tooling, the network server) can use it without pygame.
+
+A Format sets the wickets and overs of each innings and the matches in a
+series; the default is the classic single-wicket innings with no ball
+limit. Each Match keeps a Scorecard with every ball it played.
+
+Match.snapshot() copies what a view draws into an immutable tuple, for
+views that advance the match on another thread.
+"""
+import random
+from array import array
+from collections import namedtuple
+
+# Match states (shared with the game screens)
+TOSS_STATE = 0
+TOSS_PLAY_STATE = 1
+CHOOSE_STATE = 2
+PLAYING_STATE = 3
+RESULT_STATE = 4
+
+PLAYER = "Player"
+COMPUTER = "Computer"
+SIDE_INDEX = {PLAYER: 0, COMPUTER: 1}
+
+# Outcomes of a single delivery
+RUNS = 0
+OUT = 1  # the last wicket fell
+TARGET_REACHED = 2
+WICKET = 3  # a wicket fell and the innings goes on
+OVERS_DONE = 4  # the last ball of the innings was bowled
+
+# Outcomes that close the innings
+INNINGS_OVER = (OUT, TARGET_REACHED, OVERS_DONE)
+
+BALLS_PER_OVER = 6
+
+
+class Format:
+    """Wickets and overs per innings, and matches per series."""
+
+    __slots__ = ("wickets", "overs", "matches", "balls")
+
+    def __init__(self, wickets=1, overs=None, matches=1):
+        if wickets < 1 or matches < 1 or (overs is not None and overs < 1):
+            raise ValueError("a format needs at least one wicket, over "
+                             "and match")
+        self.wickets = wickets
+        # None for innings that only end on wickets
+        self.overs = overs
+        self.matches = matches
+        # Balls per innings, or None when unlimited
+        self.balls = None if overs is None else overs * BALLS_PER_OVER
+
+    def __eq__(self, other):
+        return isinstance(other, Format) and \
+            (self.wickets, self.overs, self.matches) == \
+            (other.wickets, other.overs, other.matches)
+
+    def __repr__(self):
+        return f"Format({self.wickets}, {self.overs}, {self.matches})"
+
+
+# One wicket and no ball limit, the game's original rules
+STANDARD = Format()
+
+# What a view draws of a match, copied so it can be drawn while the match
+# itself is being advanced on another thread. totals holds the (runs,
+# wickets, balls) of both innings.
+MatchSnapshot = namedtuple("MatchSnapshot", (
+    "state", "innings", "score", "player1_score", "player2_score",
+    "player1_is_batting_first", "totals"))
+
+
+def overs_text(balls):
+    """Balls as overs in cricket notation, e.g. "3.4"."""
+    overs, balls = divmod(balls, BALLS_PER_OVER)
+    return f"{overs}.{balls}"
+
+
+class Scorecard:
+    """
+    Runs, wickets and balls of each closed innings, and a log of every ball.
+
+    Each ball is one byte of the log (batter * 8 + bowler) and the totals
+    are six fixed array slots written when an innings closes, so recording
+    a ball is one append and the log is the only part that grows with the
+    match. The innings in play is counted by the Match itself.
+    """
+
+    __slots__ = ("totals", "log", "second_innings_at")
+
+    EMPTY = array("I", bytes(4 * 2 * 3))
+
+    def __init__(self):
+        # [runs, wickets, balls] of innings 1, then of innings 2
+        self.totals = self.EMPTY[:]
+        self.log = array("B")
+        # Log index of the first ball of the second innings
+        self.second_innings_at = None
+
+    def reset(self):
+        self.totals[:] = self.EMPTY
+        del self.log[:]
+        self.second_innings_at = None
+
+    def add(self, batter, bowler):
+        self.log.append(batter << 3 | bowler)
+
+    def close_innings(self, innings, runs, wickets, balls):
+        totals = self.totals
+        base = innings * 3 - 3
+        totals[base] = runs
+        totals[base + 1] = wickets
+        totals[base + 2] = balls
+        if innings == 1:
+            self.second_innings_at = len(self.log)
+
+    def innings_totals(self, innings):
+        """(runs, wickets, balls) of a closed innings; zeros before that."""
+        return tuple(self.totals[innings * 3 - 3:innings * 3])
+
+    def deliveries(self, innings):
+        """(batter, bowler) of each ball of an innings, in order."""
+        start, end = 0, self.second_innings_at
+        if end is None:
+            end = len(self.log)
+        if innings == 2:
+            start, end = end, len(self.log)
+        return [(ball >> 3, ball & 7) for ball in self.log[start:end]]
+
+
+class Match:
+    """Compact state of one match, advanced through the step methods."""
+
+    __slots__ = ("rng", "computer", "chooser", "human_opponent", "format",
+                 "card",
+                 "on_ball", "state", "innings", "score", "wickets", "balls",
+                 "player1_score", "player2_score", "target", "toss_choice",
+                 "toss_winner", "toss_bat_bowl_choice",
+                 "player1_is_batting_first", "winner", "player_number",
+                 "computer_number")
+
+    def __init__(self, rng=None, computer=None, human_opponent=False,
+                 format=None, chooser=None):
+        # Anything with randint/choice works; the random module by default
+        self.rng = rng if rng is not None else random
+        # Optional computer(match) -> number used instead of randint(1, 6)
+        self.computer = computer
+        # Optional chooser(match) -> "Bat" or "Bowl" for the computer's call
+        # after winning the toss, instead of an even chance
+        self.chooser = chooser
+        # When the COMPUTER side is another person it makes its own
+        # bat/bowl choice and every number is passed in explicitly
+        self.human_opponent = human_opponent
+        self.format = format if format is not None else STANDARD
+        self.card = Scorecard()
+        # Optional on_ball(match, batter, bowler, runs, out) after each ball
+        self.on_ball = None
+        self.reset()
+
+    def reset(self):
+        """Start a fresh match at the toss."""
+        self.state = TOSS_STATE
+        self.innings = 1
+        # Runs, wickets and balls of the innings in play
+        self.score = 0
+        self.wickets = 0
+        self.balls = 0
+        self.player1_score = 0
+        self.player2_score = 0
+        self.target = 0
+        self.toss_choice = None
+        self.toss_winner = None
+        self.toss_bat_bowl_choice = None
+        self.player1_is_batting_first = None
+        self.winner = None
+        self.player_number = None
+        self.computer_number = None
+        self.card.reset()
+
+    def innings_totals(self, innings):
+        """(runs, wickets, balls) of an innings, live while it is played."""
+        if innings == self.innings and self.state == PLAYING_STATE:
+            return self.score, self.wickets, self.balls
+        return self.card.innings_totals(innings)
+
+    def snapshot(self):
+        """An immutable MatchSnapshot of the match as it is now."""
+        return MatchSnapshot(self.state, self.innings, self.score,
+                             self.player1_score, self.player2_score,
+                             self.player1_is_batting_first,
+                             (self.innings_totals(1), self.innings_totals(2)))
+
+    @property
+    def game_over(self):
+        return self.state == RESULT_STATE
+
+    @property
+    def player_is_batting(self):
+        return (self.player1_is_batting_first and self.innings == 1) or \
+            (not self.player1_is_batting_first and self.innings == 2)
+
+    def call_toss(self, choice):
+        """Player calls "Odd" or "Even" for the toss."""
+        self.toss_choice = choice
+        self.state = TOSS_PLAY_STATE
+
+    def play_toss(self, player_number, computer_number=None):
+        """Both sides show a number; the parity of the total decides the toss."""
+        if computer_number is None:
+            computer_number = self.rng.randint(1, 6)
+        self.player_number = player_number
+        self.computer_number = computer_number
+
+        total = player_number + computer_number
+        result = "Even" if total % 2 == 0 else "Odd"
+        if self.toss_choice == result:
+            self.toss_winner = PLAYER
+            self.state = CHOOSE_STATE
+        else:
+            self.toss_winner = COMPUTER
+            if self.human_opponent:
+                self.state = CHOOSE_STATE
+            else:
+                self.choose("Bat")
+        return result
+
+    def choose(self, choice):
+        """Toss winner picks "Bat" or "Bowl" and the first innings starts."""
+        self.toss_bat_bowl_choice = choice
+        if self.toss_winner == PLAYER:
+            self.player1_is_batting_first = choice == "Bat"
+        elif self.human_opponent:
+            self.player1_is_batting_first = choice != "Bat"
+        else:
+            # Computer makes its own call regardless of the recorded choice
+            if self.chooser is not None:
+                computer_choice = self.chooser(self)
+            else:
+                computer_choice = self.rng.choice(["Bat", "Bowl"])
+            self.player1_is_batting_first = computer_choice != "Bat"
+        self.state = PLAYING_STATE
+        self.innings = 1
+
+    def deliver(self, player_number, computer_number=None):
+        """Play one ball with the player's number and return its outcome."""
+        if computer_number is None:
+            computer_number = self.computer_number_for_ball()
+        self.player_number = player_number
+        self.computer_number = computer_number
+
+        if self.player_is_batting:
+            batter, bowler = player_number, computer_number
+        else:
+            batter, bowler = computer_number, player_number
+        out = batter == bowler
+        runs = 0 if out else batter
+        self.card.add(batter, bowler)
+        self.balls += 1
+        if self.on_ball is not None:
+            self.on_ball(self, batter, bowler, runs, out)
+
+        if out:
+            self.wickets += 1
+            if self.wickets >= self.format.wickets:
+                self.end_innings()
+                return OUT
+            outcome = WICKET
+        else:
+            self.score += runs
+            if self.innings == 2 and self.score >= self.target:
+                self.end_innings()
+                return TARGET_REACHED
+            outcome = RUNS
+
+        balls = self.format.balls
+        if balls is not None and self.balls >= balls:
+            self.end_innings()
+            return OVERS_DONE
+        return outcome
+
+    def computer_number_for_ball(self):
+        if self.computer is not None:
+            return self.computer(self)
+        return self.rng.randint(1, 6)
+
+    def end_innings(self):
+        """Close the current innings, setting the target or the result."""
+        self.card.close_innings(self.innings, self.score, self.wickets,
+                                self.balls)
+        if self.innings == 1:
+            if self.player1_is_batting_first:
+                self.player1_score = self.score
+            else:
+                self.player2_score = self.score
+            self.target = self.score + 1
+            self.innings = 2
+            self.score = 0
+            self.wickets = 0
+            self.balls = 0
+        else:
+            if self.player1_is_batting_first:
+                self.player2_score = self.score
+            else:
+                self.player1_score = self.score
+            self.finish()
+
+    def finish(self):
+        """Decide the winner once both innings are done."""
+        self.state = RESULT_STATE
+        if self.player1_is_batting_first:
+            chaser, setter = self.player2_score, self.player1_score
+            chasing, setting = COMPUTER, PLAYER
+        else:
+            chaser, setter = self.player1_score, self.player2_score
+            chasing, setting = PLAYER, COMPUTER
+
+        if chaser >= self.target:
+            self.winner = chasing
+        elif setter > chaser:
+            self.winner = setting
+        else:
+            self.winner = None  # Tie
+
+
+class Series:
+    """Standings of a series of matches, decided once a side can't be caught."""
+
+    __slots__ = ("format", "wins")
+
+    def __init__(self, format=None):
+        self.format = format if format is not None else STANDARD
+        # Matches won by PLAYER and COMPUTER, then ties
+        self.wins = array("H", bytes(2 * 3))
+
+    def record(self, winner):
+        """Count a finished match won by winner (None for a tie)."""
+        self.wins[SIDE_INDEX.get(winner, 2)] += 1
+
+    @property
+    def played(self):
+        return sum(self.wins)
+
+    @property
+    def over(self):
+        left = self.format.matches - self.played
+        return left <= 0 or abs(self.wins[0] - self.wins[1]) > left
+
+    @property
+    def winner(self):
+        """Leading side, or None while level."""
+        if self.wins[0] == self.wins[1]:
+            return None
+        return PLAYER if self.wins[0] > self.wins[1] else COMPUTER
+
+
+def simulate_match(rng=None, player_pick=None, on_ball=None, format=None):
+    """
+    Play a whole match headlessly and return the finished Match.
+
+    player_pick(match) returns the player's number for the toss and every
+    ball; it defaults to a uniform pick like the computer's. on_ball and
+    format are passed on to the Match.
+    """
+    rng = rng if rng is not None else random
+    if player_pick is None:
+        player_pick = lambda match: rng.randint(1, 6)
+
+    match = Match(rng, format=format)
+    match.on_ball = on_ball
+    match.call_toss(rng.choice(["Odd", "Even"]))
+    match.play_toss(player_pick(match))
+    if match.state == CHOOSE_STATE:
+        match.choose(rng.choice(["Bat", "Bowl"]))
+    while match.state == PLAYING_STATE:
+        match.deliver(player_pick(match))
+    return match
+
+
+def simulate_series(format, rng=None, player_pick=None):
+    """Play a whole series headlessly and return the finished Series."""
+    series = Series(format)
+    while not series.over:
+        series.record(simulate_match(rng, player_pick, format=format).winner)
+    return series
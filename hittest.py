@@ -0,0 +1,103 @@
+"""
+Per-pixel hit-test index.
+
+For every game state a byte mask of the whole screen holds the id of the
+widget under each pixel (0 for none). Masks are built once from the widget
+geometry, after which resolving a click is a single index into a bytearray,
+whatever the number of widgets.
+"""
+import math
+
+NO_WIDGET = 0
+
+
+def inside_triangle(x, y, triangle):
+    """Barycentric point-in-triangle test, edges included."""
+    (x1, y1), (x2, y2), (x3, y3) = triangle
+    denominator = (y2 - y3) * (x1 - x3) + (x3 - x2) * (y1 - y3)
+    if abs(denominator) < 1e-10:  # Triangle is degenerate
+        return False
+    a = ((y2 - y3) * (x - x3) + (x3 - x2) * (y - y3)) / denominator
+    b = ((y3 - y1) * (x - x3) + (x1 - x3) * (y - y3)) / denominator
+    c = 1 - a - b
+    return a >= 0 and b >= 0 and c >= 0
+
+
+def triangle_span(y, triangle):
+    """First and last integer x inside the triangle on row y, or None."""
+    (x1, y1), (x2, y2), (x3, y3) = triangle
+    denominator = (y2 - y3) * (x1 - x3) + (x3 - x2) * (y1 - y3)
+    if abs(denominator) < 1e-10:
+        return None
+    # Each barycentric coordinate is linear in x on this row: k * x + m >= 0
+    ka = (y2 - y3) / denominator
+    ma = ((x3 - x2) * (y - y3) - (y2 - y3) * x3) / denominator
+    kb = (y3 - y1) / denominator
+    mb = ((x1 - x3) * (y - y3) - (y3 - y1) * x3) / denominator
+    lo, hi = -math.inf, math.inf
+    for k, m in ((ka, ma), (kb, mb), (-ka - kb, 1 - ma - mb)):
+        if k > 0:
+            lo = max(lo, -m / k)
+        elif k < 0:
+            hi = min(hi, -m / k)
+        elif m < 0:
+            return None
+    if lo > hi + 1:
+        return None
+    xs = [point[0] for point in triangle]
+    lo = math.floor(max(lo, min(xs))) - 1
+    hi = math.ceil(min(hi, max(xs))) + 1
+    # Start one pixel wide of the float bounds and settle each end against
+    # the exact test, so rounding never moves an edge pixel
+    while lo <= hi and not inside_triangle(lo, y, triangle):
+        lo += 1
+    while hi >= lo and not inside_triangle(hi, y, triangle):
+        hi -= 1
+    return (lo, hi) if lo <= hi else None
+
+
+class HitIndex:
+    """Maps (state, pixel) to a widget id; later widgets win overlaps."""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.masks = {}
+
+    def mask(self, state):
+        if state not in self.masks:
+            self.masks[state] = bytearray(self.width * self.height)
+        return self.masks[state]
+
+    def fill_span(self, states, widget, y, lo, hi):
+        if not 0 <= y < self.height:
+            return
+        lo, hi = max(lo, 0), min(hi, self.width - 1)
+        if lo > hi:
+            return
+        start = y * self.width + lo
+        run = bytes([widget]) * (hi - lo + 1)
+        for state in states:
+            self.mask(state)[start:start + len(run)] = run
+
+    def add_rect(self, states, widget, rect):
+        """rect is (x, y, width, height), like pygame.Rect.collidepoint."""
+        x, y, width, height = rect
+        for row in range(y, y + height):
+            self.fill_span(states, widget, row, x, x + width - 1)
+
+    def add_triangle(self, states, widget, triangle):
+        rows = [point[1] for point in triangle]
+        for row in range(math.floor(min(rows)), math.ceil(max(rows)) + 1):
+            span = triangle_span(row, triangle)
+            if span:
+                self.fill_span(states, widget, row, *span)
+
+    def lookup(self, state, pos):
+        """Widget id under pos in this state."""
+        x, y = math.floor(pos[0]), math.floor(pos[1])
+        mask = self.masks.get(state)
+        if mask is None or not (0 <= x < self.width and
+                                0 <= y < self.height):
+            return NO_WIDGET
+        return mask[y * self.width + x]
@@ -0,0 +1,49 @@
+"""
+Window layout: maps the game's design coordinates onto the real window.
+
+Every position in the game is designed for a 400x600 screen. For any other
+window size a Layout scales that design uniformly to the largest size that
+fits and centres it, leaving bars on the longer side. The game builds one
+Layout per resize and converts its geometry through it once, so frames
+draw straight at the window's resolution with no per-frame scaling.
+"""
+import pygame
+
+DESIGN_WIDTH = 400
+DESIGN_HEIGHT = 600
+
+
+class Layout:
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.scale = min(width / DESIGN_WIDTH, height / DESIGN_HEIGHT)
+        # Whole-pixel offsets keep the design on pixel boundaries
+        self.left = (width - round(DESIGN_WIDTH * self.scale)) // 2
+        self.top = (height - round(DESIGN_HEIGHT * self.scale)) // 2
+
+    def point(self, point):
+        x, y = point
+        return (self.left + x * self.scale, self.top + y * self.scale)
+
+    def points(self, points):
+        return [self.point(point) for point in points]
+
+    def rect(self, rect):
+        """Window rect for a design rect, each edge on the nearest pixel."""
+        x, y, width, height = rect
+        left = round(self.left + x * self.scale)
+        top = round(self.top + y * self.scale)
+        right = round(self.left + (x + width) * self.scale)
+        bottom = round(self.top + (y + height) * self.scale)
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def length(self, value):
+        """A design length (line width, radius) in whole window pixels."""
+        return max(1, round(value * self.scale))
+
+    def to_design(self, pos):
+        """Window position back in design coordinates, e.g. for clicks."""
+        return ((pos[0] - self.left) / self.scale,
+                (pos[1] - self.top) / self.scale)
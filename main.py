@@ -1,24 +1,41 @@
-import pygame
-import sys
-import random
 import time
-import math
-import sys
+
+# Taken before pygame is imported so the startup times cover everything
+START_TIME = time.perf_counter()
+
 import os
 
-def resource_path(relative_path):
-    """ Get absolute path to resource, works for dev and for PyInstaller """
-    try:
-        # PyInstaller creates a temp folder and stores path in _MEIPASS
-        base_path = sys._MEIPASS
-    except Exception:
-        base_path = os.path.abspath(".")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
 
-    return os.path.join(base_path, relative_path)
+import pygame
+import random
+import math
+import sys
+from functools import cached_property
+
+from assets import (HandAtlas, TextCache, HAND_SIZE, LOWER_HAND_SIZE,
+                    PUMP_FRAMES)
+from layout import Layout, DESIGN_WIDTH, DESIGN_HEIGHT
+from textlayout import TextLayout
+from matchlog import open_log
+from hittest import HitIndex, inside_triangle
+from scheduler import Scheduler
+from opponent import AdaptiveOpponent
+from profiler import FrameProfiler
+from pipeline import InputQueue, InlineWorker, RulesWorker, LatencyTracker
+from stats import STATS_PATH, MatchResult, StatsStore
+from replay import (CALL, TOSS, CHOOSE, BALL, REPLAY_LOG_PATH, Recording,
+                    append_recording, match_result)
+from engine import (TOSS_STATE, TOSS_PLAY_STATE, CHOOSE_STATE, PLAYING_STATE,
+                    RESULT_STATE, PLAYER, COMPUTER, OUT, TARGET_REACHED,
+                    OVERS_DONE, INNINGS_OVER, Format, Match, Series,
+                    overs_text)
 
 # --- Game Constants ---
-SCREEN_WIDTH = 400
-SCREEN_HEIGHT = 600
+# Design size; every coordinate below is in these units and is scaled to
+# the actual window through a Layout
+SCREEN_WIDTH = DESIGN_WIDTH
+SCREEN_HEIGHT = DESIGN_HEIGHT
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 GRAY = (200, 200, 200)
@@ -30,53 +47,248 @@ BLUE = (70, 130, 180)
 ORANGE = (255, 69, 0)
 
 # --- Pygame Initialization ---
-pygame.init()
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Odd or Even Hand Cricket")
+# Deferred to init_display() so importing this module has no side effects
+screen = None
 
-# Define fonts
-font_large = pygame.font.Font(None, 48)
-font_medium = pygame.font.Font(None, 36)
-font_small = pygame.font.Font(None, 24)
-font_vsmall = pygame.font.Font(None, 18)
 
-# Define game states
-TOSS_STATE = 0
-TOSS_PLAY_STATE = 1
-CHOOSE_STATE = 2
-PLAYING_STATE = 3
-RESULT_STATE = 4
+def init_display(size=None, fullscreen=False):
+    """Open the game window, starting only the display and font subsystems."""
+    global screen
+    if screen is None:
+        pygame.display.init()
+        pygame.font.init()
+        set_display_mode(size, fullscreen)
+        pygame.display.set_caption("Odd or Even Hand Cricket")
+    return screen
 
 
-class HandCricketGame:
+def set_display_mode(size=None, fullscreen=False):
+    """(Re)open the window resizable, or fullscreen at the desktop size."""
+    global screen
+    if fullscreen:
+        screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+    else:
+        screen = pygame.display.set_mode(size or (SCREEN_WIDTH, SCREEN_HEIGHT),
+                                         pygame.RESIZABLE)
+    return screen
+
+
+class Fonts:
+    """Game fonts at the current layout scale, each created on first use."""
 
     def __init__(self):
-        # Game state variables
-        self.current_score = 0
-        self.player1_score = 0
-        self.player2_score = 0
-        self.current_innings = 1  # 1 for Player 1, 2 for Player 2
-        self.target = 0
-
-        self.game_over = False
+        self.scale = 1
+
+    def rescale(self, scale):
+        """Drop the fonts made so far; they are recreated at the new scale."""
+        self.scale = scale
+        for name in ("large", "medium", "small", "vsmall"):
+            self.__dict__.pop(name, None)
+
+    def font(self, size):
+        return pygame.font.Font(None, max(1, round(size * self.scale)))
+
+    @cached_property
+    def large(self):
+        return self.font(48)
+
+    @cached_property
+    def medium(self):
+        return self.font(36)
+
+    @cached_property
+    def small(self):
+        return self.font(24)
+
+    @cached_property
+    def vsmall(self):
+        return self.font(18)
+
+
+fonts = Fonts()
+
+ALL_STATES = [TOSS_STATE, TOSS_PLAY_STATE, CHOOSE_STATE, PLAYING_STATE,
+              RESULT_STATE]
+
+# Widget ids in the hit-test index; the hexagon buttons use their number
+NUMBER_BUTTONS = range(1, 7)
+RESTART_BUTTON = 7
+ODD_BUTTON = 8
+EVEN_BUTTON = 9
+BAT_BUTTON = 10
+BOWL_BUTTON = 11
+
+MATCH_LOG_PATH = "match_log.hcl"
+OPPONENT_PROFILE_PATH = "opponent_profile.bin"
+
+# Frame rate cap and how long to block for input while nothing changes
+FPS = 60
+IDLE_WAIT_MS = 250
+
+# Pauses (ms) that let the player read a result before the game moves on
+TOSS_REVEAL_MS = 2000
+TOSS_RESULT_MS = 1000
+INNINGS_BREAK_MS = 2000
+
+# Before hands are shown both fists pump this many times ("1, 2, 3,
+# shoot"), each pump taking PUMP_MS
+REVEAL_PUMPS = 3
+PUMP_MS = 140
+REVEAL_MS = REVEAL_PUMPS * PUMP_MS
+
+# F11 switches between a resizable window and fullscreen
+FULLSCREEN_KEY = pygame.K_F11
+
+# F3 shows the frame profiler overlay, F4 dumps its metrics to a file
+PROFILER_KEY = pygame.K_F3
+PROFILE_DUMP_KEY = pygame.K_F4
+PROFILE_DUMP_PATH = "frame_profile.json"
+PROFILER_LINE_HEIGHT = 13
+
+# Posted by the rules worker when a ball is decided, to wake the main loop
+RULES_EVENT = pygame.event.custom_type()
+
+# Number buttons pressed while a ball is in flight are drawn this much
+# lighter than the rest
+PRESSED_LIGHTEN = 70
+
+# F2 shows the statistics screen, read from the stats store's summary
+STATS_KEY = pygame.K_F2
+STATS_RECT = pygame.Rect(20, 60, SCREEN_WIDTH - 40, 290)
+STATS_LINE_HEIGHT = 22
+# Opponents listed with their record, and score histogram buckets
+STATS_OPPONENTS = 3
+STATS_BUCKET_RUNS = 10
+STATS_BUCKETS = 8
+STATS_BAR_HEIGHT = 60
+
+# Render layers. Static regions are prerendered once per state into a
+# background surface below the dynamic regions or a foreground surface
+# above them; dynamic regions are drawn to the screen every time they change.
+BACKGROUND = 0
+DYNAMIC = 1
+FOREGROUND = 2
+TRANSPARENT = (0, 0, 0, 0)
+
+# Fixed screen regions used for dirty-rect rendering
+SCORE_RECT = pygame.Rect(0, 0, SCREEN_WIDTH, 50)
+HANDS_RECT = pygame.Rect(0, 220, SCREEN_WIDTH, 180)
+
+# Score panels: top-left, top-right, bottom-right, bottom-left
+LEFT_TRAPEZIUM = [(20, 10), (170, 10), (150, 40), (40, 40)]
+RIGHT_TRAPEZIUM = [(230, 10), (380, 10), (360, 40), (250, 40)]
+
+# Messages wrap to this width and stack lines this far apart
+MESSAGE_WIDTH = 380
+MESSAGE_LINE_HEIGHT = 20
+
+# Hands are drawn this far down and overhang the screen sides by HAND_BLEED
+HAND_Y = 250
+HAND_BLEED = 25
+
+
+def pump_frame(t):
+    """Pump frame at t (0..1) of a reveal: up and down REVEAL_PUMPS times."""
+    phase = t * REVEAL_PUMPS % 1
+    return round(math.sin(math.pi * phase) * (PUMP_FRAMES - 1))
+
+
+def match_property(name):
+    """Expose a Match field as a read-only attribute of the game view."""
+    return property(lambda self: getattr(self.match, name))
+
+
+class HandCricketGame:
+
+    current_score = match_property("score")
+    player1_score = match_property("player1_score")
+    player2_score = match_property("player2_score")
+    current_innings = match_property("innings")  # 1 for first, 2 for chase
+    target = match_property("target")
+    game_over = match_property("game_over")
+    current_state = match_property("state")
+    toss_choice = match_property("toss_choice")
+    toss_winner = match_property("toss_winner")
+    toss_bat_bowl_choice = match_property("toss_bat_bowl_choice")
+    player1_is_batting_first = match_property("player1_is_batting_first")
+
+    # Score labels for the engine's PLAYER and COMPUTER sides
+    side_names = ("Player", "Computer")
+
+    def __init__(self, log_path=MATCH_LOG_PATH, replay_path=REPLAY_LOG_PATH,
+                 seed=None, opponent_path=OPPONENT_PROFILE_PATH, format=None,
+                 stats_path=STATS_PATH, strategy=None):
+        init_display()
+
+        # The computer learns the player's habits across sessions (None for
+        # a computer that picks uniformly at random)
+        self.opponent_path = opponent_path
+        self.opponent = AdaptiveOpponent.load(opponent_path) \
+            if opponent_path else None
+
+        # A batched strategy (named in strategies.STRATEGIES) can play the
+        # computer instead; it makes the computer's bat/bowl call too
+        self.strategy = strategy
+        if strategy:
+            from strategies import STRATEGIES, MatchPlayer
+
+            player = MatchPlayer(STRATEGIES[strategy])
+            computer, chooser = player.pick, player.choose
+        else:
+            computer = self.opponent.pick if self.opponent else None
+            chooser = None
+
+        # Game state lives in the rules engine; this class only presents it.
+        # Each match reseeds its RNG from seeds, so it can be replayed from
+        # that seed and the recorded inputs.
+        self.match = Match(random.Random(), computer=computer, format=format,
+                           chooser=chooser)
+        self.match.on_ball = self.on_ball
+        # Matches won so far when the format is a series
+        self.series = Series(self.match.format)
+        self.seeds = random.Random(seed)
+        self.replay_path = replay_path
+
+        # Ball-by-ball record of every match played (None to disable)
+        self.log = open_log(log_path) if log_path else None
+
+        # Finished matches are written to the stats database off this
+        # thread (None to disable); F2 shows the summary it keeps
+        self.stats = StatsStore(stats_path, self.side_names[0]) \
+            if stats_path else None
+        self.show_stats = False
+        # (summary version, lines) last built for the stats screen
+        self.stats_cache = (None, ())
+
         self.message = "Player, choose Odd or Even to toss."
         self.last_bowler_choice = None
-        self.player_hand_image = None
-        self.bowler_hand_image = None
-        self.lower_hand_image = None
+        # Numbers whose hands are shown (None for the resting hand)
+        self.player_hand = None
+        self.bowler_hand = None
         self.BUTTON_COLOR = (100, 100, 100)
         self.Atext_color = (186, 140, 99)
         self.Otext_color = (255, 114, 118)
-        # Toss variables
-        self.current_state = TOSS_STATE
-        self.toss_choice = None
-        self.toss_winner = None
-        self.toss_bat_bowl_choice = None
-        self.player1_is_batting_first = None
 
-        # Load hand images
-        self.hand_images = self.load_hand_images()
-        self.load_lower_hand_images()
+        self.text_cache = TextCache()
+        self.message_text = TextLayout()
+        self.profiler_text = TextCache(64)
+
+        # Timed transitions and animations, advanced by the frame clock
+        self.scheduler = Scheduler()
+        # Pump frame shown instead of the hands, None once they are revealed
+        self.reveal_frame = None
+        self.revealing = False
+
+        # Clicks wait here while the game is busy with the previous one.
+        # Balls are decided by the worker: inline until run() starts a
+        # thread for it. Rendering reads the match through self.view.
+        self.inputs = InputQueue()
+        self.worker = InlineWorker()
+        self.latency = LatencyTracker()
+        self.view = self.match.snapshot()
+        # Number pressed for the ball in flight, lit up until it is shown
+        self.pressed = None
+        self.start_recording(seed)
 
         # Hexagon center and radius for triangular buttons
         self.hex_center = (SCREEN_WIDTH // 2, 450)
@@ -103,6 +315,10 @@ class HandCricketGame:
             ]
             self.triangle_buttons.append(triangle)
 
+        self.hex_rect = pygame.Rect(0, 0, self.hex_radius * 2 + 8,
+                                    self.hex_radius * 2 + 8)
+        self.hex_rect.center = self.hex_center
+
         self.restart_button_rect = pygame.Rect(125, 530, 150, 45)
 
         # Toss buttons with better positioning
@@ -113,88 +329,138 @@ class HandCricketGame:
         self.bat_button_rect = pygame.Rect(50, 250, 140, 55)
         self.bowl_button_rect = pygame.Rect(210, 250, 140, 55)
 
-    def load_lower_hand_images(self):
-        image_path = resource_path(f"nimages/hands[-1].png")
-        try:
-            image_surface = pygame.image.load(image_path)
-            # Force scale the image to the new, fixed dimensions
-            self.lower_hand_image = pygame.transform.scale(
-                image_surface, (200, 50))
-        except pygame.error:
-            print(
-                f"Warning: Could not load image at {image_path}. Using fallback surface."
-            )
-            # Create a fallback surface with the hand number displayed
-            fallback_surface = pygame.Surface((200, 100))
-            fallback_surface.fill(GRAY)
-            font = pygame.font.Font(None, 48)
-            text = font.render("-1", True, BLACK)
-            text_rect = text.get_rect(center=(200 / 2, 100 / 2))
-            fallback_surface.blit(text, text_rect)
-            self.lower_hand_image = fallback_surface
-
-    def load_hand_images(self):
-        """Loads hand images from files, forcing a fixed width and height."""
-        images = {}
-        new_width = 200
-        new_height = 100
-        for i in range(0, 7):
-            image_path = resource_path(f"nimages/hands[{i}].png")
-            try:
-                image_surface = pygame.image.load(image_path)
-                # Force scale the image to the new, fixed dimensions
-                images[i] = pygame.transform.scale(image_surface,
-                                                   (new_width, new_height))
-            except pygame.error:
-                print(
-                    f"Warning: Could not load image at {image_path}. Using fallback surface."
-                )
-                # Create a fallback surface with the hand number displayed
-                fallback_surface = pygame.Surface((new_width, new_height))
-                fallback_surface.fill(GRAY)
-                font = pygame.font.Font(None, 48)
-                text = font.render(str(i), True, BLACK)
-                text_rect = text.get_rect(center=(new_width / 2,
-                                                  new_height / 2))
-                fallback_surface.blit(text, text_rect)
-                images[i] = fallback_surface
-        return images
+        # Resolves any click to a widget with one lookup. The index is in
+        # design coordinates, so resizing never rebuilds it.
+        self.hit_index = self.build_hit_index()
+
+        # Window-space geometry, rebuilt by apply_layout on every resize
+        self.fullscreen = False
+        # Size the window goes back to when leaving fullscreen
+        self.windowed_size = screen.get_size()
+        self.apply_layout(screen.get_size())
+
+        # Dirty-rect rendering state and counters
+        self.drawn_regions = {}
+        self.full_redraw = True
+        self.frames_drawn = 0
+        self.pixels_pushed = 0
+
+        # Off until toggled; its hooks are only installed while it is on
+        self.profiler = self.build_profiler()
+
+    @cached_property
+    def atlas(self):
+        """Hand images, loaded once on first use with mirrored copies."""
+        return HandAtlas.load()
+
+    @property
+    def scaled_atlas(self):
+        """The atlas at the layout's scale; scaled once and cached."""
+        return self.atlas.scaled(self.layout.scale)
+
+    def preload(self):
+        """Load the hands and prerender the pump frames at this scale."""
+        return self.scaled_atlas.pump
+
+    @property
+    def hand_images(self):
+        return self.scaled_atlas.hands
+
+    @property
+    def bowler_hand_images(self):
+        return self.scaled_atlas.mirrored_hands
+
+    @property
+    def lower_hand_image(self):
+        return self.scaled_atlas.lower_hand
+
+    @property
+    def bowler_lower_hand_image(self):
+        return self.scaled_atlas.mirrored_lower_hand
+
+    @property
+    def player_hand_image(self):
+        return self.hand_images.get(self.player_hand)
+
+    @property
+    def bowler_hand_image(self):
+        return self.bowler_hand_images.get(self.bowler_hand)
+
+    def apply_layout(self, size):
+        """Scale every piece of window geometry and the fonts to size."""
+        global screen
+        screen = pygame.display.get_surface() or screen
+        layout = self.layout = Layout(*size)
+        fonts.rescale(layout.scale)
+        self.text_cache.clear()
+        self.message_text.clear()
+        self.profiler_text.clear()
+
+        # Drawing is clipped to the design area, as the window edge clips it
+        # at the design size; hands overhang the sides
+        self.design_rect = layout.rect((0, 0, SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.score_rect = layout.rect(SCORE_RECT)
+        self.hands_rect = layout.rect(HANDS_RECT)
+        self.trapeziums = (layout.points(LEFT_TRAPEZIUM),
+                           layout.points(RIGHT_TRAPEZIUM))
+        self.hex_shapes = [layout.points(triangle)
+                           for triangle in self.triangle_buttons]
+        # Label at each triangle's centroid
+        self.hex_labels = [
+            layout.point((sum(x for x, _ in triangle) // 3,
+                          sum(y for _, y in triangle) // 3))
+            for triangle in self.triangle_buttons]
+        self.hex_area = layout.rect(self.hex_rect)
+        # Static layers at the window size, redrawn when their regions change
+        size = (layout.width, layout.height)
+        self.layers = {BACKGROUND: pygame.Surface(size).convert(),
+                       FOREGROUND: pygame.Surface(size,
+                                                  pygame.SRCALPHA).convert_alpha()}
+        self.layer_keys = {}
+        self.button_rects = {
+            ODD_BUTTON: layout.rect(self.odd_button_rect),
+            EVEN_BUTTON: layout.rect(self.even_button_rect),
+            BAT_BUTTON: layout.rect(self.bat_button_rect),
+            BOWL_BUTTON: layout.rect(self.bowl_button_rect),
+            RESTART_BUTTON: layout.rect(self.restart_button_rect),
+        }
+        # Once the hands are loaded, prerender the pump frames at the new
+        # scale here rather than on the render thread mid-reveal
+        if "atlas" in self.__dict__:
+            self.preload()
+        self.invalidate()
+
+    def resize(self, size):
+        """Follow a window resize."""
+        if not self.fullscreen:
+            self.windowed_size = size
+        if size != (self.layout.width, self.layout.height):
+            self.apply_layout(size)
+
+    def toggle_fullscreen(self):
+        self.fullscreen = not self.fullscreen
+        set_display_mode(self.windowed_size, self.fullscreen)
+        self.apply_layout(screen.get_size())
 
     def draw_text(self, surface, text, font, color, pos):
         """Helper function to render and blit text."""
-        text_surface = font.render(text, True, color)
+        text_surface = self.text_cache.render(text, font, color)
         text_rect = text_surface.get_rect(center=pos)
         surface.blit(text_surface, text_rect)
 
-    def draw_score_trapeziums(self):
-        """Draw trapezium shapes showing each player's score at the top."""
-        # Left trapezium for Player 1
-        left_trap = [
-            (20, 10),  # top-left
-            (170, 10),  # top-right
-            (150, 40),  # bottom-right
-            (40, 40)  # bottom-left
-        ]
-
-        # Right trapezium for Player 2/Computer
-        right_trap = [
-            (230, 10),  # top-left
-            (380, 10),  # top-right
-            (360, 40),  # bottom-right
-            (250, 40)  # bottom-left
-        ]
-
-        # Determine colors based on game state
-        if self.current_state >= PLAYING_STATE:
-            if self.player1_is_batting_first:
-                if self.current_innings == 1:
+    def panel_colors(self):
+        """Fill colours of the Player 1 and Player 2 score panels."""
+        view = self.view
+        if view.state >= PLAYING_STATE:
+            if view.player1_is_batting_first:
+                if view.innings == 1:
                     left_color = (186, 140, 99)  # Player batting
                     right_color = (255, 114, 118)  # Computer bowling
                 else:
                     left_color = (255, 114, 118)  # Player bowling
                     right_color = (186, 140, 99)  # Computer batting
             else:
-                if self.current_innings == 1:
+                if view.innings == 1:
                     left_color = (255, 114, 118)  # Player bowling
                     right_color = (186, 140, 99)  # Computer batting
                 else:
@@ -203,396 +469,806 @@ class HandCricketGame:
         else:
             left_color = BUTTON
             right_color = BUTTON
-
-        # Draw trapeziums
-        pygame.draw.polygon(screen, left_color, left_trap)
-        pygame.draw.polygon(screen, DARK_GREY, left_trap, 2)  # Border
-
-        pygame.draw.polygon(screen, right_color, right_trap)
-        pygame.draw.polygon(screen, DARK_GREY, right_trap, 2)  # Border
-
-        # Draw scores
-        player1_display_score = self.player1_score if self.current_state >= RESULT_STATE else (
-            self.current_score if
-            (self.player1_is_batting_first and self.current_innings == 1) or
-            (not self.player1_is_batting_first and self.current_innings == 2)
-            else self.player1_score)
-        player2_display_score = self.player2_score if self.current_state >= RESULT_STATE else (
-            self.current_score if
-            (not self.player1_is_batting_first and self.current_innings == 1)
-            or (self.player1_is_batting_first and self.current_innings == 2)
-            else self.player2_score)
-
-        self.draw_text(screen, "Player", font_vsmall, WHITE, (95, 18))
-        self.draw_text(screen, str(player1_display_score), font_small, WHITE,
-                       (95, 32))
-
-        self.draw_text(screen, "Computer", font_vsmall, WHITE, (305, 18))
-        self.draw_text(screen, str(player2_display_score), font_small, WHITE,
-                       (305, 32))
+        return left_color, right_color
+
+    def draw_score_trapeziums(self, surface):
+        """Draw the trapezium panels the scores are shown on."""
+        # Left trapezium for Player 1, right for Player 2/Computer
+        left_trap, right_trap = self.trapeziums
+        left_color, right_color = self.panel_colors()
+        border = self.layout.length(2)
+
+        pygame.draw.polygon(surface, left_color, left_trap)
+        pygame.draw.polygon(surface, DARK_GREY, left_trap, border)  # Border
+
+        pygame.draw.polygon(surface, right_color, right_trap)
+        pygame.draw.polygon(surface, DARK_GREY, right_trap, border)  # Border
+
+    def draw_scores(self, surface):
+        """Draw each player's name and score on the trapezium panels."""
+        view = self.view
+        player1_display_score = view.player1_score if view.state >= RESULT_STATE else (
+            view.score if
+            (view.player1_is_batting_first and view.innings == 1) or
+            (not view.player1_is_batting_first and view.innings == 2)
+            else view.player1_score)
+        player2_display_score = view.player2_score if view.state >= RESULT_STATE else (
+            view.score if
+            (not view.player1_is_batting_first and view.innings == 1)
+            or (view.player1_is_batting_first and view.innings == 2)
+            else view.player2_score)
+
+        player1_innings = 1 if view.player1_is_batting_first else 2
+
+        layout = self.layout
+        self.draw_text(surface, self.side_names[0], fonts.vsmall, WHITE,
+                       layout.point((95, 18)))
+        self.draw_text(surface,
+                       self.score_text(player1_display_score, player1_innings),
+                       fonts.small, WHITE, layout.point((95, 32)))
+
+        self.draw_text(surface, self.side_names[1], fonts.vsmall, WHITE,
+                       layout.point((305, 18)))
+        self.draw_text(surface,
+                       self.score_text(player2_display_score,
+                                       3 - player1_innings),
+                       fonts.small, WHITE, layout.point((305, 32)))
+
+    def score_text(self, runs, innings):
+        """Runs, with wickets and overs when the format limits them."""
+        match_format = self.match.format
+        _, wickets, balls = self.view.totals[innings - 1]
+        text = str(runs)
+        if match_format.wickets > 1:
+            text += f"/{wickets}"
+        if match_format.overs is not None:
+            text += f" ({overs_text(balls)})"
+        return text
 
     def point_in_triangle(self, point, triangle):
         """Check if a point is inside a triangle using barycentric coordinates."""
-        x, y = point
-        x1, y1 = triangle[0]
-        x2, y2 = triangle[1]
-        x3, y3 = triangle[2]
-
-        # Calculate barycentric coordinates
-        denominator = (y2 - y3) * (x1 - x3) + (x3 - x2) * (y1 - y3)
-        if abs(denominator) < 1e-10:  # Triangle is degenerate
-            return False
-
-        a = ((y2 - y3) * (x - x3) + (x3 - x2) * (y - y3)) / denominator
-        b = ((y3 - y1) * (x - x3) + (x1 - x3) * (y - y3)) / denominator
-        c = 1 - a - b
-
-        return a >= 0 and b >= 0 and c >= 0
-
-    def draw(self):
-        """Draw all game elements to the screen."""
-        screen.fill(DARK_GREY)
-
-        # Draw trapezium score displays at the top
-        self.draw_score_trapeziums()
-
-        # Title with more padding from top
-        #self.draw_text(screen, "Hand Cricket", font_large, WHITE, (SCREEN_WIDTH // 2, 70))
-
-        # Innings and Score (only visible in PLAYING state) with better spacing
-        #if self.current_state >= PLAYING_STATE:
-        #self.draw_text(screen, f"Innings {self.current_innings}", font_medium, WHITE, (SCREEN_WIDTH // 2, 105))
-        #self.draw_text(screen, f"Score: {self.current_score}", font_medium, WHITE, (SCREEN_WIDTH // 2, 130))
-
-        # Target display with padding
-        #if self.current_innings == 2 and self.target > 0:
-        #elf.draw_text(screen, f"Target: {self.target}", font_small, WHITE, (SCREEN_WIDTH // 2, 155))
-
-        # Status message with better positioning and wrapping
-        message_y = 195 if self.current_state >= PLAYING_STATE else 135
-
-        # Split long messages into multiple lines for better display
-        message_lines = []
-        if len(self.message) > 50:
-            words = self.message.split(' ')
-            current_line = ""
-            for word in words:
-                if len(current_line + word) < 50:
-                    current_line += word + " "
-                else:
-                    message_lines.append(current_line.strip())
-                    current_line = word + " "
-            if current_line:
-                message_lines.append(current_line.strip())
-        else:
-            message_lines = [self.message]
-
-        for i, line in enumerate(message_lines):
-            self.draw_text(screen, line, font_small, WHITE,
-                           (SCREEN_WIDTH // 2, message_y + i * 20))
-
-        if self.current_state == TOSS_STATE:
+        return inside_triangle(point[0], point[1], triangle)
+
+    def message_lines(self):
+        """The message as rendered lines, wrapped to the message width."""
+        return self.message_text.lines(self.message, fonts.small, WHITE,
+                                       self.layout.length(MESSAGE_WIDTH))
+
+    def message_y(self):
+        if self.view.state < PLAYING_STATE:
+            return 135
+        # Longer messages grow upwards, clear of the hand labels
+        extra_lines = max(len(self.message_lines()) - 2, 0)
+        return 195 - extra_lines * MESSAGE_LINE_HEIGHT
+
+    def draw_message(self, surface):
+        """Draw the status message band."""
+        message_y = self.message_y()
+        for i, line in enumerate(self.message_lines()):
+            center = self.layout.point(
+                (SCREEN_WIDTH // 2, message_y + i * MESSAGE_LINE_HEIGHT))
+            surface.blit(line, line.get_rect(center=center))
+
+    def draw_choice_buttons(self, surface):
+        """Draw the Odd/Even or Bat/Bowl buttons."""
+        rects = self.button_rects
+        radius = self.layout.length(8)
+        state = self.view.state
+        if state == TOSS_STATE:
             # Draw toss buttons with more padding
-            pygame.draw.rect(screen,
+            pygame.draw.rect(surface,
                              ORANGE,
-                             self.odd_button_rect,
-                             border_radius=8)
-            self.draw_text(screen, "Odd", font_medium, WHITE,
-                           self.odd_button_rect.center)
-            pygame.draw.rect(screen,
+                             rects[ODD_BUTTON],
+                             border_radius=radius)
+            self.draw_text(surface, "Odd", fonts.medium, WHITE,
+                           rects[ODD_BUTTON].center)
+            pygame.draw.rect(surface,
                              BLUE,
-                             self.even_button_rect,
-                             border_radius=8)
-            self.draw_text(screen, "Even", font_medium, WHITE,
-                           self.even_button_rect.center)
+                             rects[EVEN_BUTTON],
+                             border_radius=radius)
+            self.draw_text(surface, "Even", fonts.medium, WHITE,
+                           rects[EVEN_BUTTON].center)
 
-        elif self.current_state == CHOOSE_STATE:
+        elif state == CHOOSE_STATE:
             # Draw bat/bowl buttons with more padding
-            pygame.draw.rect(screen,
+            pygame.draw.rect(surface,
                              self.Atext_color,
-                             self.bat_button_rect,
-                             border_radius=8)
-            self.draw_text(screen, "Bat", font_medium, WHITE,
-                           self.bat_button_rect.center)
-            pygame.draw.rect(screen,
+                             rects[BAT_BUTTON],
+                             border_radius=radius)
+            self.draw_text(surface, "Bat", fonts.medium, WHITE,
+                           rects[BAT_BUTTON].center)
+            pygame.draw.rect(surface,
                              self.Otext_color,
-                             self.bowl_button_rect,
-                             border_radius=8)
-            self.draw_text(screen, "Bowl", font_medium, WHITE,
-                           self.bowl_button_rect.center)
-
-        elif self.current_state >= TOSS_PLAY_STATE:
-            # Display hand images with better spacing
-            hand_y_position = 250
-
-            # Show player hand image (default to hands[0] if no selection made)
-            player_image = self.player_hand_image if self.player_hand_image else self.hand_images[
-                0]
-            screen.blit(player_image, (-25, hand_y_position))
-            self.draw_text(screen, "Batsman", font_small, self.Atext_color,
-                           (player_image.get_width() // 2,
-                            hand_y_position + player_image.get_height() - 120))
-            if self.lower_hand_image:
-                screen.blit(self.lower_hand_image,
-                            (-25, hand_y_position + 100))
-
-            # Show bowler hand image (default to hands[0] if no selection made)
-            bowler_image = self.bowler_hand_image if self.bowler_hand_image else self.hand_images[
-                0]
-            flipped_image = pygame.transform.flip(bowler_image, True, False)
-            screen.blit(flipped_image,
-                        (SCREEN_WIDTH - flipped_image.get_width() + 25,
-                         hand_y_position))
-            self.draw_text(
-                screen, "Bowler", font_small, self.Otext_color,
-                (SCREEN_WIDTH - flipped_image.get_width() // 2,
-                 hand_y_position + flipped_image.get_height() - 120))
-            if self.lower_hand_image:
-                flipped_lower_image = pygame.transform.flip(
-                    self.lower_hand_image, True, False)
-                screen.blit(flipped_lower_image,
-                            (SCREEN_WIDTH - flipped_lower_image.get_width() +
-                             25, hand_y_position + 100))
-            # Draw hexagonal triangular buttons
-            for i, triangle in enumerate(self.triangle_buttons):
-                # Draw triangle button
-                pygame.draw.polygon(screen, self.BUTTON_COLOR, triangle)
-                pygame.draw.polygon(screen, BLACK, triangle, 3)  # Border
-
-                # Calculate text position (centroid of triangle)
-                text_x = sum(point[0] for point in triangle) // 3
-                text_y = sum(point[1] for point in triangle) // 3
-
-                self.draw_text(screen, str(i + 1), font_medium, WHITE,
-                               (text_x, text_y))
-
-        # Restart button with padding from bottom
-        pygame.draw.rect(screen,
+                             rects[BOWL_BUTTON],
+                             border_radius=radius)
+            self.draw_text(surface, "Bowl", fonts.medium, WHITE,
+                           rects[BOWL_BUTTON].center)
+
+    def draw_hands(self, surface):
+        """Draw the batsman and bowler hand panels."""
+        # Positions are worked out in design units from the design image
+        # sizes, then mapped once; the images are already at the window scale
+        layout = self.layout
+        hand_width, hand_height = HAND_SIZE
+        lower_width = LOWER_HAND_SIZE[0]
+
+        bowler_x = SCREEN_WIDTH - hand_width + HAND_BLEED
+        frame = self.reveal_frame
+        pump = self.scaled_atlas.pump.frames if frame is not None else None
+
+        # Show player hand image (default to hands[0] if no selection made)
+        if pump:
+            self.draw_pump_frame(surface, pump[False][frame], -HAND_BLEED)
+        else:
+            player_image = self.player_hand_image or self.hand_images[0]
+            surface.blit(player_image, layout.point((-HAND_BLEED, HAND_Y)))
+        self.draw_text(surface, "Batsman", fonts.small, self.Atext_color,
+                       layout.point((hand_width // 2,
+                                     HAND_Y + hand_height - 120)))
+        if self.lower_hand_image:
+            surface.blit(self.lower_hand_image,
+                        layout.point((-HAND_BLEED, HAND_Y + 100)))
+
+        # Show bowler hand image (default to hands[0] if no selection made)
+        if pump:
+            self.draw_pump_frame(surface, pump[True][frame], bowler_x)
+        else:
+            bowler_image = self.bowler_hand_image or \
+                self.bowler_hand_images[0]
+            surface.blit(bowler_image, layout.point((bowler_x, HAND_Y)))
+        self.draw_text(surface, "Bowler", fonts.small, self.Otext_color,
+                       layout.point((SCREEN_WIDTH - hand_width // 2,
+                                     HAND_Y + hand_height - 120)))
+        if self.bowler_lower_hand_image:
+            surface.blit(self.bowler_lower_hand_image,
+                        layout.point((SCREEN_WIDTH - lower_width + HAND_BLEED,
+                                      HAND_Y + 100)))
+
+    def draw_pump_frame(self, surface, frame, x):
+        """Blit a prerendered pump frame for the hand drawn at x."""
+        image, (dx, dy) = frame
+        left, top = self.layout.point((x, HAND_Y))
+        surface.blit(image, (left + dx, top + dy))
+
+    def draw_hexagon(self, surface):
+        """Draw the hexagonal triangular number buttons."""
+        border = self.layout.length(3)
+        pressed_color = tuple(min(channel + PRESSED_LIGHTEN, 255)
+                              for channel in self.BUTTON_COLOR)
+        for i, triangle in enumerate(self.hex_shapes):
+            # Draw triangle button
+            color = pressed_color if i + 1 == self.pressed else \
+                self.BUTTON_COLOR
+            pygame.draw.polygon(surface, color, triangle)
+            pygame.draw.polygon(surface, BLACK, triangle, border)  # Border
+
+            self.draw_text(surface, str(i + 1), fonts.medium, WHITE,
+                           self.hex_labels[i])
+
+    def draw_restart_button(self, surface):
+        """Draw the restart button with padding from bottom."""
+        rect = self.button_rects[RESTART_BUTTON]
+        pygame.draw.rect(surface,
                          GREEN,
-                         self.restart_button_rect,
-                         border_radius=8)
-        self.draw_text(screen, "Restart", font_small, WHITE,
-                       self.restart_button_rect.center)
+                         rect,
+                         border_radius=self.layout.length(8))
+        self.draw_text(surface, "Restart", fonts.small, WHITE, rect.center)
+
+    def shows_hands(self):
+        state = self.view.state
+        return state >= TOSS_PLAY_STATE and state != CHOOSE_STATE
+
+    def render_regions(self):
+        """
+        Return (name, bounds, key, draw, layer) for every screen region in
+        z-order.
+
+        bounds is the area the region paints (None when hidden in this state)
+        and key captures all the state it depends on; a region is redrawn only
+        when either changes. draw(surface) paints the region on the screen
+        for a DYNAMIC region, or on its static layer.
+        """
+        rects = self.button_rects
+        view = self.view
+        if view.state == TOSS_STATE:
+            buttons = rects[ODD_BUTTON].union(rects[EVEN_BUTTON])
+        elif view.state == CHOOSE_STATE:
+            buttons = rects[BAT_BUTTON].union(rects[BOWL_BUTTON])
+        else:
+            buttons = None
+        message_y = self.message_y()
+        lines = self.message_lines()
+        message = self.layout.rect((0, message_y - 12, SCREEN_WIDTH,
+                                    len(lines) * MESSAGE_LINE_HEIGHT + 6))
+        hands = self.shows_hands()
+        regions = (
+            ("panels", self.score_rect, self.panel_colors(),
+             self.draw_score_trapeziums, BACKGROUND),
+            ("buttons", buttons,
+             (view.state, self.Atext_color, self.Otext_color),
+             self.draw_choice_buttons, BACKGROUND),
+            ("scores", self.score_rect, (view, self.side_names),
+             self.draw_scores, DYNAMIC),
+            ("message", message, (message_y, self.message), self.draw_message,
+             DYNAMIC),
+            ("hands", self.hands_rect if hands else None,
+             (self.player_hand, self.bowler_hand,
+              self.reveal_frame, self.Atext_color, self.Otext_color),
+             self.draw_hands, DYNAMIC),
+            ("hexagon", self.hex_area if hands else None,
+             (self.BUTTON_COLOR, self.pressed), self.draw_hexagon, FOREGROUND),
+            ("restart", rects[RESTART_BUTTON], None,
+             self.draw_restart_button, FOREGROUND),
+        )
+        # Overlays are listed while hidden too, so the area they covered is
+        # repainted
+        if self.show_stats:
+            stats = ("stats", self.layout.rect(STATS_RECT),
+                     self.stats_lines(), self.draw_stats, DYNAMIC)
+        else:
+            stats = ("stats", None, None, self.draw_stats, DYNAMIC)
+        if self.profiler.enabled:
+            lines = self.profiler.overlay_lines()
+            profiler = ("profiler", self.profiler_rect(lines), lines,
+                        self.draw_profiler, DYNAMIC)
+        else:
+            profiler = ("profiler", None, None, self.draw_profiler, DYNAMIC)
+        return regions + (stats, profiler)
+
+    def build_profiler(self):
+        """Frame profiler with a section for each part of a frame."""
+        profiler = FrameProfiler()
+        for method, name in (("update_layers", "layers"),
+                             ("draw_scores", "scores"),
+                             ("message_lines", "wrap"),
+                             ("draw_message", "message"),
+                             ("draw_hands", "hands")):
+            profiler.time_section(self, method, name)
+        profiler.time_section(pygame.display, "update", "present")
+        profiler.track("click>feedback", self.latency.feedback)
+        profiler.track("click>result", self.latency.result)
+        # New Surfaces come from text renders and transforms; the layers
+        # and scaled assets are only made on a resize
+        profiler.watch("text", self.text_renders)
+        profiler.watch("surfaces", self.text_renders)
+        for function in ("flip", "scale", "smoothscale", "rotate",
+                         "rotozoom"):
+            profiler.count_calls(pygame.transform, function, "surfaces")
+        # What dirty rects save: frames that push anything, and how much
+        profiler.watch("pushes", lambda: self.frames_drawn)
+        profiler.watch("kpx", lambda: self.pixels_pushed / 1000)
+        return profiler
+
+    def text_renders(self):
+        return self.text_cache.renders + self.message_text.renders
+
+    def draw_profiler(self, surface):
+        """Draw the profiler overlay below the scores."""
+        lines = self.profiler.overlay_lines()
+        surface.fill(BLACK, self.profiler_rect(lines))
+        top = SCORE_RECT.bottom
+        for i, line in enumerate(lines):
+            text = self.profiler_text.render(line, fonts.vsmall, WHITE)
+            surface.blit(text, self.layout.point(
+                (4, top + 2 + i * PROFILER_LINE_HEIGHT)))
+
+    def profiler_rect(self, lines):
+        return self.layout.rect((0, SCORE_RECT.bottom, SCREEN_WIDTH,
+                                 len(lines) * PROFILER_LINE_HEIGHT + 4))
+
+    def toggle_stats(self):
+        self.show_stats = not self.show_stats
+
+    def stats_lines(self):
+        """
+        Text and histogram of the stats screen, as a tuple that is only
+        rebuilt when the summary has changed.
+        """
+        if self.stats is None:
+            return ("Statistics are off",), ()
+        lines = self.stats.read(self.summary_lines)
+        return lines if lines is not None else (("Loading statistics...",), ())
+
+    def summary_lines(self, summary):
+        # Called under the store's lock, so summary is not changing
+        version, lines = self.stats_cache
+        if version == summary.version:
+            return lines
+        played = summary.played
+        streak = summary.streak
+        text = [
+            f"{summary.name} statistics",
+            f"Played {played}   Won {summary.wins}   "
+            f"Lost {summary.losses}   Tied {summary.ties}",
+            f"Win rate {summary.wins / played if played else 0:.0%}   "
+            f"Streak {abs(streak)} {'won' if streak >= 0 else 'lost'}",
+            f"Best {summary.best}   Average {summary.average:.1f}",
+            f"Tosses won {summary.tosses_won} of {played}",
+        ]
+        opponents = sorted(summary.opponents.items(),
+                           key=lambda item: -sum(item[1]))
+        for name, (wins, losses, ties) in opponents[:STATS_OPPONENTS]:
+            text.append(f"v {name}: {wins}-{losses}-{ties}")
+        buckets = [0] * STATS_BUCKETS
+        for runs, count in summary.scores.items():
+            buckets[min(runs // STATS_BUCKET_RUNS, STATS_BUCKETS - 1)] += count
+        lines = (tuple(text), tuple(buckets))
+        self.stats_cache = (summary.version, lines)
+        return lines
+
+    def draw_stats(self, surface):
+        """Draw the statistics screen over the play area."""
+        text, buckets = self.stats_lines()
+        layout = self.layout
+        rect = layout.rect(STATS_RECT)
+        pygame.draw.rect(surface, BLACK, rect)
+        pygame.draw.rect(surface, GRAY, rect, layout.length(2))
+        for i, line in enumerate(text):
+            font = fonts.small if i else fonts.medium
+            surface.blit(self.text_cache.render(line, font, WHITE),
+                         layout.point((STATS_RECT.x + 12, STATS_RECT.y + 10 +
+                                       i * STATS_LINE_HEIGHT + (6 if i else 0))))
+        if not any(buckets):
+            return
+        # Histogram of scores along the bottom, one bar per bucket of runs
+        width = (STATS_RECT.width - 24) // STATS_BUCKETS
+        bottom = STATS_RECT.bottom - 20
+        most = max(buckets)
+        for i, count in enumerate(buckets):
+            x = STATS_RECT.x + 12 + i * width
+            height = STATS_BAR_HEIGHT * count // most
+            if height:
+                pygame.draw.rect(surface, BLUE, layout.rect(
+                    (x + 2, bottom - height, width - 4, height)))
+            label = f"{i * STATS_BUCKET_RUNS}+" if i == STATS_BUCKETS - 1 \
+                else str(i * STATS_BUCKET_RUNS)
+            self.draw_text(surface, label, fonts.vsmall, GRAY,
+                           layout.point((x + width // 2, bottom + 10)))
+
+    def invalidate(self):
+        """Force the whole screen to be redrawn on the next render."""
+        self.drawn_regions = {}
+        self.full_redraw = True
+
+    def update_layers(self, regions):
+        """Redraw each static layer whose regions changed since it was drawn."""
+        for layer, surface in self.layers.items():
+            parts = [(bounds, key, draw) for _, bounds, key, draw, region_layer
+                     in regions if region_layer == layer]
+            key = [(bounds, key) for bounds, key, _ in parts]
+            if self.layer_keys.get(layer) == key:
+                continue
+            self.layer_keys[layer] = key
+            surface.fill(DARK_GREY if layer == BACKGROUND else TRANSPARENT)
+            surface.set_clip(self.design_rect)
+            for bounds, _, draw in parts:
+                if bounds:
+                    draw(surface)
+            surface.set_clip(None)
+
+    def snapshot(self):
+        """
+        The match as the view shows it. A fresh snapshot, unless a ball is
+        being decided on the worker, which owns the match until it reports
+        back; the last one is kept until then.
+        """
+        if not self.worker.busy:
+            self.view = self.match.snapshot()
+        return self.view
+
+    def render(self):
+        """Redraw only the regions whose state changed and push those rects."""
+        self.snapshot()
+        regions = self.render_regions()
+        self.update_layers(regions)
+        dirty = []
+        for name, bounds, key, _, _ in regions:
+            previous = self.drawn_regions.get(name)
+            if previous == (bounds, key):
+                continue
+            # Clear where the region was, paint where it now is
+            if previous and previous[0]:
+                dirty.append(previous[0])
+            if bounds:
+                dirty.append(bounds)
+            self.drawn_regions[name] = (bounds, key)
+        if self.full_redraw:
+            dirty = [screen.get_rect()]
+            self.full_redraw = False
+        if not dirty:
+            return False
+
+        # Grow each dirty rect over every region it touches. Regions are
+        # always repainted whole: clipping polygons mid-shape rasterizes
+        # their borders differently from a full redraw.
+        areas = [bounds for _, bounds, _, _, _ in regions if bounds]
+        grown = []
+        for rect in dirty:
+            touching = rect.collidelistall(areas)
+            while touching:
+                rect = rect.unionall([areas[i] for i in touching])
+                wider = rect.collidelistall(areas)
+                if wider == touching:
+                    break
+                touching = wider
+            if not any(other.contains(rect) for other in grown):
+                grown = [other for other in grown if not rect.contains(other)]
+                grown.append(rect)
+        dirty = grown
+
+        background = self.layers[BACKGROUND]
+        foreground = self.layers[FOREGROUND]
+        # Only blend the foreground where it has something drawn
+        overlays = [bounds for _, bounds, _, _, layer in regions
+                    if layer == FOREGROUND and bounds]
+        for rect in dirty:
+            screen.blit(background, rect, rect)
+            screen.set_clip(self.design_rect)
+            # Repaint everything inside this rect so stacking is kept
+            for _, bounds, _, draw, layer in regions:
+                if layer == DYNAMIC and bounds and bounds.colliderect(rect):
+                    draw(screen)
+            screen.set_clip(None)
+            for bounds in overlays:
+                if bounds.colliderect(rect):
+                    area = bounds.clip(rect)
+                    screen.blit(foreground, area, area)
+
+        pygame.display.update(dirty)
+        self.latency.presented()
+        self.frames_drawn += 1
+        self.pixels_pushed += sum(rect.w * rect.h for rect in dirty)
+        return True
 
-        pygame.display.flip()
+    def draw(self):
+        """Draw all game elements to the screen."""
+        self.invalidate()
+        self.render()
+
+    def build_hit_index(self):
+        """Precompute which widget every pixel belongs to in each state."""
+        index = HitIndex(SCREEN_WIDTH, SCREEN_HEIGHT)
+        index.add_rect([TOSS_STATE], ODD_BUTTON, self.odd_button_rect)
+        index.add_rect([TOSS_STATE], EVEN_BUTTON, self.even_button_rect)
+        index.add_rect([CHOOSE_STATE], BAT_BUTTON, self.bat_button_rect)
+        index.add_rect([CHOOSE_STATE], BOWL_BUTTON, self.bowl_button_rect)
+        # Added in reverse so the first triangle wins on shared edges
+        for i in reversed(range(len(self.triangle_buttons))):
+            index.add_triangle([TOSS_PLAY_STATE, PLAYING_STATE], i + 1,
+                               self.triangle_buttons[i])
+        # Restart is checked before anything else
+        index.add_rect(ALL_STATES, RESTART_BUTTON, self.restart_button_rect)
+        return index
+
+    def widget_at(self, pos):
+        """Widget under a window position in the current state, or None."""
+        return self.hit_index.lookup(self.snapshot().state,
+                                     self.layout.to_design(pos))
 
     def handle_click(self, pos):
-        """Processes clicks on buttons based on the current state."""
-        if self.restart_button_rect.collidepoint(pos):
+        """Queue a click on a button; it is applied once the game is ready."""
+        if self.show_stats:
+            # The stats screen covers the buttons; a click closes it
+            self.show_stats = False
+            return
+        widget = self.widget_at(pos)
+        if widget is None:
+            return
+        if widget == RESTART_BUTTON:
+            # Restart drops whatever was waiting
+            self.inputs.clear()
+        elif self.scheduler.waiting:
+            # The toss or an innings is being settled; the game moves on by
+            # itself
+            return
+        group = "number" if widget in NUMBER_BUTTONS else widget
+        self.inputs.push(widget, group)
+        self.pump_input()
+
+    def pump_input(self):
+        """Apply queued clicks for as long as the game is ready for them."""
+        inputs = self.inputs
+        while inputs and not self.worker.busy:
+            if inputs.peek().widget != RESTART_BUTTON:
+                if self.scheduler.waiting:
+                    # The last ball brought up a result; drop the rest
+                    inputs.clear()
+                    return
+                if self.revealing:
+                    # Picked up again by end_reveal
+                    return
+            self.apply_input(inputs.pop())
+
+    def apply_input(self, item):
+        """Perform a queued click in the current state."""
+        widget = item.widget
+        state = self.current_state
+        if widget == RESTART_BUTTON:
             self.restart_game()
+        elif state == TOSS_STATE and widget in (ODD_BUTTON, EVEN_BUTTON):
+            self.Otext_color = (100, 100, 100)
+            self.Atext_color = (100, 100, 100)
+            self.call_toss("Odd" if widget == ODD_BUTTON else "Even")
+        elif state == TOSS_PLAY_STATE and widget in NUMBER_BUTTONS:
+            self.play_toss_turn(widget)
+        elif state == CHOOSE_STATE and widget in (BAT_BUTTON, BOWL_BUTTON):
+            self.set_first_innings("Bat" if widget == BAT_BUTTON else "Bowl")
+        elif state == PLAYING_STATE and widget in NUMBER_BUTTONS:
+            self.start_turn(widget, item.clicked_at)
             return
-
-        if self.current_state == TOSS_STATE:
+        else:
+            return
+        self.latency.shown(item.clicked_at)
+        self.latency.done(item.clicked_at)
+
+    def pump(self):
+        """Show balls the worker has decided, then apply waiting clicks."""
+        if self.worker.drain():
+            self.pump_input()
+
+    def start_worker(self):
+        """Decide balls on a background thread from now on."""
+        def wake():
+            pygame.event.post(pygame.event.Event(RULES_EVENT))
+        self.worker = RulesWorker(wake)
+
+    def handle_event(self, event):
+        """Events the main loop does not handle itself; none by default."""
+
+    def close(self):
+        self.worker.close()
+        if self.log:
+            self.log.close()
+        if self.profiler.enabled:
+            self.profiler.dump(PROFILE_DUMP_PATH)
+        if self.opponent:
+            self.opponent.save(self.opponent_path)
+        if self.stats:
+            self.stats.close()
+
+    def on_ball(self, match, batter, bowler, runs, out):
+        """Match hook: log every ball and let the opponent learn from it."""
+        if self.log:
+            self.log.record_ball(match, batter, bowler, runs, out)
+        if self.opponent:
+            self.opponent.observe(match, batter, bowler, runs, out)
+
+    def start_recording(self, seed=None):
+        """Reseed the match RNG and record the inputs of a new match."""
+        if seed is None:
+            seed = self.seeds.getrandbits(32)
+        self.match.rng.seed(seed)
+        match_format = self.match.format
+        self.recording = Recording(seed, format=[match_format.wickets,
+                                                 match_format.overs],
+                                   strategy=self.strategy)
+        self.recording_started = self.scheduler.now
+
+    def record(self, kind, value):
+        self.recording.add(self.scheduler.now - self.recording_started, kind,
+                           value)
+
+    def apply_action(self, kind, value):
+        """Perform a recorded input as if the player had clicked it."""
+        if kind == CALL:
             self.Otext_color = (100, 100, 100)
             self.Atext_color = (100, 100, 100)
-            if self.odd_button_rect.collidepoint(pos):
-                self.toss_choice = "Odd"
-                self.message = "Now choose a number for the toss."
-                self.current_state = TOSS_PLAY_STATE
-            elif self.even_button_rect.collidepoint(pos):
-                self.toss_choice = "Even"
-                self.message = "Now choose a number for the toss."
-                self.current_state = TOSS_PLAY_STATE
-
-        elif self.current_state == TOSS_PLAY_STATE:
-            for i, triangle in enumerate(self.triangle_buttons):
-                if self.point_in_triangle(pos, triangle):
-                    self.play_toss_turn(i + 1)
-                    break
-
-        elif self.current_state == CHOOSE_STATE:
-            if self.bat_button_rect.collidepoint(pos):
-                self.toss_bat_bowl_choice = "Bat"
-                self.set_first_innings()
-            elif self.bowl_button_rect.collidepoint(pos):
-                self.toss_bat_bowl_choice = "Bowl"
-                self.set_first_innings()
-
-        elif self.current_state == PLAYING_STATE:
-            for i, triangle in enumerate(self.triangle_buttons):
-                if self.point_in_triangle(pos, triangle):
-                    self.play_turn(i + 1)
-                    break
+        if kind == BALL:
+            # Balls record both numbers, so replays never consult the AI
+            self.play_turn(*value)
+            return
+        actions = {CALL: self.call_toss, TOSS: self.play_toss_turn,
+                   CHOOSE: self.set_first_innings}
+        actions[kind](value)
 
-        elif self.current_state == RESULT_STATE:
-            # No action, wait for restart
-            pass
+    def call_toss(self, choice):
+        """Player calls Odd or Even for the toss."""
+        self.record(CALL, choice)
+        self.match.call_toss(choice)
+        self.message = "Now choose a number for the toss."
 
     def play_toss_turn(self, player_choice):
         """Logic for the odd/even toss after the initial choice."""
-        bowler_choice = random.randint(1, 6)
+        self.record(TOSS, player_choice)
+        match = self.match
+        bowler_choice = match.rng.randint(1, 6)
         self.BUTTON_COLOR = (100, 100, 100)
         self.Atext_color = (100, 100, 100)
         self.Otext_color = (100, 100, 100)
-        self.player_hand_image = self.hand_images.get(player_choice)
-        self.bowler_hand_image = self.hand_images.get(bowler_choice)
+        self.player_hand = player_choice
+        self.bowler_hand = bowler_choice
+        self.reveal_hands()
 
         total = player_choice + bowler_choice
         result = "Even" if total % 2 == 0 else "Odd"
 
         self.message = f"You: {player_choice}, Computer: {bowler_choice}. Total: {total} ({result})."
 
-        self.draw()
-        time.sleep(2)
+        self.scheduler.after(TOSS_REVEAL_MS, self.finish_toss, player_choice,
+                             bowler_choice)
 
-        if self.toss_choice == result:
-            self.toss_winner = "Player"
+    def finish_toss(self, player_choice, bowler_choice):
+        """Applies the toss once its hands have been shown."""
+        match = self.match
+        match.play_toss(player_choice, bowler_choice)
+        if match.toss_winner == PLAYER:
             self.message = "Player wins the toss! Choose to Bat or Bowl."
-            self.current_state = CHOOSE_STATE
         else:
-            self.toss_winner = "Computer"
             self.message = "Computer wins the toss and chooses to Bat."
-            self.toss_bat_bowl_choice = "Bat"
-            self.set_first_innings()
-        self.player_hand_image = None
-        self.bowler_hand_image = None
-        self.draw()
-        time.sleep(1)
+            self.show_first_innings()
+        self.player_hand = None
+        self.bowler_hand = None
+        self.scheduler.after(TOSS_RESULT_MS, self.restore_label_colors,
+                             blocking=False)
+
+    def restore_label_colors(self):
         self.Atext_color = (186, 140, 99)
         self.Otext_color = (255, 114, 118)
 
-    def set_first_innings(self):
-        """Sets up the game based on the toss winner's choice."""
-        if self.toss_winner == "Player":
-            if self.toss_bat_bowl_choice == "Bat":
+    def reveal_hands(self):
+        """Pump both fists, then show the hands, timed by the frame clock."""
+        def pump(t):
+            self.reveal_frame = pump_frame(t) if t < 1 else None
+        self.revealing = True
+        self.scheduler.tween(REVEAL_MS, pump, self.end_reveal)
+
+    def end_reveal(self):
+        self.revealing = False
+        self.pump_input()
+
+    def set_first_innings(self, choice):
+        """Sets up the game based on the player's Bat or Bowl choice."""
+        self.record(CHOOSE, choice)
+        self.match.choose(choice)
+        self.show_first_innings()
+
+    def show_first_innings(self):
+        """Colours and message for the start of the first innings."""
+        if self.toss_winner == PLAYER:
+            if self.player1_is_batting_first:
                 self.BUTTON_COLOR = (186, 140, 99)
-                self.player1_is_batting_first = True
                 self.message = "Player is batting first."
             else:
                 self.BUTTON_COLOR = (255, 114, 118)
-                self.player1_is_batting_first = False
                 self.message = "Player is bowling first."
-        else:  # Computer won toss and its choice is already determined as "Bat"
-            computer_choice = random.choice(["Bat", "Bowl"])
-            if computer_choice == 'Bat':
-                self.BUTTON_COLOR = (255, 114, 118)
-                self.player1_is_batting_first = False
-                self.message = "Computer is batting first."
-            else:
+        else:
+            if self.player1_is_batting_first:
                 self.BUTTON_COLOR = (186, 140, 99)
-                self.player1_is_batting_first = True
                 self.message = "Computer is bowling first."
-
-        self.current_state = PLAYING_STATE
-        self.current_innings = 1
+            else:
+                self.BUTTON_COLOR = (255, 114, 118)
 
         if not self.player1_is_batting_first:
-            # If computer is batting first, simulate its innings
+            # Computer is batting first
             self.message = "Computer's turn to bat. Please select a number to bowl."
 
-    def play_turn(self, player_choice):
+    def play_turn(self, player_choice, computer_choice=None):
         """Main game logic for a single turn."""
-        # Determine who is batting and who is bowling
-        player_is_batting = (self.player1_is_batting_first and self.current_innings == 1) or \
-                            (not self.player1_is_batting_first and self.current_innings == 2)
-
+        match = self.match
+        turn = (player_choice, match.player_is_batting, match.innings,
+                match.score)
+        self.show_turn(*turn, match.deliver(player_choice, computer_choice))
+
+    def start_turn(self, player_choice, clicked_at):
+        """
+        Have the worker play a ball; the pressed number is lit up until it
+        reports back with the outcome.
+        """
+        match = self.match
+        turn = (player_choice, match.player_is_batting, match.innings,
+                match.score)
+        self.pressed = player_choice
+        self.latency.shown(clicked_at)
+
+        def done(outcome):
+            self.pressed = None
+            self.show_turn(*turn, outcome)
+            self.latency.done(clicked_at)
+
+        self.worker.submit(match.deliver, done, player_choice)
+
+    def show_turn(self, player_choice, player_is_batting, innings, score,
+                  outcome):
+        """Present a ball the match has just played."""
+        match = self.match
+        computer_choice = match.computer_number
+        self.record(BALL, [player_choice, computer_choice])
+        out = player_choice == computer_choice
+        runs, wickets, _ = match.innings_totals(innings)
+
+        self.reveal_hands()
         if player_is_batting:
-
-            self.player_hand_image = self.hand_images.get(player_choice)
-
-            bowler_choice = random.randint(1, 6)
-            self.bowler_hand_image = self.hand_images.get(bowler_choice)
-
-            if player_choice == bowler_choice:
-                self.message = f"Computer chose {bowler_choice}. OUT! Final score: {self.current_score}"
-                self.end_innings()
+            self.player_hand = player_choice
+            self.bowler_hand = computer_choice
+            if outcome == OUT:
+                self.message = f"Computer chose {computer_choice}. OUT! Final score: {score}"
+            elif out:
+                self.message = f"Computer chose {computer_choice}. OUT! {wickets} down for {score}."
             else:
-                self.current_score += player_choice
-                self.message = f"Computer chose {bowler_choice}. Scored {player_choice} runs."
-                # Check if target is reached in second innings
-                if self.current_innings == 2 and self.current_score >= self.target:
-                    self.message += f"\nTarget reached! Game won!"
-                    self.end_innings()
+                self.message = f"Computer chose {computer_choice}. Scored {player_choice} runs."
         else:
             # Player is bowling
-
-            player_hand = random.randint(1, 6)
-            self.player_hand_image = self.hand_images.get(player_hand)
-            self.bowler_hand_image = self.hand_images.get(player_choice)
-
-            if player_hand == player_choice:
-                self.message = f"You chose {player_choice}. OUT! Final score: {self.current_score}"
-                self.end_innings()
+            self.player_hand = computer_choice
+            self.bowler_hand = player_choice
+            if outcome == OUT:
+                self.message = f"You chose {player_choice}. OUT! Final score: {score}"
+            elif out:
+                self.message = f"You chose {player_choice}. OUT! {wickets} down for {score}."
             else:
-                self.current_score += player_hand
-                self.message = f"You chose {player_choice}. Computer scored {player_hand} runs."
-                # Check if target is reached in second innings
-                if self.current_innings == 2 and self.current_score >= self.target:
-                    self.message += f"\nTarget reached! Game won!"
-                    self.end_innings()
+                self.message = f"You chose {player_choice}. Computer scored {computer_choice} runs."
 
-    def end_innings(self):
-        """Ends the current innings and transitions to the next."""
-        if self.current_innings == 1:
-            if self.player1_is_batting_first:
-                self.player1_score = self.current_score
-                self.target = self.player1_score + 1
-            else:
-                self.player2_score = self.current_score
-                self.target = self.player2_score + 1
+        if outcome == TARGET_REACHED:
+            self.message += f"\nTarget reached! Game won!"
+        elif outcome == OVERS_DONE:
+            self.message += f"\nOvers done! Final score: {runs}"
+        if outcome in INNINGS_OVER:
+            self.end_innings()
 
+    def end_innings(self):
+        """Shows the transition after the match closed an innings."""
+        if self.current_state == PLAYING_STATE:
+            # First innings done, the chase starts
             self.message += f"\nTarget to chase: {self.target} runs."
-            self.draw()
-            time.sleep(2)
-
-            self.current_innings = 2
-            self.current_score = 0
-            self.player_hand_image = None
-            self.bowler_hand_image = None
-            if self.player1_is_batting_first:
-                self.message = "Computer is batting. Please select a number to bowl."
-                self.BUTTON_COLOR = (255, 114, 118)
-            else:
-                self.message = "Player, it's your turn to bat!"
-                self.BUTTON_COLOR = (186, 140, 99)
-
-        elif self.current_innings == 2:
-            if self.player1_is_batting_first:
-                self.BUTTON_COLOR = (255, 114, 118)
-                self.player2_score = self.current_score
-            else:
-                self.BUTTON_COLOR = (186, 140, 99)
-                self.player1_score = self.current_score
+            self.scheduler.after(INNINGS_BREAK_MS, self.start_chase)
+        else:
             self.show_result()
 
-    def show_result(self):
-        """Determines and displays the final game result."""
-        self.current_state = RESULT_STATE
-        self.game_over = True
-
+    def start_chase(self):
+        """Clears the innings break and sets up the second innings."""
+        self.player_hand = None
+        self.bowler_hand = None
         if self.player1_is_batting_first:
-            self.BUTTON_COLOR = (100, 100, 100)
-            if self.player2_score >= self.target:
-                self.message = f"Computer wins! Score: {self.player2_score}"
-            elif self.player1_score > self.player2_score:
-                self.message = f"Player wins! Score: {self.player1_score}"
-            else:
-                self.message = f"It's a Tie! Both scored {self.player1_score}"
+            self.message = "Computer is batting. Please select a number to bowl."
+            self.BUTTON_COLOR = (255, 114, 118)
         else:
-            self.BUTTON_COLOR = (100, 100, 100)
-            if self.player1_score >= self.target:
-                self.message = f"Player wins! Score: {self.player1_score}"
-            elif self.player2_score > self.player1_score:
-                self.message = f"Computer wins! Score: {self.player2_score}"
-            else:
-                self.message = f"It's a Tie! Both scored {self.player1_score}"
+            self.message = "Player, it's your turn to bat!"
+            self.BUTTON_COLOR = (186, 140, 99)
 
-    def restart_game(self):
+    def show_result(self):
+        """Displays the final game result."""
+        if self.log:
+            self.log.flush()
+        self.recording.result = match_result(self.match)
+        if self.replay_path:
+            append_recording(self.replay_path, self.recording)
+        if self.opponent:
+            self.opponent.save(self.opponent_path)
+        if self.stats:
+            self.stats.record(MatchResult.from_match(self.match,
+                                                     self.side_names))
+        self.BUTTON_COLOR = (100, 100, 100)
+        winner = self.match.winner
+        if winner == PLAYER:
+            self.message = f"Player wins! Score: {self.player1_score}"
+        elif winner == COMPUTER:
+            self.message = f"Computer wins! Score: {self.player2_score}"
+        else:
+            self.message = f"It's a Tie! Both scored {self.player1_score}"
+
+        series = self.series
+        series.record(winner)
+        if series.format.matches > 1:
+            self.message += f"\nSeries: Player {series.wins[0]} - " \
+                f"{series.wins[1]} Computer"
+            if series.over:
+                self.message += "\nSeries drawn!" if series.winner is None \
+                    else f"\n{series.winner} wins the series!"
+
+    def restart_game(self, seed=None):
         """Resets all game state variables."""
-        self.current_score = 0
-        self.player1_score = 0
-        self.player2_score = 0
-        self.current_innings = 1
-        self.target = 0
-        self.game_over = False
-        self.player_hand_image = None
-        self.bowler_hand_image = None
+        self.scheduler.cancel_all()
+        self.reveal_frame = None
+        self.revealing = False
+        self.inputs.clear()
+        self.match.reset()
+        if self.series.over:
+            self.series = Series(self.match.format)
+        self.start_recording(seed)
+        if self.log:
+            self.log.start_match()
+        self.player_hand = None
+        self.bowler_hand = None
         self.last_bowler_choice = None
-        self.current_state = TOSS_STATE
-        self.toss_choice = None
-        self.toss_winner = None
-        self.toss_bat_bowl_choice = None
-        self.player1_is_batting_first = None
         self.message = "Player , choose Odd or Even to toss."
         self.BUTTON_COLOR = (100, 100, 100)
         self.Atext_color = (100, 100, 100)
@@ -601,18 +1277,112 @@ class HandCricketGame:
 
 # --- Main Game Loop ---
 def main():
-    game = HandCricketGame()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Odd or Even Hand Cricket.")
+    parser.add_argument("--connect", metavar="HOST:PORT",
+                        help="play another person through server.py")
+    parser.add_argument("--fullscreen", action="store_true")
+    parser.add_argument("--size", metavar="WxH",
+                        help="window size (default 400x600)")
+    parser.add_argument("--wickets", type=int, default=1,
+                        help="wickets per innings")
+    parser.add_argument("--overs", type=int,
+                        help="overs per innings (default: no limit)")
+    parser.add_argument("--series", type=int, default=1, metavar="MATCHES",
+                        help="play a series of this many matches")
+    parser.add_argument("--strategy", metavar="NAME",
+                        help="batched strategy for the computer, e.g. "
+                        "uniform or policy (default: the adaptive opponent)")
+    args = parser.parse_args()
+    try:
+        match_format = Format(args.wickets, args.overs, args.series)
+    except ValueError as error:
+        parser.error(str(error))
+    if args.connect and match_format != Format():
+        parser.error("network matches use the standard format")
+    if args.strategy:
+        from strategies import STRATEGIES
+
+        if args.connect:
+            parser.error("network matches have no computer to play")
+        if args.strategy not in STRATEGIES:
+            parser.error(f"unknown strategy {args.strategy!r} "
+                         f"(choose from {', '.join(STRATEGIES)})")
+
+    size = None
+    if args.size:
+        width, _, height = args.size.partition("x")
+        size = (int(width), int(height))
+    init_display(size, args.fullscreen)
+    if args.connect:
+        # Network mode: python main.py --connect HOST:PORT
+        from netgame import NetworkGame
+
+        host, _, port = args.connect.rpartition(":")
+        game = NetworkGame(host or "127.0.0.1", int(port))
+    else:
+        game = HandCricketGame(format=match_format, strategy=args.strategy)
+    game.fullscreen = args.fullscreen
+    if args.fullscreen:
+        # Leaving fullscreen opens the window at the requested size
+        game.windowed_size = size or (SCREEN_WIDTH, SCREEN_HEIGHT)
+    game.draw()
+    # Reported in the profiler dump; a windowed build has no console
+    startup = game.profiler.startup
+    startup["first_frame_ms"] = (time.perf_counter() - START_TIME) * 1000
+    # The toss screen shows no hands; load them and the pump frames while
+    # it waits for input
+    game.preload()
+    startup["preloaded_ms"] = (time.perf_counter() - START_TIME) * 1000
+    startup["assets"] = "pack" if game.atlas.source is not None else "images"
+    run(game)
+
+
+def run(game, speed=1.0):
+    """Run the event loop until the window closes; speed scales game time."""
+    clock = pygame.time.Clock()
+    profiler = game.profiler
+    game.start_worker()
     running = True
 
     while running:
+        game.scheduler.update(clock.tick(FPS) * speed)
+        if profiler.enabled:
+            profiler.begin_frame()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 game.handle_click(event.pos)
-
-        game.draw()
-
+            elif event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                game.invalidate()
+            elif event.type == pygame.VIDEORESIZE:
+                game.resize(event.size)
+            elif event.type == pygame.KEYDOWN and event.key == FULLSCREEN_KEY:
+                game.toggle_fullscreen()
+            elif event.type == pygame.KEYDOWN and event.key == STATS_KEY:
+                game.toggle_stats()
+            elif event.type == pygame.KEYDOWN and event.key == PROFILER_KEY:
+                profiler.toggle()
+            elif event.type == pygame.KEYDOWN and \
+                    event.key == PROFILE_DUMP_KEY and profiler.enabled:
+                # The overlay shows where it went
+                profiler.dump(PROFILE_DUMP_PATH)
+            else:
+                game.handle_event(event)
+
+        game.pump()
+        rendered = game.render()
+        if profiler.enabled:
+            profiler.end_frame()
+        if not rendered and not game.scheduler.busy:
+            # Nothing changed or pending: sleep until the next input event
+            event = pygame.event.wait(IDLE_WAIT_MS)
+            if event.type != pygame.NOEVENT:
+                pygame.event.post(event)
+
+    game.close()
     pygame.quit()
     sys.exit()
 
@@ -0,0 +1,160 @@
+"""
+Append-only binary ball-by-ball match log.
+
+A log is an 8-byte header followed by fixed-width little-endian records,
+one per delivery:
+
+    match    uint32  match number within the log
+    innings  uint8   1 or 2
+    batter   uint8   number shown by the batter
+    bowler   uint8   number shown by the bowler
+    runs     uint8   runs scored off the ball (0 when out)
+    out      uint8   1 if the batter was dismissed
+
+MatchLogWriter packs records into a fixed buffer and writes it out in
+large chunks. read_log() memory-maps a log as a NumPy structured array
+without copying, so scans run at disk speed. Only the reader needs NumPy.
+"""
+import os
+import struct
+
+LOG_MAGIC = b"HCLG"
+LOG_VERSION = 1
+HEADER = struct.Struct("<4sHH")
+RECORD = struct.Struct("<IBBBBB")
+
+# Records buffered before each write
+BUFFER_RECORDS = 8192
+
+
+def record_dtype():
+    import numpy as np
+
+    return np.dtype([("match", "<u4"), ("innings", "u1"), ("batter", "u1"),
+                     ("bowler", "u1"), ("runs", "u1"), ("out", "u1")])
+
+
+def read_header(log_file, path):
+    """Read and check a log's header; ValueError if it is not a match log."""
+    header = log_file.read(HEADER.size)
+    if len(header) == HEADER.size:
+        magic, version, size = HEADER.unpack(header)
+        if magic == LOG_MAGIC and version == LOG_VERSION and \
+                size == RECORD.size:
+            return magic, version, size
+    raise ValueError(f"{path} is not a match log")
+
+
+def open_log(path):
+    """
+    MatchLogWriter appending to path. A file there that is not a match log
+    (e.g. cut short before its header was written) is moved aside to
+    path + ".bad" and a fresh log started.
+    """
+    try:
+        return MatchLogWriter(path)
+    except ValueError as error:
+        print(f"Warning: {error}. Moving it to {path}.bad and starting a "
+              "new log.")
+        os.replace(path, path + ".bad")
+        return MatchLogWriter(path)
+
+
+class MatchLogWriter:
+    """Buffered appender; usable as a context manager."""
+
+    def __init__(self, path, buffer_records=BUFFER_RECORDS):
+        self.path = path
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        self.file = open(path, "r+b" if exists else "wb")
+        if exists:
+            try:
+                self.match_id = self.check_header() + 1
+            except ValueError:
+                self.file.close()
+                raise
+        else:
+            self.file.write(HEADER.pack(LOG_MAGIC, LOG_VERSION, RECORD.size))
+            self.match_id = 0
+        # Whether the current match number has been used yet
+        self.match_started = False
+        self.buffer = bytearray(RECORD.size * buffer_records)
+        self.used = 0
+
+    def check_header(self):
+        """Validate an existing log and return its last match number."""
+        magic, version, size = read_header(self.file, self.path)
+        end = self.file.seek(0, os.SEEK_END)
+        # Drop a partial record left by an interrupted write
+        whole = HEADER.size + (end - HEADER.size) // size * size
+        self.file.truncate(whole)
+        self.file.seek(whole)
+        if whole == HEADER.size:
+            return -1
+        self.file.seek(whole - size)
+        last = RECORD.unpack(self.file.read(size))[0]
+        self.file.seek(whole)
+        return last
+
+    def start_match(self):
+        """Following records belong to a new match."""
+        if self.match_started:
+            self.match_id += 1
+            self.match_started = False
+
+    def record(self, innings, batter, bowler, runs, out):
+        if self.used == len(self.buffer):
+            self.flush()
+        RECORD.pack_into(self.buffer, self.used, self.match_id, innings,
+                         batter, bowler, runs, out)
+        self.used += RECORD.size
+        self.match_started = True
+
+    def record_ball(self, match, batter, bowler, runs, out):
+        """engine.Match on_ball hook."""
+        self.record(match.innings, batter, bowler, runs, out)
+
+    def flush(self):
+        if self.used:
+            self.file.write(memoryview(self.buffer)[:self.used])
+            self.used = 0
+        self.file.flush()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_log(path):
+    """Memory-map a log as a read-only structured array of records."""
+    import numpy as np
+
+    with open(path, "rb") as log_file:
+        magic, version, size = read_header(log_file, path)
+    count = (os.path.getsize(path) - HEADER.size) // RECORD.size
+    if count == 0:
+        return np.empty(0, dtype=record_dtype())
+    return np.memmap(path, dtype=record_dtype(), mode="r",
+                     offset=HEADER.size, shape=(count,))
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    import numpy as np
+
+    started = time.perf_counter()
+    balls = read_log(sys.argv[1])
+    matches = np.unique(balls["match"]).size
+    outs = int(balls["out"].sum())
+    runs = int(balls["runs"].sum(dtype=np.int64))
+    elapsed = time.perf_counter() - started
+    print(f"{len(balls)} balls, {matches} matches, {outs} wickets, "
+          f"{runs} runs ({elapsed:.2f}s)")
@@ -0,0 +1,323 @@
+"""
+Vectorized Monte-Carlo simulation of many Hand Cricket matches at once.
+
+Every match follows the same rules as engine.Match: a ball is OUT when both
+numbers are equal, otherwise the batter's number is added to the score, and
+the chase stops as soon as the score reaches target = first innings + 1.
+Instead of one ball at a time, each step draws the next delivery for every
+match still in play with a single NumPy call.
+
+    result = simulate(10_000_000, seed=1)
+    result.win_rates()
+
+simulate_strategies plays batched strategies (see strategies.py) instead
+of fixed weights, asking both sides for a number at every live position
+each ball.
+"""
+import numpy as np
+
+# Winner codes in BatchResult.winner
+TIE = 0
+PLAYER_WIN = 1
+COMPUTER_WIN = 2
+
+# How many matches are simulated together; bounds memory for huge runs
+CHUNK_SIZE = 1 << 20
+
+# Innings between batched strategies end after this many balls; a uniform
+# innings lasts this long about once in 1e47
+MAX_STRATEGY_BALLS = 600
+
+# A strategy is a weight for each number 1..6
+UNIFORM = (1, 1, 1, 1, 1, 1)
+
+# A delivery is one of 36 (bat, bowl) cells: cell = (bat - 1) * 6 + bowl - 1
+_CELLS = np.arange(36)
+_BAT = _CELLS // 6 + 1
+_BOWL = _CELLS % 6 + 1
+# Runs off each cell, or -1 when the batter is OUT
+CELL_VALUE = np.where(_BAT == _BOWL, -1, _BAT).astype(np.int8)
+CELL_EVEN = (_BAT + _BOWL) % 2 == 0
+
+
+def normalize(weights):
+    """Turn six non-negative weights into probabilities."""
+    weights = np.asarray(weights, dtype=np.float64)
+    if weights.shape != (6,) or (weights < 0).any() or weights.sum() <= 0:
+        raise ValueError("A strategy needs six non-negative weights")
+    return weights / weights.sum()
+
+
+def check_count(n):
+    if n < 1:
+        raise ValueError(f"Need at least one match to simulate, not {n}")
+
+
+class DeliverySampler:
+    """Draws (bat, bowl) cells for a fixed batter and bowler strategy."""
+
+    def __init__(self, batter, bowler):
+        bat = normalize(batter)
+        bowl = normalize(bowler)
+        # Otherwise the innings would never end
+        if not (bat * bowl).any():
+            raise ValueError("The batter can never be out: the strategies "
+                             "never show the same number")
+        self.uniform = np.allclose(bat, 1 / 6) and np.allclose(bowl, 1 / 6)
+        cdf = np.cumsum(np.outer(bat, bowl).ravel())
+        cdf[-1] = 1.0
+        self.cdf = cdf
+
+    def draw(self, rng, size):
+        if self.uniform:
+            return rng.integers(0, 36, size=size, dtype=np.uint8)
+        return np.searchsorted(self.cdf, rng.random(size), side="right")
+
+
+def play_innings(rng, sampler, n, target=None):
+    """
+    Play n innings side by side and return (score, balls) arrays.
+
+    With a target the innings also ends once the score reaches it.
+    """
+    score = np.empty(n, dtype=np.int32)
+    balls = np.empty(n, dtype=np.int32)
+    # Innings still in play, kept compact so each step only touches them
+    live = np.arange(n, dtype=np.int32)
+    live_score = np.zeros(n, dtype=np.int32)
+    need = None if target is None else target.astype(np.int32)
+    ball = 0
+
+    while live.size:
+        ball += 1
+        value = CELL_VALUE[sampler.draw(rng, live.size)]
+        out = value < 0
+        live_score += value
+        done = out if need is None else out | (live_score >= need)
+
+        ended = np.flatnonzero(done)
+        finished = live[ended]
+        # Undo the -1 that marked a dismissal
+        score[finished] = live_score[ended] + out[ended]
+        balls[finished] = ball
+
+        carry = np.flatnonzero(~done)
+        live = live[carry]
+        live_score = live_score[carry]
+        if need is not None:
+            need = need[carry]
+
+    return score, balls
+
+
+class BatchResult:
+    """Per-match outcome arrays for a batch of simulated matches."""
+
+    __slots__ = ("player1_is_batting_first", "first_score", "second_score",
+                 "first_balls", "second_balls", "target", "winner")
+
+    def __init__(self, player1_is_batting_first, first_score, second_score,
+                 first_balls, second_balls):
+        self.player1_is_batting_first = player1_is_batting_first
+        self.first_score = first_score
+        self.second_score = second_score
+        self.first_balls = first_balls
+        self.second_balls = second_balls
+        self.target = first_score + 1
+
+        # Same decision as engine.Match.finish; chased and defended never
+        # both hold, and neither means a tie
+        chased = (second_score >= self.target).view(np.int8)
+        defended = (first_score > second_score).view(np.int8)
+        first = player1_is_batting_first.view(np.int8)
+        chaser = PLAYER_WIN + first  # Computer chases when player bats first
+        setter = COMPUTER_WIN - first
+        self.winner = chased * chaser + defended * setter
+
+    def __len__(self):
+        return len(self.winner)
+
+    @property
+    def player1_score(self):
+        return np.where(self.player1_is_batting_first, self.first_score,
+                        self.second_score)
+
+    @property
+    def player2_score(self):
+        return np.where(self.player1_is_batting_first, self.second_score,
+                        self.first_score)
+
+    def win_rates(self):
+        """Fraction of matches won by the player, the computer and tied."""
+        counts = np.bincount(self.winner, minlength=3) / max(len(self), 1)
+        return {
+            "Player": float(counts[PLAYER_WIN]),
+            "Computer": float(counts[COMPUTER_WIN]),
+            "Tie": float(counts[TIE]),
+        }
+
+    def score_distribution(self):
+        """Count of first and second innings scores, indexed by score."""
+        return (np.bincount(self.first_score),
+                np.bincount(self.second_score))
+
+    @classmethod
+    def concatenate(cls, results):
+        results = list(results)
+        return cls(*(np.concatenate([getattr(r, name) for r in results])
+                     for name in cls.__slots__[:5]))
+
+
+def simulate_toss(rng, n, player, computer):
+    """Vectorized toss and bat/bowl choice; True where the player bats first."""
+    calls_even = rng.integers(0, 2, size=n, dtype=np.uint8) == 1
+    # Both numbers come from the 36-cell joint draw of a single delivery
+    cell = DeliverySampler(player, computer).draw(rng, n)
+    total_even = CELL_EVEN[cell]
+    player_wins = calls_even == total_even
+    # Whoever wins the toss picks Bat or Bowl with equal chance
+    winner_bats = rng.integers(0, 2, size=n, dtype=np.uint8) == 1
+    return np.where(player_wins, winner_bats, ~winner_bats)
+
+
+def simulate_chunk(rng, n, player, computer):
+    player1_first = simulate_toss(rng, n, player, computer)
+    player_bats = DeliverySampler(player, computer)
+    computer_bats = DeliverySampler(computer, player)
+
+    first_score = np.empty(n, dtype=np.int32)
+    first_balls = np.empty(n, dtype=np.int32)
+    second_score = np.empty(n, dtype=np.int32)
+    second_balls = np.empty(n, dtype=np.int32)
+    for mask, first, second in ((player1_first, player_bats, computer_bats),
+                                (~player1_first, computer_bats, player_bats)):
+        idx = np.flatnonzero(mask)
+        score, balls = play_innings(rng, first, idx.size)
+        first_score[idx] = score
+        first_balls[idx] = balls
+        score, balls = play_innings(rng, second, idx.size, target=score + 1)
+        second_score[idx] = score
+        second_balls[idx] = balls
+
+    return BatchResult(player1_first, first_score, second_score, first_balls,
+                       second_balls)
+
+
+def simulate(n, player=UNIFORM, computer=UNIFORM, seed=None,
+             chunk_size=CHUNK_SIZE):
+    """
+    Simulate n Player vs Computer matches and return a BatchResult.
+
+    player and computer are six weights for how often each side shows the
+    numbers 1..6, uniform like random.randint(1, 6) by default.
+    """
+    check_count(n)
+    rng = np.random.default_rng(seed)
+    chunks = []
+    for start in range(0, n, chunk_size):
+        size = min(chunk_size, n - start)
+        chunks.append(simulate_chunk(rng, size, player, computer))
+    if len(chunks) == 1:
+        return chunks[0]
+    return BatchResult.concatenate(chunks)
+
+
+def play_strategy_innings(rng, batter, bowler, n, target=None):
+    """
+    play_innings with the numbers picked by two batched strategies.
+
+    Strategies may never show the same number (Fixed6 against Fixed1, say),
+    so an innings also ends after MAX_STRATEGY_BALLS.
+    """
+    from strategies import positions
+
+    score = np.empty(n, dtype=np.int32)
+    balls = np.empty(n, dtype=np.int32)
+    live = np.arange(n, dtype=np.int32)
+    state = positions(n)
+    state["innings"] = 1 if target is None else 2
+    if target is not None:
+        state["target"] = target
+    ball = 0
+
+    while live.size:
+        ball += 1
+        state["balls"] = ball - 1
+        state["batting"] = True
+        bat = batter.pick(state, rng)
+        state["batting"] = False
+        bowl = bowler.pick(state, rng)
+        out = bat == bowl
+        live_score = state["score"]
+        live_score += np.where(out, 0, bat)
+        done = out if target is None else out | (live_score >=
+                                                 state["target"])
+        if ball == MAX_STRATEGY_BALLS:
+            done[:] = True
+
+        ended = np.flatnonzero(done)
+        finished = live[ended]
+        score[finished] = live_score[ended]
+        balls[finished] = ball
+
+        carry = np.flatnonzero(~done)
+        live = live[carry]
+        state = state[carry]
+
+    return score, balls
+
+
+def simulate_strategy_chunk(rng, n, player, computer):
+    from strategies import positions
+
+    # Toss: both sides pick a number and the winner makes the call
+    toss = positions(n)
+    calls_even = rng.integers(0, 2, size=n, dtype=np.uint8) == 1
+    total = player.pick(toss, rng).astype(np.int16) + computer.pick(toss, rng)
+    player_wins = calls_even == (total % 2 == 0)
+    player1_first = np.where(player_wins, player.choose(toss, rng),
+                             ~computer.choose(toss, rng))
+
+    first_score = np.empty(n, dtype=np.int32)
+    first_balls = np.empty(n, dtype=np.int32)
+    second_score = np.empty(n, dtype=np.int32)
+    second_balls = np.empty(n, dtype=np.int32)
+    for mask, first, second in ((player1_first, player, computer),
+                                (~player1_first, computer, player)):
+        idx = np.flatnonzero(mask)
+        score, balls = play_strategy_innings(rng, first, second, idx.size)
+        first_score[idx] = score
+        first_balls[idx] = balls
+        score, balls = play_strategy_innings(rng, second, first, idx.size,
+                                             target=score + 1)
+        second_score[idx] = score
+        second_balls[idx] = balls
+
+    return BatchResult(player1_first, first_score, second_score, first_balls,
+                       second_balls)
+
+
+def simulate_strategies(n, player, computer, seed=None,
+                        chunk_size=CHUNK_SIZE):
+    """Simulate n matches between two strategies.Strategy objects."""
+    check_count(n)
+    rng = np.random.default_rng(seed)
+    chunks = [simulate_strategy_chunk(rng, min(chunk_size, n - start),
+                                      player, computer)
+              for start in range(0, n, chunk_size)]
+    if len(chunks) == 1:
+        return chunks[0]
+    return BatchResult.concatenate(chunks)
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    started = time.perf_counter()
+    result = simulate(count, seed=0)
+    elapsed = time.perf_counter() - started
+    print(f"{count} matches in {elapsed:.2f}s "
+          f"({count / elapsed:,.0f} matches/s)")
+    print(result.win_rates())
@@ -0,0 +1,190 @@
+"""
+Network mode for the pygame client: play another person through server.py.
+
+    python main.py --connect HOST:PORT
+
+NetworkGame keeps the normal screens but its Match is only a mirror of the
+server's, refreshed from every STATE message. A reader thread turns
+incoming messages into pygame events, so the main loop still sleeps until
+there is input from either the mouse or the network.
+"""
+import socket
+import threading
+
+import pygame
+
+from engine import (TOSS_STATE, TOSS_PLAY_STATE, CHOOSE_STATE, PLAYING_STATE,
+                    RESULT_STATE, OUT, TARGET_REACHED, Match)
+from main import (HandCricketGame, NUMBER_BUTTONS, RESTART_BUTTON, ODD_BUTTON,
+                  EVEN_BUTTON, BAT_BUTTON, BOWL_BUTTON)
+from netproto import (JOIN, CALL, CHOOSE, COMMIT, REVEAL, START, STATE,
+                      REVEAL_NOW, ERROR, OPPONENT_LEFT, SIDES, encode, commit,
+                      apply_state, recv_message)
+
+NET_EVENT = pygame.event.custom_type()
+
+BAT_COLOR = (186, 140, 99)
+BOWL_COLOR = (255, 114, 118)
+
+
+class NetworkGame(HandCricketGame):
+
+    def __init__(self, host, port):
+        super().__init__(log_path=None, replay_path=None, opponent_path=None,
+                         stats_path=None)
+        self.match = Match(human_opponent=True)
+        self.side = None
+        self.pending = None  # (number, nonce) committed but not revealed
+        self.sock = socket.create_connection((host, port))
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        threading.Thread(target=self.read_messages, daemon=True).start()
+        self.join()
+
+    def read_messages(self):
+        """Reader thread: post every server message as a NET_EVENT."""
+        try:
+            while True:
+                kind, fields = recv_message(self.sock)
+                pygame.event.post(pygame.event.Event(NET_EVENT, kind=kind,
+                                                     fields=fields))
+        except (OSError, ValueError):
+            pygame.event.post(pygame.event.Event(NET_EVENT, kind=None,
+                                                 fields=()))
+
+    def send(self, kind, *fields):
+        try:
+            self.sock.sendall(encode(kind, *fields))
+        except OSError:
+            self.message = "Lost the connection to the server."
+
+    def join(self):
+        self.match.reset()
+        self.side = None
+        self.pending = None
+        self.player_hand = None
+        self.bowler_hand = None
+        self.side_names = ("Player", "Opponent")
+        self.BUTTON_COLOR = (100, 100, 100)
+        self.message = "Waiting for an opponent..."
+        self.send(JOIN)
+
+    @property
+    def my_side(self):
+        return SIDES[self.side]
+
+    @property
+    def i_am_batting(self):
+        return (self.side == 0) == self.match.player_is_batting
+
+    def handle_click(self, pos):
+        if self.show_stats:
+            self.show_stats = False
+            return
+        widget = self.widget_at(pos)
+        if widget == RESTART_BUTTON:
+            # Queue for a new match once this one is over or abandoned
+            if self.side is None or self.current_state == RESULT_STATE:
+                self.join()
+            return
+        if self.side is None or self.scheduler.waiting:
+            return
+
+        state = self.current_state
+        if state == TOSS_STATE and self.side == 0:
+            if widget in (ODD_BUTTON, EVEN_BUTTON):
+                self.send(CALL, 0 if widget == ODD_BUTTON else 1)
+        elif state == CHOOSE_STATE and self.my_side == self.toss_winner:
+            if widget in (BAT_BUTTON, BOWL_BUTTON):
+                self.send(CHOOSE, 0 if widget == BAT_BUTTON else 1)
+        elif state in (TOSS_PLAY_STATE, PLAYING_STATE):
+            if widget in NUMBER_BUTTONS and self.pending is None:
+                digest, nonce = commit(widget)
+                self.pending = (widget, nonce)
+                self.send(COMMIT, digest)
+                self.message = f"You chose {widget}. Waiting for opponent..."
+
+    def close(self):
+        self.sock.close()
+        super().close()
+
+    def handle_event(self, event):
+        if event.type != NET_EVENT:
+            return
+        if event.kind is None:
+            self.side = None
+            self.message = "Disconnected from the server."
+        elif event.kind == START:
+            self.side = event.fields[0]
+            self.side_names = ("You", "Opponent") if self.side == 0 \
+                else ("Opponent", "You")
+        elif event.kind == REVEAL_NOW:
+            self.send(REVEAL, *self.pending)
+        elif event.kind == STATE:
+            self.show_state(event.fields)
+        elif event.kind == OPPONENT_LEFT:
+            self.side = None
+            self.message = "Your opponent left. Restart to find a new one."
+        elif event.kind == ERROR:
+            self.message = f"The server rejected that move ({event.fields[0]})."
+
+    def show_state(self, fields):
+        """Present a STATE update from the server."""
+        match = self.match
+        innings = match.innings
+        batting = self.side is not None and match.state == PLAYING_STATE \
+            and self.i_am_batting
+        revealed = self.pending is not None
+        self.pending = None
+        outcome = apply_state(match, fields)
+
+        lines = []
+        if revealed:
+            # Both numbers are known now; show them as hands
+            mine, theirs = match.player_number, match.computer_number
+            if self.side == 1:
+                mine, theirs = theirs, mine
+            batter, bowler = (mine, theirs) if batting or outcome is None \
+                else (theirs, mine)
+            self.player_hand = batter
+            self.bowler_hand = bowler
+            self.reveal_hands()
+            if outcome is None:
+                lines.append(f"You: {mine}, Opponent: {theirs}.")
+            elif outcome == OUT:
+                lines.append(f"You: {mine}, Opponent: {theirs}. OUT!")
+            elif batting:
+                lines.append(f"Opponent chose {theirs}. You scored {mine}.")
+            else:
+                lines.append(f"You chose {mine}. Opponent scored {theirs}.")
+            if outcome == TARGET_REACHED:
+                lines.append("Target reached!")
+
+        state = match.state
+        if state == TOSS_STATE:
+            lines.append("Choose Odd or Even to toss." if self.side == 0
+                         else "Opponent is calling the toss.")
+        elif state == TOSS_PLAY_STATE:
+            lines.append("Choose a number for the toss.")
+        elif state == CHOOSE_STATE:
+            lines.append("You win the toss! Choose to Bat or Bowl."
+                         if self.my_side == match.toss_winner
+                         else "Opponent won the toss and is choosing.")
+        elif state == PLAYING_STATE:
+            if match.innings != innings:
+                lines.append(f"Target to chase: {match.target} runs.")
+            if not revealed or match.innings != innings:
+                lines.append("You are batting." if self.i_am_batting
+                             else "You are bowling.")
+        else:
+            if match.winner is None:
+                lines.append("It's a Tie!")
+            else:
+                lines.append("You win!" if match.winner == self.my_side
+                             else "Opponent wins!")
+            lines.append("Press Restart to play again.")
+        self.message = "\n".join(lines)
+
+        if state == PLAYING_STATE:
+            self.BUTTON_COLOR = BAT_COLOR if self.i_am_batting else BOWL_COLOR
+        else:
+            self.BUTTON_COLOR = (100, 100, 100)
@@ -0,0 +1,137 @@
+"""
+Binary wire protocol for network hand cricket.
+
+Every message is a one-byte type followed by a fixed-size little-endian
+payload, so a reader needs no length prefix: it reads the type byte, then
+exactly PAYLOADS[type].size bytes.
+
+Numbers are played with simultaneous-reveal commits. Each side first sends
+COMMIT with sha256(number || nonce), the server answers both with REVEAL
+only once it holds both commits, and each side then sends REVEAL with the
+number and nonce. The server checks them against the commits, so neither
+side can see or react to the other's number before locking in its own.
+
+Side 0 is the engine's PLAYER (it calls the toss), side 1 its COMPUTER.
+"""
+import hashlib
+import os
+import struct
+
+from engine import PLAYER, COMPUTER
+
+SIDES = (PLAYER, COMPUTER)
+NO_SIDE = 255
+NO_VALUE = 255
+
+NONCE_SIZE = 16
+DIGEST_SIZE = 32
+
+# Client -> server
+JOIN = 0x01  # queue for the next match
+CALL = 0x02  # side 0 calls the toss: 0 Odd, 1 Even
+CHOOSE = 0x03  # toss winner: 0 Bat, 1 Bowl
+COMMIT = 0x04  # digest of the number about to be played
+REVEAL = 0x05  # the number and the nonce behind the commit
+
+# Server -> client
+START = 0x81  # matched; payload is your side
+STATE = 0x82  # match state after every step
+REVEAL_NOW = 0x83  # both sides have committed
+ERROR = 0x84  # a message was rejected; payload is an error code
+OPPONENT_LEFT = 0x85  # the match is abandoned
+
+PAYLOADS = {
+    JOIN: struct.Struct("<"),
+    CALL: struct.Struct("<B"),
+    CHOOSE: struct.Struct("<B"),
+    COMMIT: struct.Struct(f"<{DIGEST_SIZE}s"),
+    REVEAL: struct.Struct(f"<B{NONCE_SIZE}s"),
+    START: struct.Struct("<B"),
+    # state, innings, toss winner, side batting first, score, side 0
+    # score, side 1 score, target, side 0 number, side 1 number, outcome
+    # of the last ball, winner
+    STATE: struct.Struct("<BBBBHHHHBBBB"),
+    REVEAL_NOW: struct.Struct("<"),
+    ERROR: struct.Struct("<B"),
+    OPPONENT_LEFT: struct.Struct("<"),
+}
+
+# ERROR codes
+BAD_MESSAGE = 1
+NOT_YOUR_TURN = 2
+BAD_REVEAL = 3
+
+TOSS_CALLS = ("Odd", "Even")
+BAT_BOWL = ("Bat", "Bowl")
+
+
+def encode(kind, *fields):
+    return bytes([kind]) + PAYLOADS[kind].pack(*fields)
+
+
+def commit(number):
+    """Return (digest, nonce) committing to number."""
+    nonce = os.urandom(NONCE_SIZE)
+    return digest(number, nonce), nonce
+
+
+def digest(number, nonce):
+    return hashlib.sha256(bytes([number]) + nonce).digest()
+
+
+def side_code(name):
+    return NO_SIDE if name is None else SIDES.index(name)
+
+
+def encode_state(match, outcome=None):
+    """STATE message for a Match; outcome is the last ball's, if any."""
+    if match.player1_is_batting_first is None:
+        batting_first = NO_SIDE
+    else:
+        batting_first = 0 if match.player1_is_batting_first else 1
+    return encode(STATE, match.state, match.innings,
+                  side_code(match.toss_winner), batting_first, match.score,
+                  match.player1_score, match.player2_score, match.target,
+                  match.player_number or 0, match.computer_number or 0,
+                  NO_VALUE if outcome is None else outcome,
+                  NO_SIDE if match.winner is None else side_code(match.winner))
+
+
+def apply_state(match, fields):
+    """Copy decoded STATE fields onto a Match mirror; returns the outcome."""
+    (match.state, match.innings, toss_winner, batting_first, match.score,
+     match.player1_score, match.player2_score, match.target,
+     match.player_number, match.computer_number, outcome, winner) = fields
+    match.toss_winner = None if toss_winner == NO_SIDE else SIDES[toss_winner]
+    match.player1_is_batting_first = \
+        None if batting_first == NO_SIDE else batting_first == 0
+    match.winner = None if winner == NO_SIDE else SIDES[winner]
+    return None if outcome == NO_VALUE else outcome
+
+
+async def read_message(reader):
+    """Read one message from an asyncio stream as (kind, fields)."""
+    kind = (await reader.readexactly(1))[0]
+    payload = PAYLOADS.get(kind)
+    if payload is None:
+        raise ValueError(f"unknown message type {kind}")
+    return kind, payload.unpack(await reader.readexactly(payload.size))
+
+
+def recv_message(sock):
+    """Blocking counterpart of read_message for a plain socket."""
+    kind = recv_exactly(sock, 1)[0]
+    payload = PAYLOADS.get(kind)
+    if payload is None:
+        raise ValueError(f"unknown message type {kind}")
+    return kind, payload.unpack(recv_exactly(sock, payload.size))
+
+
+def recv_exactly(sock, size):
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("connection closed")
+        data += chunk
+    return data
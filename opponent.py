@@ -0,0 +1,186 @@
+"""
+Adaptive computer opponent that learns the player's number habits.
+
+The player's picks are modelled separately for batting and bowling with
+order-0, order-1 and order-2 Markov counts (no context, the previous pick,
+the previous two picks). Each ball adds to three count rows and the
+prediction blends those rows from the shortest context up, trusting a
+longer context more as it gathers evidence.
+
+Counts decay so recent habits outweigh old ones. Rather than multiplying
+every counter by the decay factor each ball, new counts are added at a
+growing scale, which is equivalent and keeps updates O(1). All counters
+live in two fixed-size arrays; when the scale gets large they are divided
+back down in one pass, every few hundred balls.
+
+The model is pure Python over a handful of floats, so a pick takes a few
+microseconds. It is saved between sessions as a small binary profile:
+
+    opponent = AdaptiveOpponent.load("opponent_profile.bin")
+    match = Match(computer=opponent.pick)
+    match.on_ball = opponent.observe
+    ...
+    opponent.save("opponent_profile.bin")
+"""
+import os
+import struct
+from array import array
+
+PROFILE_MAGIC = b"HCOP"
+PROFILE_VERSION = 1
+PROFILE_HEADER = struct.Struct("<4sHHf")
+
+BATTING = 0  # Player is batting, the computer bowls
+BOWLING = 1  # Player is bowling, the computer bats
+ROLES = 2
+
+# Count rows per role: one order-0, six order-1 and 36 order-2 contexts
+ROWS = 1 + 6 + 36
+
+# Weight of a ball after each later ball
+DECAY = 0.98
+# Evidence (in balls) at which a context is trusted as much as the
+# shorter contexts blended before it
+TRUST = 2.0
+# Chance of a uniform random pick, so the computer is never fully
+# predictable itself
+EXPLORE = 0.1
+# Rough runs still to come when the computer survives a ball
+FUTURE_RUNS = 15
+# Counters are rescaled once the growing scale passes this
+RESCALE_AT = 1e6
+
+
+class AdaptiveOpponent:
+
+    def __init__(self, counts=None, totals=None, decay=DECAY, explore=EXPLORE):
+        # counts[(role * ROWS + row) * 6 + number - 1], stored at self.scale
+        if counts is None:
+            counts = array("d", bytes(8 * ROLES * ROWS * 6))
+            totals = array("d", bytes(8 * ROLES * ROWS))
+        self.counts = counts
+        self.totals = totals
+        self.decay = decay
+        self.explore = explore
+        self.scale = 1.0
+        # Player's last two picks per role, 0 when unknown
+        self.history = [[0, 0] for _ in range(ROLES)]
+
+    def rows(self, role):
+        """Count rows for the role's current context, shortest first."""
+        last, before = self.history[role]
+        base = role * ROWS
+        rows = [base]
+        if last:
+            rows.append(base + last)
+            if before:
+                rows.append(base + 7 + (before - 1) * 6 + last - 1)
+        return rows
+
+    def predict(self, role):
+        """Probability of each of 1..6 being the player's next pick."""
+        probabilities = [1 / 6] * 6
+        counts = self.counts
+        for row in self.rows(role):
+            total = self.totals[row]
+            if not total:
+                continue
+            evidence = total / self.scale
+            trust = evidence / (evidence + TRUST)
+            start = row * 6
+            for i in range(6):
+                probabilities[i] += trust * (counts[start + i] / total -
+                                             probabilities[i])
+        return probabilities
+
+    def observe_pick(self, role, number):
+        """Learn one pick of the player's in O(1)."""
+        self.scale /= self.decay
+        weight = self.scale
+        for row in self.rows(role):
+            self.counts[row * 6 + number - 1] += weight
+            self.totals[row] += weight
+        history = self.history[role]
+        history[1], history[0] = history[0], number
+        if self.scale > RESCALE_AT:
+            self.rescale()
+
+    def rescale(self):
+        scale = self.scale
+        for i in range(len(self.counts)):
+            self.counts[i] /= scale
+        for i in range(len(self.totals)):
+            self.totals[i] /= scale
+        self.scale = 1.0
+
+    def observe(self, match, batter, bowler, runs, out):
+        """engine.Match on_ball hook."""
+        if match.player_is_batting:
+            self.observe_pick(BATTING, batter)
+        else:
+            self.observe_pick(BOWLING, bowler)
+
+    def pick(self, match):
+        """
+        Computer's number for the current ball of an engine.Match.
+
+        Bowling, it shows the number the player is most likely to bat.
+        Batting, it weighs the runs of each number against the chance the
+        player bowls it, counting only the runs a chase still needs.
+        """
+        rng = match.rng
+        if rng.random() < self.explore:
+            return rng.randint(1, 6)
+        if match.player_is_batting:
+            values = self.predict(BATTING)
+        else:
+            p = self.predict(BOWLING)
+            need = match.target - match.score if match.innings == 2 else 6
+            values = [(1 - p[i]) * (min(i + 1, need) + FUTURE_RUNS)
+                      for i in range(6)]
+        best = max(values)
+        choices = [i + 1 for i in range(6) if values[i] == best]
+        return choices[0] if len(choices) == 1 else rng.choice(choices)
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        """Read a saved profile, or start a fresh one if there is none."""
+        if os.path.exists(path):
+            try:
+                return cls.from_file(path, **kwargs)
+            except (OSError, EOFError, ValueError) as error:
+                print(f"Warning: Could not read {path} ({error}). "
+                      "Starting a new opponent profile.")
+        return cls(**kwargs)
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        with open(path, "rb") as profile:
+            header = profile.read(PROFILE_HEADER.size)
+            if len(header) != PROFILE_HEADER.size:
+                raise ValueError(f"{path} is not an opponent profile")
+            magic, version, rows, decay = PROFILE_HEADER.unpack(header)
+            if magic != PROFILE_MAGIC or version != PROFILE_VERSION or \
+                    rows != ROWS:
+                raise ValueError(f"{path} is not an opponent profile")
+            counts = array("f")
+            counts.fromfile(profile, ROLES * ROWS * 6)
+            totals = array("f")
+            totals.fromfile(profile, ROLES * ROWS)
+        kwargs.setdefault("decay", decay)
+        return cls(array("d", counts), array("d", totals), **kwargs)
+
+    def save(self, path):
+        """
+        Write the counters as float32, about 2 KB. The profile is written
+        beside the old one and swapped in, so an interrupted save leaves the
+        old profile intact.
+        """
+        scale = self.scale
+        partial = path + ".partial"
+        with open(partial, "wb") as profile:
+            profile.write(PROFILE_HEADER.pack(PROFILE_MAGIC, PROFILE_VERSION,
+                                              ROWS, self.decay))
+            array("f", (c / scale for c in self.counts)).tofile(profile)
+            array("f", (t / scale for t in self.totals)).tofile(profile)
+        os.replace(partial, path)
@@ -0,0 +1,27 @@
+"""
+Build step: write the scaled hand atlas to nimages/hands.pack.
+
+Run before PyInstaller so the packaged game memory-maps one file at start
+instead of decoding and scaling every PNG in nimages/.
+"""
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from assets import PACK_PATH, HandAtlas
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else PACK_PATH
+    pygame.font.init()
+    atlas = HandAtlas.build()
+    atlas.save_pack(path)
+    print(f"Wrote {len(atlas.rects)} images to {path} "
+          f"({os.path.getsize(path)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Input pipeline between the event loop and the rules.
+
+Clicks are resolved to widgets as they arrive and queued in an InputQueue.
+While the game is busy with the previous input (a ball being decided or
+its hands being revealed), further clicks wait there and repeats of the
+same kind of input collapse into one, the latest, so a burst of clicks
+plays one more ball rather than several.
+
+Deciding a ball (the computer's pick, the rules and the opponent model
+learning from it) runs on a RulesWorker thread. The event loop keeps
+polling and rendering meanwhile and applies the result once the worker
+reports back. InlineWorker has the same interface but runs each job
+straight away; headless games and replays use it.
+
+LatencyTracker measures from a click to the first frame presenting its
+feedback, and to the first frame presenting its result.
+
+    worker = RulesWorker(wake=lambda: pygame.event.post(...))
+    worker.submit(match.deliver, show_result, number)
+    ...
+    worker.drain()  # on the main thread, calls show_result(outcome)
+"""
+import queue
+import threading
+import time
+from collections import deque
+
+# Latency samples kept for percentiles
+LATENCY_HISTORY = 200
+
+
+class Input:
+    """A queued input: a widget, the group it coalesces in and its time."""
+
+    __slots__ = ("widget", "group", "clicked_at")
+
+    def __init__(self, widget, group, clicked_at):
+        self.widget = widget
+        self.group = group
+        self.clicked_at = clicked_at
+
+
+class InputQueue:
+    """FIFO of inputs where a repeat of the last input's group replaces it."""
+
+    def __init__(self):
+        self.inputs = deque()
+        self.coalesced = 0
+
+    def __len__(self):
+        return len(self.inputs)
+
+    def push(self, widget, group, clicked_at=None):
+        if clicked_at is None:
+            clicked_at = time.perf_counter()
+        inputs = self.inputs
+        if inputs and inputs[-1].group == group:
+            # Latest choice wins; the wait is timed from the first click
+            inputs[-1].widget = widget
+            self.coalesced += 1
+        else:
+            inputs.append(Input(widget, group, clicked_at))
+
+    def peek(self):
+        return self.inputs[0] if self.inputs else None
+
+    def pop(self):
+        return self.inputs.popleft()
+
+    def clear(self):
+        self.inputs.clear()
+
+
+class InlineWorker:
+    """Runs every job on the calling thread as it is submitted."""
+
+    busy = False
+
+    def submit(self, job, done, *args):
+        done(job(*args))
+
+    def drain(self):
+        return 0
+
+    def close(self):
+        pass
+
+
+class RulesWorker:
+    """
+    One background thread running jobs in order.
+
+    submit() and drain() are called from the main thread only. A job's
+    done(result) callback runs on the main thread inside drain(); an
+    exception raised by the job is raised there instead.
+    """
+
+    # Queued to stop the thread
+    CLOSE = object()
+
+    def __init__(self, wake=None):
+        # wake() is called from the worker thread after each job, e.g. to
+        # post an event that ends the main loop's idle wait
+        self.wake = wake
+        self.jobs = queue.Queue()
+        self.results = queue.Queue()
+        self.pending = 0
+        self.thread = threading.Thread(target=self.run, name="rules-worker",
+                                       daemon=True)
+        self.thread.start()
+
+    @property
+    def busy(self):
+        """True while a submitted job has not been drained yet."""
+        return self.pending > 0
+
+    def submit(self, job, done, *args):
+        self.pending += 1
+        self.jobs.put((job, done, args))
+
+    def run(self):
+        while True:
+            item = self.jobs.get()
+            if item is self.CLOSE:
+                return
+            job, done, args = item
+            try:
+                result, error = job(*args), None
+            except Exception as exception:
+                result, error = None, exception
+            self.results.put((done, result, error))
+            if self.wake is not None:
+                self.wake()
+
+    def drain(self):
+        """Call done(result) for every finished job; returns how many."""
+        drained = 0
+        while True:
+            try:
+                done, result, error = self.results.get_nowait()
+            except queue.Empty:
+                return drained
+            self.pending -= 1
+            drained += 1
+            if error is not None:
+                raise error
+            done(result)
+
+    def close(self):
+        """Finish the jobs already submitted and stop the thread."""
+        self.jobs.put(self.CLOSE)
+        self.thread.join()
+        self.drain()
+
+
+class LatencyTracker:
+    """Click-to-feedback and click-to-result times, in ms."""
+
+    def __init__(self, history=LATENCY_HISTORY):
+        self.feedback = deque(maxlen=history)
+        self.result = deque(maxlen=history)
+        # Click times whose feedback or result is ready to be presented
+        self.feedback_ready = []
+        self.result_ready = []
+
+    def shown(self, clicked_at):
+        """The click's feedback is drawn from the next frame on."""
+        self.feedback_ready.append(clicked_at)
+
+    def done(self, clicked_at):
+        """The click's result is drawn from the next frame on."""
+        self.result_ready.append(clicked_at)
+
+    def presented(self):
+        """A frame was pushed to the display; time what it showed."""
+        if not (self.feedback_ready or self.result_ready):
+            return
+        now = time.perf_counter()
+        for ready, samples in ((self.feedback_ready, self.feedback),
+                               (self.result_ready, self.result)):
+            samples.extend((now - clicked_at) * 1e3 for clicked_at in ready)
+            ready.clear()
@@ -0,0 +1,269 @@
+"""
+In-game frame profiler.
+
+Measures FPS, frame-time percentiles, time spent in named sections of a
+frame and per-frame counters (text renders, transformed surfaces), and
+summarises them for the overlay or as a JSON dump.
+
+Sections and counters are hooks on existing attributes: enabling the
+profiler swaps each hooked attribute for a timing or counting wrapper and
+disabling puts the original back. A disabled profiler therefore adds
+nothing to the hooked code; the main loop only checks `enabled` once per
+frame.
+
+    profiler = FrameProfiler()
+    profiler.time_section(game, "draw_hexagon", "hexagon")
+    profiler.count_calls(pygame.transform, "flip", "surfaces")
+    profiler.watch("text renders", lambda: cache.renders)
+    profiler.track("click>result", latency_samples_ms)
+    profiler.startup["first_frame_ms"] = 180.0
+"""
+import json
+import time
+from collections import deque
+
+# Frames kept for percentiles and averages
+HISTORY = 300
+
+# Overlay text is recomputed at most this often
+SUMMARY_EVERY_S = 0.5
+
+# Per-frame counters shown on each overlay line
+COUNTERS_PER_LINE = 2
+
+
+class Hook:
+    __slots__ = ("owner", "attribute", "wrap", "original", "own")
+
+    def __init__(self, owner, attribute, wrap):
+        self.owner = owner
+        self.attribute = attribute
+        self.wrap = wrap
+        self.original = None
+        # Whether owner defines the attribute itself, rather than getting
+        # it from its class (bound methods)
+        self.own = False
+
+    def install(self):
+        self.own = self.attribute in getattr(self.owner, "__dict__", {})
+        self.original = getattr(self.owner, self.attribute)
+        setattr(self.owner, self.attribute, self.wrap(self.original))
+
+    def uninstall(self):
+        if self.own:
+            setattr(self.owner, self.attribute, self.original)
+        else:
+            delattr(self.owner, self.attribute)
+        self.original = None
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(int(len(ordered) * p / 100), len(ordered) - 1)]
+
+
+class FrameProfiler:
+
+    def __init__(self, history=HISTORY):
+        self.enabled = False
+        self.history = history
+        self.hooks = []
+        self.watchers = []  # [counter, getter, last value]
+        # name -> deque of ms samples filled by someone else, e.g. latencies
+        self.tracked = {}
+        # Set once by the game at startup, e.g. time to the first frame
+        self.startup = {}
+        # Per-frame history of each section (ms) and counter
+        self.sections = {}
+        self.counters = {}
+        # Totals for the frame in progress; updated in place by the hooks
+        self.section_time = {}
+        self.counts = {}
+        self.reset()
+
+    def reset(self):
+        self.frame_started = None
+        self.frame_starts = deque(maxlen=self.history)
+        self.frame_ms = deque(maxlen=self.history)
+        for name in self.sections:
+            self.sections[name] = deque(maxlen=self.history)
+            self.section_time[name] = 0.0
+        for name in self.counters:
+            self.counters[name] = deque(maxlen=self.history)
+            self.counts[name] = 0
+        self.summary_at = 0.0
+        self.summary_cache = None
+        # Where the last dump went, shown on the overlay
+        self.dumped_to = None
+
+    # --- Hooks ---
+
+    def add_section(self, name):
+        if name not in self.sections:
+            self.sections[name] = deque(maxlen=self.history)
+            self.section_time[name] = 0.0
+
+    def add_counter(self, name):
+        if name not in self.counters:
+            self.counters[name] = deque(maxlen=self.history)
+            self.counts[name] = 0
+
+    def add_hook(self, hook):
+        self.hooks.append(hook)
+        if self.enabled:
+            hook.install()
+
+    def time_section(self, owner, attribute, name=None):
+        """Time every call of owner.attribute as section name."""
+        name = name or attribute
+        self.add_section(name)
+        section_time = self.section_time
+
+        def wrap(original):
+            def timed(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return original(*args, **kwargs)
+                finally:
+                    section_time[name] += time.perf_counter() - started
+            return timed
+
+        self.add_hook(Hook(owner, attribute, wrap))
+
+    def count_calls(self, owner, attribute, counter):
+        """
+        Count calls of the function owner.attribute in counter. Classes are
+        refused: swapping one for a counting subclass would change the type
+        every other user of owner.attribute sees.
+        """
+        if isinstance(getattr(owner, attribute), type):
+            raise TypeError(f"{attribute} is a class; count calls of the "
+                            "functions that create its instances instead")
+        self.add_counter(counter)
+        counts = self.counts
+
+        def wrap(original):
+            def counted(*args, **kwargs):
+                counts[counter] += 1
+                return original(*args, **kwargs)
+            return counted
+
+        self.add_hook(Hook(owner, attribute, wrap))
+
+    def watch(self, counter, getter):
+        """Add the per-frame increase of a running total getter() to counter."""
+        self.add_counter(counter)
+        self.watchers.append([counter, getter, getter()])
+
+    def track(self, name, samples):
+        """Report percentiles of samples, a collection the caller fills."""
+        self.tracked[name] = samples
+
+    # --- Switching ---
+
+    def enable(self):
+        if not self.enabled:
+            self.reset()
+            for watcher in self.watchers:
+                watcher[2] = watcher[1]()
+            for hook in self.hooks:
+                hook.install()
+            self.enabled = True
+
+    def disable(self):
+        if self.enabled:
+            for hook in reversed(self.hooks):
+                hook.uninstall()
+            self.enabled = False
+
+    def toggle(self):
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
+
+    # --- Frames ---
+
+    def begin_frame(self):
+        self.frame_started = time.perf_counter()
+        self.frame_starts.append(self.frame_started)
+
+    def end_frame(self):
+        if self.frame_started is None:
+            return
+        self.frame_ms.append((time.perf_counter() - self.frame_started) * 1e3)
+        self.frame_started = None
+        for name, spent in self.section_time.items():
+            self.sections[name].append(spent * 1e3)
+            self.section_time[name] = 0.0
+        for watcher in self.watchers:
+            total = watcher[1]()
+            self.counts[watcher[0]] += total - watcher[2]
+            watcher[2] = total
+        for name, count in self.counts.items():
+            self.counters[name].append(count)
+            self.counts[name] = 0
+
+    # --- Reporting ---
+
+    def fps(self):
+        starts = self.frame_starts
+        if len(starts) < 2 or starts[-1] == starts[0]:
+            return 0.0
+        return (len(starts) - 1) / (starts[-1] - starts[0])
+
+    def summary(self):
+        """Metrics over the recent frames as a plain dict."""
+        frames = list(self.frame_ms)
+        return {
+            "frames": len(frames),
+            "fps": self.fps(),
+            "frame_ms": {f"p{p}": percentile(frames, p) for p in (50, 95, 99)},
+            "frame_ms_max": max(frames, default=0.0),
+            "section_ms": {name: sum(times) / len(times) if times else 0.0
+                           for name, times in self.sections.items()},
+            "per_frame": {name: sum(counts) / len(counts) if counts else 0.0
+                          for name, counts in self.counters.items()},
+            "tracked_ms": {name: {"count": len(samples),
+                                  "p50": percentile(samples, 50),
+                                  "p95": percentile(samples, 95),
+                                  "max": max(samples, default=0.0)}
+                           for name, samples in self.tracked.items()},
+            "startup": dict(self.startup),
+        }
+
+    def overlay_lines(self):
+        """Short text lines for the overlay, refreshed every half second."""
+        now = time.perf_counter()
+        if self.summary_cache is None or now - self.summary_at > \
+                SUMMARY_EVERY_S:
+            summary = self.summary()
+            frame = summary["frame_ms"]
+            lines = [f"FPS {summary['fps']:.1f}  frame p50 {frame['p50']:.2f}"
+                     f" p95 {frame['p95']:.2f} p99 {frame['p99']:.2f} ms"]
+            lines += [f"{name:<10} {ms:.3f} ms"
+                      for name, ms in summary["section_ms"].items()]
+            counters = [f"{name} {count:.2f}/frame"
+                        for name, count in summary["per_frame"].items()]
+            # A few to a line, to fit the window
+            lines += ["  ".join(counters[i:i + COUNTERS_PER_LINE])
+                      for i in range(0, len(counters), COUNTERS_PER_LINE)]
+            lines += [f"{name} p50 {stats['p50']:.1f} p95 {stats['p95']:.1f}"
+                      f" max {stats['max']:.1f} ms"
+                      for name, stats in summary["tracked_ms"].items()]
+            if self.dumped_to:
+                lines.append(f"Profile written to {self.dumped_to}")
+            self.summary_cache = tuple(lines)
+            self.summary_at = now
+        return self.summary_cache
+
+    def dump(self, path):
+        """Write the summary and the raw recent frame times as JSON."""
+        data = self.summary()
+        data["recent_frame_ms"] = list(self.frame_ms)
+        with open(path, "w") as dump_file:
+            json.dump(data, dump_file, indent=2)
+        self.dumped_to = path
+        self.summary_cache = None
@@ -0,0 +1,201 @@
+"""
+Deterministic match recordings and replay.
+
+Every random draw of a match comes from one random.Random seeded at the
+start of the match, so a match is fully described by that seed, its
+format, the computer's strategy and the player's inputs: toss call, toss
+number, bat/bowl choice and each number pressed. Balls also keep the
+computer's number, because the adaptive opponent's picks depend on
+everything it learned before the match. HandCricketGame records those as
+a Recording and appends each finished one to replays.jsonl.
+
+A recording can be replayed three ways:
+
+    replay_match(rec)       engine only, no pygame, microseconds
+    fast_forward(rec)       through HandCricketGame, skipping rendering and
+                            every timed pause
+    play(rec, speed=2.0)    in the game window, paced like the original
+
+    python replay.py replays.jsonl            # verify all, headless
+    python replay.py replays.jsonl --play 0   # watch the first one
+"""
+import json
+import os
+import random
+
+from engine import Format, Match
+
+# Input kinds, in the order a match uses them
+CALL = "call"  # "Odd" or "Even"
+TOSS = "toss"  # toss number 1..6
+CHOOSE = "choose"  # "Bat" or "Bowl"
+BALL = "ball"  # [player, computer] numbers of a delivery
+
+REPLAY_LOG_PATH = "replays.jsonl"
+
+
+class Recording:
+    """Seed, format, timed inputs and final result of one match."""
+
+    def __init__(self, seed, actions=None, result=None, format=None,
+                 strategy=None):
+        self.seed = seed
+        # [wickets, overs] of the match format; None for the standard one
+        self.format = format
+        # strategies.STRATEGIES name of the computer, None for the default
+        self.strategy = strategy
+        # (milliseconds since the match started, kind, value)
+        self.actions = actions if actions is not None else []
+        # (player1 score, player2 score, winner) once the match is over
+        self.result = result
+
+    def add(self, at, kind, value):
+        self.actions.append((at, kind, value))
+
+    def to_json(self):
+        return json.dumps({"seed": self.seed, "format": self.format,
+                           "strategy": self.strategy,
+                           "actions": self.actions, "result": self.result})
+
+    @classmethod
+    def from_json(cls, line):
+        data = json.loads(line)
+        result = data.get("result")
+        return cls(data["seed"], [tuple(a) for a in data["actions"]],
+                   tuple(result) if result else None, data.get("format"),
+                   data.get("strategy"))
+
+    def match_format(self):
+        return Format(*self.format) if self.format else Format()
+
+    def chooser(self):
+        """Match chooser of the recorded strategy, or None for the default."""
+        if self.strategy is None:
+            return None
+        from strategies import STRATEGIES, MatchPlayer
+
+        return MatchPlayer(STRATEGIES[self.strategy]).choose
+
+
+def append_recording(path, recording):
+    with open(path, "a") as replay_file:
+        replay_file.write(recording.to_json() + "\n")
+
+
+def load_recordings(path):
+    with open(path) as replay_file:
+        return [Recording.from_json(line) for line in replay_file
+                if line.strip()]
+
+
+def match_result(match):
+    return (match.player1_score, match.player2_score, match.winner)
+
+
+def replay_match(recording):
+    """Re-run a recording on the bare engine and return the Match."""
+    match = Match(random.Random(recording.seed),
+                  format=recording.match_format(),
+                  chooser=recording.chooser())
+    steps = {CALL: match.call_toss, TOSS: match.play_toss,
+             CHOOSE: match.choose}
+    for _, kind, value in recording.actions:
+        if kind == BALL:
+            match.deliver(*value)
+        else:
+            steps[kind](value)
+    return match
+
+
+def headless_game():
+    """A HandCricketGame on the dummy video driver that writes no files."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    from main import HandCricketGame
+
+    return HandCricketGame(log_path=None, replay_path=None,
+                           opponent_path=None, stats_path=None)
+
+
+def fast_forward(recording, game=None):
+    """
+    Re-run a recording through HandCricketGame as fast as possible.
+
+    Timed pauses are flushed instead of waited for and nothing is drawn.
+    Returns the game, whose match holds the replayed result.
+    """
+    game = game or headless_game()
+    game.match.format = recording.match_format()
+    # Balls carry both numbers, but the computer's bat/bowl call is remade
+    game.match.chooser = recording.chooser()
+    game.restart_game(seed=recording.seed)
+    for _, kind, value in recording.actions:
+        game.scheduler.flush()
+        game.apply_action(kind, value)
+    game.scheduler.flush()
+    return game
+
+
+def play(recording, speed=1.0):
+    """Replay a recording in the game window at its recorded pace."""
+    from main import HandCricketGame, run
+
+    game = HandCricketGame(log_path=None, replay_path=None,
+                           opponent_path=None, stats_path=None,
+                           format=recording.match_format(),
+                           strategy=recording.strategy)
+    game.restart_game(seed=recording.seed)
+    actions = iter(recording.actions)
+    started = game.scheduler.now
+
+    def next_action():
+        action = next(actions, None)
+        if action:
+            delay = max(started + action[0] - game.scheduler.now, 0)
+            game.scheduler.after(delay, apply_action, action)
+
+    def apply_action(action):
+        if game.scheduler.waiting:
+            # A pause is still running; try again next frame
+            game.scheduler.after(1, apply_action, action)
+            return
+        game.apply_action(action[1], action[2])
+        next_action()
+
+    next_action()
+    run(game, speed)
+
+
+def main():
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Replay recorded matches.")
+    parser.add_argument("path", nargs="?", default=REPLAY_LOG_PATH)
+    parser.add_argument("--play", type=int, metavar="INDEX",
+                        help="watch one recording in the game window")
+    parser.add_argument("--speed", type=float, default=1.0)
+    args = parser.parse_args()
+
+    recordings = load_recordings(args.path)
+    if args.play is not None:
+        play(recordings[args.play], args.speed)
+        return
+
+    started = time.perf_counter()
+    game = headless_game()
+    mismatches = 0
+    for i, recording in enumerate(recordings):
+        engine_result = match_result(replay_match(recording))
+        game_result = match_result(fast_forward(recording, game).match)
+        if recording.result and not (
+                engine_result == game_result == recording.result):
+            mismatches += 1
+            print(f"Recording {i}: recorded {recording.result}, "
+                  f"engine {engine_result}, game {game_result}")
+    elapsed = time.perf_counter() - started
+    print(f"Replayed {len(recordings)} recordings in {elapsed:.3f}s, "
+          f"{mismatches} mismatches")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Frame-clock driven timers and tweens.
+
+The game loop advances the scheduler by each frame's elapsed milliseconds,
+so timed state changes and animations run while the loop keeps polling
+input and rendering. Nothing here sleeps or needs pygame.
+"""
+import heapq
+import itertools
+
+
+class Timer:
+    """A callback queued to run at a given scheduler time."""
+
+    __slots__ = ("due", "callback", "args", "blocking", "cancelled")
+
+    def __init__(self, due, callback, args, blocking=True):
+        self.due = due
+        self.callback = callback
+        self.args = args
+        # Whether input waits for it; see Scheduler.waiting
+        self.blocking = blocking
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class Tween:
+    """Calls update(t) every frame with t going from 0 to 1 over duration."""
+
+    __slots__ = ("start", "duration", "update", "done", "cancelled")
+
+    def __init__(self, start, duration, update, done):
+        self.start = start
+        self.duration = duration
+        self.update = update
+        self.done = done
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class Scheduler:
+
+    def __init__(self):
+        self.now = 0
+        self.timers = []
+        self.tweens = []
+        self.order = itertools.count()
+
+    @property
+    def busy(self):
+        """True while any timer or tween is still pending."""
+        return bool(self.timers or self.tweens)
+
+    @property
+    def waiting(self):
+        """True while a blocking timed callback has yet to run."""
+        return any(timer.blocking and not timer.cancelled
+                   for _, _, timer in self.timers)
+
+    def after(self, delay_ms, callback, *args, blocking=True):
+        """
+        Run callback(*args) once delay_ms have passed. Pass blocking=False
+        for a cosmetic callback that input need not wait for.
+        """
+        timer = Timer(self.now + delay_ms, callback, args, blocking)
+        heapq.heappush(self.timers, (timer.due, next(self.order), timer))
+        return timer
+
+    def tween(self, duration_ms, update, done=None):
+        """Animate over duration_ms; update(0) is called straight away."""
+        tween = Tween(self.now, duration_ms, update, done)
+        self.tweens.append(tween)
+        update(0.0)
+        return tween
+
+    def update(self, dt_ms):
+        """Advance the clock by dt_ms, stepping tweens and firing due timers."""
+        self.now += dt_ms
+        self.step_tweens()
+        # Timers fire in due order; a callback may queue more timers
+        while self.timers and self.timers[0][0] <= self.now:
+            _, _, timer = heapq.heappop(self.timers)
+            if not timer.cancelled:
+                timer.callback(*timer.args)
+
+    def step_tweens(self):
+        running = []
+        for tween in self.tweens:
+            if tween.cancelled:
+                continue
+            t = min((self.now - tween.start) / tween.duration, 1.0) \
+                if tween.duration > 0 else 1.0
+            tween.update(t)
+            if t < 1.0:
+                running.append(tween)
+            elif tween.done:
+                tween.done()
+        self.tweens = running
+
+    def flush(self):
+        """Fast-forward until nothing is pending."""
+        while self.busy:
+            due = [self.timers[0][0]] if self.timers else []
+            due += [tween.start + tween.duration for tween in self.tweens]
+            self.update(max(min(due) - self.now, 0))
+
+    def cancel_all(self):
+        self.timers = []
+        self.tweens = []
@@ -0,0 +1,203 @@
+"""
+Asyncio server for human vs human hand cricket.
+
+Clients connect, send JOIN and are paired in arrival order. Each pair plays
+one engine.Match with human_opponent set, so the toss, innings and result
+rules are exactly those of the single-player game. A room is a handful of
+slots and every step is a few dict lookups, so one process holds thousands
+of concurrent matches. See netproto.py for the wire format.
+
+    python server.py --port 5555
+"""
+import asyncio
+
+from engine import (TOSS_STATE, TOSS_PLAY_STATE, CHOOSE_STATE, PLAYING_STATE,
+                    RESULT_STATE, Match)
+from netproto import (JOIN, CALL, CHOOSE, COMMIT, REVEAL, START, REVEAL_NOW,
+                      ERROR, OPPONENT_LEFT, BAD_MESSAGE, NOT_YOUR_TURN,
+                      BAD_REVEAL, SIDES, TOSS_CALLS, BAT_BOWL, encode,
+                      encode_state, digest, read_message)
+
+DEFAULT_PORT = 5555
+
+
+class Connection:
+    __slots__ = ("writer", "room", "side")
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.room = None
+        self.side = None
+
+    def send(self, data):
+        if not self.writer.is_closing():
+            self.writer.write(data)
+
+
+class Room:
+    """One match between two connections; side 0 is the engine's PLAYER."""
+
+    __slots__ = ("match", "players", "commits", "reveals")
+
+    def __init__(self, first, second):
+        self.match = Match(human_opponent=True)
+        self.players = (first, second)
+        self.commits = [None, None]
+        self.reveals = [None, None]
+        for side, player in enumerate(self.players):
+            player.room = self
+            player.side = side
+            player.send(encode(START, side))
+        self.broadcast(encode_state(self.match))
+
+    def broadcast(self, data):
+        for player in self.players:
+            player.send(data)
+
+    def handle(self, side, kind, fields):
+        """Apply one message from side; returns an error code or None."""
+        match = self.match
+        if kind == CALL:
+            if match.state != TOSS_STATE or side != 0:
+                return NOT_YOUR_TURN
+            if fields[0] >= len(TOSS_CALLS):
+                return BAD_MESSAGE
+            match.call_toss(TOSS_CALLS[fields[0]])
+            self.broadcast(encode_state(match))
+        elif kind == CHOOSE:
+            if match.state != CHOOSE_STATE or SIDES[side] != match.toss_winner:
+                return NOT_YOUR_TURN
+            if fields[0] >= len(BAT_BOWL):
+                return BAD_MESSAGE
+            match.choose(BAT_BOWL[fields[0]])
+            self.broadcast(encode_state(match))
+        elif kind == COMMIT:
+            if match.state not in (TOSS_PLAY_STATE, PLAYING_STATE) or \
+                    self.commits[side] is not None:
+                return NOT_YOUR_TURN
+            self.commits[side] = fields[0]
+            if None not in self.commits:
+                self.broadcast(encode(REVEAL_NOW))
+        elif kind == REVEAL:
+            if None in self.commits or self.reveals[side] is not None:
+                return NOT_YOUR_TURN
+            number, nonce = fields
+            if not 1 <= number <= 6 or \
+                    digest(number, nonce) != self.commits[side]:
+                return BAD_REVEAL
+            self.reveals[side] = number
+            if None not in self.reveals:
+                self.resolve()
+        else:
+            return BAD_MESSAGE
+        return None
+
+    def resolve(self):
+        """Play the revealed pair of numbers."""
+        match = self.match
+        first, second = self.reveals
+        self.commits = [None, None]
+        self.reveals = [None, None]
+        outcome = None
+        if match.state == TOSS_PLAY_STATE:
+            match.play_toss(first, second)
+        else:
+            outcome = match.deliver(first, second)
+        self.broadcast(encode_state(match, outcome))
+
+    @property
+    def over(self):
+        return self.match.state == RESULT_STATE
+
+    def close(self):
+        for player in self.players:
+            player.room = None
+
+
+class Server:
+
+    def __init__(self):
+        self.waiting = None
+        self.rooms = 0
+        self.matches_played = 0
+        self.connections = 0
+
+    async def handle_connection(self, reader, writer):
+        connection = Connection(writer)
+        self.connections += 1
+        try:
+            while True:
+                kind, fields = await read_message(reader)
+                self.dispatch(connection, kind, fields)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            self.connections -= 1
+            self.leave(connection)
+            writer.close()
+
+    def dispatch(self, connection, kind, fields):
+        if kind == JOIN:
+            if connection.room is not None:
+                connection.send(encode(ERROR, NOT_YOUR_TURN))
+            elif self.waiting is None or self.waiting is connection:
+                self.waiting = connection
+            else:
+                waiting, self.waiting = self.waiting, None
+                Room(waiting, connection)
+                self.rooms += 1
+            return
+
+        room = connection.room
+        error = room.handle(connection.side, kind, fields) if room \
+            else NOT_YOUR_TURN
+        if error:
+            connection.send(encode(ERROR, error))
+        elif room.over:
+            room.close()
+            self.rooms -= 1
+            self.matches_played += 1
+
+    def leave(self, connection):
+        if self.waiting is connection:
+            self.waiting = None
+        room = connection.room
+        if room is not None:
+            room.close()
+            self.rooms -= 1
+            for player in room.players:
+                if player is not connection:
+                    player.send(encode(OPPONENT_LEFT))
+
+    async def serve(self, host, port, stats_every=0):
+        server = await asyncio.start_server(self.handle_connection, host, port,
+                                            backlog=4096)
+        print(f"Serving on {host}:{port}", flush=True)
+        async with server:
+            if not stats_every:
+                await server.serve_forever()
+            while True:
+                await asyncio.sleep(stats_every)
+                print(f"{self.connections} connections, {self.rooms} "
+                      f"matches running, {self.matches_played} played",
+                      flush=True)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Hand cricket match server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--stats", type=float, default=0,
+                        help="print load every STATS seconds")
+    args = parser.parse_args()
+    try:
+        asyncio.run(Server().serve(args.host, args.port, args.stats))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
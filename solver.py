@@ -0,0 +1,173 @@
+"""
+Exact solver for optimal Hand Cricket play.
+
+Each ball is a simultaneous-move game: the batter shows b, the bowler shows
+w, and the batter is OUT when b == w or scores b otherwise. Every position
+is either a first innings at some score, or a chase that still needs
+target - score runs. The value of a position is the batter's expected
+points (1 for a win, 0.5 for a tie). It depends only on positions with
+more runs, so one backward sweep over the score solves every position
+exactly.
+
+At each position both sides play the minimax mix of numbers. The payoff
+matrix has the constant r[b] off the diagonal of row b and the OUT value d
+on the diagonal, and such a matrix game has a closed-form solution (see
+solve_ball).
+
+The solution lives in one float array, saved as .npy and memory-mapped on
+load, so later processes look up a position in O(1) without re-solving:
+
+    table = PolicyTable.load()
+    table.batting_mix(innings=2, score=10, target=25)
+"""
+import os
+
+import numpy as np
+
+# Positions past this score are treated as already decided
+MAX_SCORE = 600
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            "policy_table.npy")
+
+# Column layout of each table row
+VALUE = 0  # Batter's expected points
+WIN = 1  # Batter's win probability
+TIE = 2  # Tie probability
+BAT = slice(3, 9)  # Batter's mix over 1..6
+BOWL = slice(9, 15)  # Bowler's mix over 1..6
+COLUMNS = 15
+
+NUMBERS = np.arange(1, 7)
+
+
+def solve_ball(runs_value, out_value):
+    """
+    Solve one ball as a zero-sum matrix game.
+
+    runs_value[b - 1] is the batter's value after scoring b, out_value the
+    value after being OUT. Returns (value, batter mix, bowler mix).
+    """
+    r = np.asarray(runs_value, dtype=np.float64)
+    # How much the batter loses when the bowler matches b
+    a = np.maximum(r - out_value, 1e-15)
+    order = np.argsort(-r, kind="stable")
+
+    # Bowler spreads over the best-scoring numbers until the batter is
+    # indifferent between all of them
+    for k in range(1, 7):
+        support = order[:k]
+        weight = 1 / a[support]
+        value = (np.sum(r[support] * weight) - 1) / np.sum(weight)
+        if k == 6 or r[order[k]] <= value:
+            break
+
+    bat = np.zeros(6)
+    bowl = np.zeros(6)
+    bat[support] = weight / np.sum(weight)
+    bowl[support] = (r[support] - value) / a[support]
+    return value, bat, bowl
+
+
+def solve(max_score=MAX_SCORE):
+    """
+    Solve every position and return the table.
+
+    table[0, score] is the first innings at that score and table[1, need]
+    the chase still needing `need` runs (need >= 1).
+    """
+    table = np.zeros((2, max_score + 2, COLUMNS))
+
+    # Chase: scoring the remaining runs wins, OUT one short of them ties
+    chase = table[1]
+    done = np.array([1.0, 1.0, 0.0])  # Target reached: value, win, tie
+    for need in range(1, max_score + 2):
+        after = np.array([done if need - b <= 0 else chase[need - b, :3]
+                          for b in NUMBERS])
+        out = np.array([0.5, 0.0, 1.0]) if need == 1 else np.zeros(3)
+        value, bat, bowl = solve_ball(after[:, VALUE], out[VALUE])
+        chase[need, VALUE] = value
+        chase[need, WIN:TIE + 1] = outcome(bat, bowl, after[:, 1:], out[1:])
+        chase[need, BAT] = bat
+        chase[need, BOWL] = bowl
+
+    # First innings: OUT at score s leaves the opponent chasing s + 1
+    first = table[0]
+    for score in range(max_score, -1, -1):
+        after = np.array([first[min(score + b, max_score), :3]
+                          for b in NUMBERS])
+        if score + 1 >= max_score:
+            after[:] = done
+        chaser = chase[min(score + 1, max_score + 1), :3]
+        out = np.array([1 - chaser[VALUE], 1 - chaser[WIN] - chaser[TIE],
+                        chaser[TIE]])
+        value, bat, bowl = solve_ball(after[:, VALUE], out[VALUE])
+        first[score, VALUE] = value
+        first[score, WIN:TIE + 1] = outcome(bat, bowl, after[:, 1:], out[1:])
+        first[score, BAT] = bat
+        first[score, BOWL] = bowl
+
+    return table
+
+
+def outcome(bat, bowl, after, out):
+    """Win and tie probabilities of one ball when both sides play their mix."""
+    out_chance = np.dot(bat, bowl)
+    scoring = bat * (1 - bowl)
+    return out_chance * out + scoring @ after
+
+
+class PolicyTable:
+    """O(1) lookups into a solved (or memory-mapped) table."""
+
+    def __init__(self, table):
+        self.table = table
+        self.max_score = table.shape[1] - 2
+
+    @classmethod
+    def load(cls, path=DEFAULT_PATH, max_score=MAX_SCORE):
+        """Memory-map the table at path, solving and saving it first if needed."""
+        if not os.path.exists(path):
+            np.save(path, solve(max_score))
+        return cls(np.load(path, mmap_mode="r"))
+
+    def row(self, innings, score, target=0):
+        if innings == 1:
+            return self.table[0, min(score, self.max_score)]
+        need = max(target - score, 1)
+        return self.table[1, min(need, self.max_score + 1)]
+
+    def value(self, innings, score, target=0):
+        """Batter's expected points from this position."""
+        return float(self.row(innings, score, target)[VALUE])
+
+    def win_probability(self, innings, score, target=0):
+        """Batter's win probability from this position."""
+        return float(self.row(innings, score, target)[WIN])
+
+    def batting_mix(self, innings, score, target=0):
+        return self.row(innings, score, target)[BAT]
+
+    def bowling_mix(self, innings, score, target=0):
+        return self.row(innings, score, target)[BOWL]
+
+    def computer_pick(self, match):
+        """
+        Computer's number for the current ball of an engine.Match.
+
+        Can be passed as Match(computer=table.computer_pick) in place of
+        random.randint(1, 6).
+        """
+        row = self.row(match.innings, match.score, match.target)
+        mix = row[BOWL] if match.player_is_batting else row[BAT]
+        return match.rng.choices(range(1, 7), mix)[0]
+
+
+if __name__ == "__main__":
+    table = PolicyTable.load()
+    print(f"Batting first from 0: win {table.win_probability(1, 0):.4f}, "
+          f"tie {table.row(1, 0)[TIE]:.4f}")
+    for need in (1, 2, 6, 12, 24):
+        print(f"Chase needing {need:>2}: "
+              f"value {table.value(2, 0, need):.4f} "
+              f"bat {np.round(table.batting_mix(2, 0, need), 3)}")
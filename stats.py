@@ -0,0 +1,340 @@
+"""
+Persistent match statistics in a local SQLite database.
+
+Every finished match is one row of `matches`. The `standings` table keeps
+running totals per side name (played, wins, best score, current streak...)
+and is updated in the same transaction, so the leaderboard is an indexed
+read rather than an aggregate over every match. Indexes on the pairing and
+on each side's score serve the head-to-head and score distribution
+queries.
+
+StatsStore writes from a background thread: record() only queues the
+result, and the thread commits whatever has queued up in one transaction.
+It also keeps a Summary of one side's statistics, loaded once and then
+updated with each committed match, for the in-game stats screen.
+
+    store = StatsStore("stats.sqlite3", "Player")
+    store.record(MatchResult.from_match(match, ("Player", "Computer")))
+    ...
+    store.close()
+
+    python stats.py stats.sqlite3     # leaderboard and score distribution
+"""
+import queue
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+from engine import PLAYER, COMPUTER
+
+STATS_PATH = "stats.sqlite3"
+
+# Most results committed in one transaction, and how long the writer waits
+# for more once it has one
+BATCH_SIZE = 256
+BATCH_WAIT_S = 0.25
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    id INTEGER PRIMARY KEY,
+    played_at REAL NOT NULL,
+    player TEXT NOT NULL,
+    opponent TEXT NOT NULL,
+    wickets INTEGER NOT NULL,
+    overs INTEGER,
+    toss_winner INTEGER,  -- 0 player, 1 opponent
+    player_batted_first INTEGER NOT NULL,
+    player_score INTEGER NOT NULL,
+    opponent_score INTEGER NOT NULL,
+    winner INTEGER  -- 0 player, 1 opponent, NULL for a tie
+);
+CREATE INDEX IF NOT EXISTS matches_pairing
+    ON matches (player, opponent, winner);
+CREATE INDEX IF NOT EXISTS matches_player_score
+    ON matches (player, player_score);
+CREATE INDEX IF NOT EXISTS matches_opponent_score
+    ON matches (opponent, opponent_score);
+
+CREATE TABLE IF NOT EXISTS standings (
+    name TEXT PRIMARY KEY,
+    played INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    losses INTEGER NOT NULL,
+    ties INTEGER NOT NULL,
+    tosses_won INTEGER NOT NULL,
+    runs INTEGER NOT NULL,
+    best INTEGER NOT NULL,
+    streak INTEGER NOT NULL  -- wins in a row, or -losses in a row
+);
+CREATE INDEX IF NOT EXISTS standings_wins ON standings (wins DESC, played);
+"""
+
+INSERT_MATCH = """
+INSERT INTO matches (played_at, player, opponent, wickets, overs,
+                     toss_winner, player_batted_first, player_score,
+                     opponent_score, winner)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+UPDATE_STANDING = """
+INSERT INTO standings VALUES (:name, 1, :won, :lost, :tied, :toss, :runs,
+                              :runs, :won - :lost)
+ON CONFLICT (name) DO UPDATE SET
+    played = played + 1,
+    wins = wins + :won,
+    losses = losses + :lost,
+    ties = ties + :tied,
+    tosses_won = tosses_won + :toss,
+    runs = runs + :runs,
+    best = max(best, :runs),
+    streak = CASE
+        WHEN :won THEN max(streak, 0) + 1
+        WHEN :lost THEN min(streak, 0) - 1
+        ELSE 0 END
+"""
+
+# Side codes stored for toss winner and winner
+SIDE_CODES = {PLAYER: 0, COMPUTER: 1}
+
+
+class MatchResult:
+    """One finished match as stored in the matches table."""
+
+    __slots__ = ("played_at", "player", "opponent", "wickets", "overs",
+                 "toss_winner", "player_batted_first", "player_score",
+                 "opponent_score", "winner")
+
+    def __init__(self, played_at, player, opponent, wickets, overs,
+                 toss_winner, player_batted_first, player_score,
+                 opponent_score, winner):
+        self.played_at = played_at
+        self.player = player
+        self.opponent = opponent
+        self.wickets = wickets
+        self.overs = overs
+        self.toss_winner = toss_winner
+        self.player_batted_first = player_batted_first
+        self.player_score = player_score
+        self.opponent_score = opponent_score
+        self.winner = winner
+
+    @classmethod
+    def from_match(cls, match, names):
+        """Result of a finished engine.Match; names are the two sides'."""
+        return cls(time.time(), names[0], names[1], match.format.wickets,
+                   match.format.overs, SIDE_CODES.get(match.toss_winner),
+                   int(bool(match.player1_is_batting_first)),
+                   match.player1_score, match.player2_score,
+                   SIDE_CODES.get(match.winner))
+
+    def row(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def sides(self):
+        """(name, won, lost, tied, won toss, runs) for each side."""
+        tied = self.winner is None
+        for side, name, runs in ((0, self.player, self.player_score),
+                                 (1, self.opponent, self.opponent_score)):
+            yield (name, int(self.winner == side),
+                   int(not tied and self.winner != side), int(tied),
+                   int(self.toss_winner == side), runs)
+
+
+def open_db(path):
+    db = sqlite3.connect(path)
+    db.executescript(SCHEMA)
+    return db
+
+
+def write_results(db, results):
+    """Insert results and update the standings in one transaction."""
+    with db:
+        db.executemany(INSERT_MATCH, [result.row() for result in results])
+        db.executemany(UPDATE_STANDING, [
+            {"name": name, "won": won, "lost": lost, "tied": tied,
+             "toss": toss, "runs": runs}
+            for result in results
+            for name, won, lost, tied, toss, runs in result.sides()])
+
+
+def leaderboard(db, limit=10):
+    """(name, played, wins, losses, ties) rows, most wins first."""
+    return db.execute(
+        "SELECT name, played, wins, losses, ties FROM standings "
+        "ORDER BY wins DESC, played LIMIT ?", (limit,)).fetchall()
+
+
+def head_to_head(db, name, other):
+    """(name's wins, other's wins, ties) over every match between them."""
+    wins = [0, 0, 0]
+    for player, opponent, flip in ((name, other, False),
+                                   (other, name, True)):
+        for winner, count in db.execute(
+                "SELECT winner, count(*) FROM matches "
+                "WHERE player = ? AND opponent = ? GROUP BY winner",
+                (player, opponent)):
+            side = 2 if winner is None else winner ^ flip
+            wins[side] += count
+    return tuple(wins)
+
+
+def score_distribution(db, name):
+    """Counter of name's scores, from either side of the pairing."""
+    scores = Counter()
+    for column in ("player", "opponent"):
+        scores.update(dict(db.execute(
+            f"SELECT {column}_score, count(*) FROM matches "
+            f"WHERE {column} = ? GROUP BY {column}_score", (name,))))
+    return scores
+
+
+class Summary:
+    """One side's statistics, kept current one match at a time."""
+
+    def __init__(self, name):
+        self.name = name
+        self.played = self.wins = self.losses = self.ties = 0
+        self.tosses_won = self.runs = self.best = self.streak = 0
+        self.scores = Counter()
+        # opponent -> [wins, losses, ties]
+        self.opponents = {}
+        # Bumped on every change, so a screen can tell when to redraw
+        self.version = 0
+
+    @classmethod
+    def load(cls, db, name):
+        summary = cls(name)
+        row = db.execute(
+            "SELECT played, wins, losses, ties, tosses_won, runs, best, "
+            "streak FROM standings WHERE name = ?", (name,)).fetchone()
+        if row:
+            (summary.played, summary.wins, summary.losses, summary.ties,
+             summary.tosses_won, summary.runs, summary.best,
+             summary.streak) = row
+        summary.scores = score_distribution(db, name)
+        for player, opponent, winner, count in db.execute(
+                "SELECT player, opponent, winner, count(*) FROM matches "
+                "WHERE player = ? OR opponent = ? "
+                "GROUP BY player, opponent, winner", (name, name)):
+            flip = player != name
+            record = summary.opponents.setdefault(
+                opponent if not flip else player, [0, 0, 0])
+            record[2 if winner is None else winner ^ flip] += count
+        return summary
+
+    def add(self, result):
+        for side, (name, won, lost, tied, toss, runs) in enumerate(
+                result.sides()):
+            if name != self.name:
+                continue
+            self.played += 1
+            self.wins += won
+            self.losses += lost
+            self.ties += tied
+            self.tosses_won += toss
+            self.runs += runs
+            self.best = max(self.best, runs)
+            if won:
+                self.streak = max(self.streak, 0) + 1
+            elif lost:
+                self.streak = min(self.streak, 0) - 1
+            else:
+                self.streak = 0
+            self.scores[runs] += 1
+            opponent = result.opponent if side == 0 else result.player
+            record = self.opponents.setdefault(opponent, [0, 0, 0])
+            record[0 if won else 1 if lost else 2] += 1
+            self.version += 1
+
+    @property
+    def average(self):
+        return self.runs / self.played if self.played else 0.0
+
+
+class StatsStore:
+    """Background writer for one database, with a Summary of one side."""
+
+    # Queued to stop the writer thread
+    CLOSE = object()
+
+    def __init__(self, path, name, batch_size=BATCH_SIZE,
+                 batch_wait=BATCH_WAIT_S):
+        self.path = path
+        self.name = name
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.queue = queue.Queue()
+        # None until the writer thread has read it from the database
+        self.summary = None
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self.run, name="stats-writer",
+                                       daemon=True)
+        self.thread.start()
+
+    def record(self, result):
+        """Queue a MatchResult; never touches the disk on this thread."""
+        self.queue.put(result)
+
+    def run(self):
+        db = open_db(self.path)
+        summary = Summary.load(db, self.name)
+        with self.lock:
+            self.summary = summary
+        try:
+            closing = False
+            while not closing:
+                batch = [self.queue.get()]
+                deadline = time.monotonic() + self.batch_wait
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self.queue.get(
+                            timeout=max(deadline - time.monotonic(), 0)))
+                    except queue.Empty:
+                        break
+                if self.CLOSE in batch:
+                    closing = True
+                    batch = [result for result in batch
+                             if result is not self.CLOSE]
+                if batch:
+                    write_results(db, batch)
+                    with self.lock:
+                        for result in batch:
+                            summary.add(result)
+        finally:
+            db.close()
+
+    def read(self, read):
+        """Call read(summary) under the writer's lock; None while loading."""
+        with self.lock:
+            return None if self.summary is None else read(self.summary)
+
+    def close(self):
+        """Write everything queued and stop the writer."""
+        self.queue.put(self.CLOSE)
+        self.thread.join()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Show match statistics.")
+    parser.add_argument("path", nargs="?", default=STATS_PATH)
+    parser.add_argument("--name", default=PLAYER,
+                        help="side for the score distribution")
+    args = parser.parse_args()
+
+    db = open_db(args.path)
+    print(f"{'Name':<12} {'Played':>6} {'Won':>5} {'Lost':>5} {'Tied':>5}")
+    for name, played, wins, losses, ties in leaderboard(db):
+        print(f"{name:<12} {played:>6} {wins:>5} {losses:>5} {ties:>5}")
+    wins, losses, ties = head_to_head(db, PLAYER, COMPUTER)
+    print(f"\n{PLAYER} v {COMPUTER}: {wins}-{losses}-{ties}")
+    print(f"\nScores of {args.name}:")
+    for score, count in sorted(score_distribution(db, args.name).items()):
+        print(f"{score:>4} {count}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
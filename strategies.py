@@ -0,0 +1,190 @@
+"""
+Batched computer strategies: an array of positions in, an array of
+numbers out.
+
+A position is one row of a POSITION array: the innings (0 for the toss),
+whether the deciding side is batting, and the score, target, wickets and
+balls of the innings in play. A Strategy decides every row in one call:
+
+    numbers = strategy.pick(positions, rng)    # int8 numbers 1..6
+    bats = strategy.choose(positions, rng)     # True to bat first
+
+rng is a numpy Generator. Because every decision goes through the batch
+call, one strategy implementation serves both a live match (through a
+MatchPlayer, one row at a time) and a bulk evaluation of millions of
+positions (montecarlo.simulate_strategies, tournament.py,
+benchmarks.decisions).
+
+    player = MatchPlayer(STRATEGIES["policy"])
+    match = Match(computer=player.pick, chooser=player.choose)
+"""
+import numpy as np
+
+from engine import PLAYER, COMPUTER, PLAYING_STATE
+from montecarlo import normalize
+
+POSITION = np.dtype([
+    ("innings", np.int8),  # 0 toss, 1 first innings, 2 chase
+    ("batting", np.bool_),  # the deciding side is batting
+    ("score", np.int32),
+    ("target", np.int32),  # 0 in the first innings
+    ("wickets", np.int16),
+    ("balls", np.int32),
+])
+
+
+def positions(n):
+    """n zeroed positions: toss positions until filled in."""
+    return np.zeros(n, dtype=POSITION)
+
+
+def match_position(match, side=COMPUTER):
+    """One-row POSITION array for side's next decision in an engine.Match."""
+    position = positions(1)
+    if match.state == PLAYING_STATE:
+        position[0] = (match.innings,
+                       match.player_is_batting == (side == PLAYER),
+                       match.score, match.target, match.wickets, match.balls)
+    return position
+
+
+def draw(cdf, rng):
+    """One number 1..6 per row of cdf, a (n, 6) array of cumulative mixes."""
+    u = rng.random(len(cdf)) * cdf[:, -1]
+    return ((cdf <= u[:, None]).sum(axis=1) + 1).astype(np.int8)
+
+
+class Strategy:
+    """Decides numbers, and bat or bowl, for a batch of positions."""
+
+    name = "Strategy"
+
+    def pick(self, positions, rng):
+        """Number 1..6 for each position, as an int8 array."""
+        raise NotImplementedError
+
+    def choose(self, positions, rng):
+        """True for each toss-winning position that bats first."""
+        # Same even chance as the engine's own computer
+        return rng.integers(0, 2, size=len(positions)) == 1
+
+    def __repr__(self):
+        return self.name
+
+
+class UniformStrategy(Strategy):
+    """Same as the built-in computer: every number equally likely."""
+
+    name = "Uniform"
+
+    def pick(self, positions, rng):
+        return rng.integers(1, 7, size=len(positions), dtype=np.int8)
+
+
+class FixedStrategy(Strategy):
+    """Always shows the same number."""
+
+    def __init__(self, number):
+        self.number = number
+        self.name = f"Fixed{number}"
+
+    def pick(self, positions, rng):
+        return np.full(len(positions), self.number, dtype=np.int8)
+
+
+class WeightedStrategy(Strategy):
+    """Separate number weights for batting and bowling (and the toss)."""
+
+    def __init__(self, name, bat_weights, bowl_weights=None):
+        self.name = name
+        bowl_weights = bat_weights if bowl_weights is None else bowl_weights
+        # Row 0 bowling, row 1 batting; toss picks use the batting weights
+        self.cdfs = np.cumsum([normalize(bowl_weights),
+                               normalize(bat_weights)], axis=1)
+
+    def pick(self, positions, rng):
+        batting = positions["batting"] | (positions["innings"] == 0)
+        return draw(self.cdfs[batting.view(np.int8)], rng)
+
+
+class PolicyStrategy(Strategy):
+    """
+    The solver's minimax mix for each position (see solver.py).
+
+    The table assumes one wicket and no over limit, so in other formats it
+    plays as if the innings in play were the last wicket. Toss picks are
+    uniform; the toss winner bats first when that is worth more.
+    """
+
+    name = "Policy"
+
+    def __init__(self, table=None):
+        self.policy = table
+
+    @property
+    def table(self):
+        # Loaded (or solved, the first time) on first use
+        if self.policy is None:
+            from solver import PolicyTable
+
+            self.policy = PolicyTable.load()
+        return self.policy
+
+    def pick(self, positions, rng):
+        from solver import BAT, BOWL
+
+        policy = self.table
+        innings = positions["innings"]
+        score = positions["score"]
+        chase = innings == 2
+        # Same rows as PolicyTable.row, for every position at once
+        index = np.where(chase,
+                         np.clip(positions["target"] - score, 1,
+                                 policy.max_score + 1),
+                         np.minimum(score, policy.max_score))
+        rows = policy.table[chase.view(np.int8), index]
+        mix = np.where(positions["batting"][:, None], rows[:, BAT],
+                       rows[:, BOWL])
+        mix[innings == 0] = 1
+        return draw(np.cumsum(mix, axis=1), rng)
+
+    def choose(self, positions, rng):
+        return np.full(len(positions), self.table.value(1, 0) >= 0.5)
+
+
+# Strategies by command-line name
+STRATEGIES = {
+    "uniform": UniformStrategy(),
+    "highbat": WeightedStrategy("HighBat", (1, 1, 1, 2, 3, 4),
+                                (1, 1, 1, 1, 1, 1)),
+    "lowrisk": WeightedStrategy("LowRisk", (1, 2, 3, 3, 2, 1)),
+    "fixed6": FixedStrategy(6),
+    "policy": PolicyStrategy(),
+}
+
+
+class MatchPlayer:
+    """
+    One side of an engine.Match played by a Strategy, a position at a time.
+
+    The Generator for each decision is seeded from the match's own RNG, so
+    a seeded match (or a replay) makes the same decisions again.
+    """
+
+    def __init__(self, strategy, side=COMPUTER):
+        self.strategy = strategy
+        self.side = side
+
+    def rng(self, match):
+        return np.random.default_rng(match.rng.getrandbits(64))
+
+    def pick(self, match):
+        """Match(computer=...) hook, also usable as a player_pick."""
+        return int(self.strategy.pick(match_position(match, self.side),
+                                      self.rng(match))[0])
+
+    def choose(self, match):
+        """Match(chooser=...) hook: "Bat" or "Bowl" after winning the toss."""
+        bats = self.strategy.choose(match_position(match, self.side),
+                                    self.rng(match))[0]
+        return "Bat" if bats else "Bowl"
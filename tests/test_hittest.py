@@ -0,0 +1,34 @@
+"""The hit index agrees with the exact point-in-triangle test."""
+import random
+
+from hittest import NO_WIDGET, HitIndex, inside_triangle
+
+WIDTH, HEIGHT = 120, 100
+
+
+def random_triangle(rng):
+    return [(rng.uniform(-10, WIDTH + 10), rng.uniform(-10, HEIGHT + 10))
+            for _ in range(3)]
+
+
+def test_triangles_match_inside_triangle():
+    rng = random.Random(0)
+    for _ in range(40):
+        triangle = random_triangle(rng)
+        index = HitIndex(WIDTH, HEIGHT)
+        index.add_triangle([0], 1, triangle)
+        for y in range(HEIGHT):
+            for x in range(WIDTH):
+                expected = 1 if inside_triangle(x, y, triangle) else NO_WIDGET
+                assert index.lookup(0, (x, y)) == expected, (triangle, x, y)
+
+
+def test_later_widgets_win_and_states_are_separate():
+    index = HitIndex(WIDTH, HEIGHT)
+    index.add_rect([0, 1], 1, (10, 10, 20, 20))
+    index.add_rect([1], 2, (20, 20, 20, 20))
+    assert index.lookup(0, (25, 25)) == 1
+    assert index.lookup(1, (25, 25)) == 2
+    assert index.lookup(1, (29.9, 9.5)) == NO_WIDGET
+    assert index.lookup(2, (15, 15)) == NO_WIDGET
+    assert index.lookup(0, (-1, 15)) == NO_WIDGET
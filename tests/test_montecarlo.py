@@ -0,0 +1,49 @@
+"""The vectorized simulator plays the same game as engine.Match."""
+import random
+
+import numpy as np
+import pytest
+
+import montecarlo
+from engine import COMPUTER, PLAYER, simulate_match
+from strategies import STRATEGIES
+
+MATCHES = 20_000
+
+
+def engine_win_rates(seed):
+    rng = random.Random(seed)
+    winners = [simulate_match(rng).winner for _ in range(MATCHES)]
+    return {"Player": winners.count(PLAYER) / MATCHES,
+            "Computer": winners.count(COMPUTER) / MATCHES,
+            "Tie": winners.count(None) / MATCHES}
+
+
+def test_win_rates_agree_with_engine():
+    expected = engine_win_rates(1)
+    result = montecarlo.simulate(10 * MATCHES, seed=1)
+    for side, rate in result.win_rates().items():
+        # Several standard errors of the engine's estimate
+        assert rate == pytest.approx(expected[side], abs=0.015)
+
+
+def test_uniform_strategy_agrees_with_weights():
+    uniform = STRATEGIES["uniform"]
+    weights = montecarlo.simulate(MATCHES, seed=2)
+    batched = montecarlo.simulate_strategies(MATCHES, uniform, uniform,
+                                             seed=2)
+    assert np.mean(batched.first_score) == pytest.approx(
+        np.mean(weights.first_score), rel=0.05)
+
+
+def test_seeded_runs_repeat():
+    first = montecarlo.simulate(1000, seed=3)
+    second = montecarlo.simulate(1000, seed=3)
+    assert np.array_equal(first.winner, second.winner)
+
+
+def test_bad_input_is_rejected():
+    with pytest.raises(ValueError):
+        montecarlo.simulate(0)
+    with pytest.raises(ValueError):
+        montecarlo.simulate(10, (1, 0, 0, 0, 0, 0), (0, 1, 1, 1, 1, 1))
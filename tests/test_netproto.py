@@ -0,0 +1,47 @@
+"""Messages and commit-reveal numbers survive the wire."""
+import random
+import socket
+
+from engine import Match, simulate_match
+from netproto import (COMMIT, REVEAL, STATE, apply_state, commit, digest,
+                      encode, encode_state, recv_message)
+
+
+def send_and_receive(message):
+    a, b = socket.socketpair()
+    with a, b:
+        a.sendall(message)
+        return recv_message(b)
+
+
+def test_commit_reveal_round_trip():
+    for number in range(1, 7):
+        committed, nonce = commit(number)
+        kind, (received,) = send_and_receive(encode(COMMIT, committed))
+        assert (kind, received) == (COMMIT, committed)
+        kind, (revealed, revealed_nonce) = send_and_receive(
+            encode(REVEAL, number, nonce))
+        assert kind == REVEAL
+        assert digest(revealed, revealed_nonce) == received
+        # Any other number behind the commit is caught
+        for other in range(1, 7):
+            if other != number:
+                assert digest(other, revealed_nonce) != received
+
+
+def test_commits_hide_the_number():
+    first, _ = commit(3)
+    second, _ = commit(3)
+    assert first != second
+
+
+def test_state_round_trip():
+    match = simulate_match(random.Random(0))
+    kind, fields = send_and_receive(encode_state(match, 2))
+    assert kind == STATE
+    mirror = Match()
+    assert apply_state(mirror, fields) == 2
+    for name in ("state", "innings", "score", "player1_score",
+                 "player2_score", "target", "toss_winner",
+                 "player1_is_batting_first", "winner"):
+        assert getattr(mirror, name) == getattr(match, name), name
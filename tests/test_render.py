@@ -0,0 +1,42 @@
+"""
+Dirty-rect rendering must leave the screen as a full redraw would.
+
+    python -m pytest tests
+"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+import pytest
+
+import main
+from benchmarks.game import new_game, prepare
+from engine import PLAYING_STATE
+
+
+@pytest.fixture
+def game():
+    game = new_game()
+    prepare(game, PLAYING_STATE)
+    game.draw()
+    yield game
+    game.close()
+
+
+def matches_full_draw(game):
+    rendered = pygame.image.tobytes(main.screen, "RGB")
+    game.draw()
+    return rendered == pygame.image.tobytes(main.screen, "RGB")
+
+
+@pytest.mark.parametrize("overlay", ["stats", "profiler"])
+def test_overlay_toggled_off(game, overlay):
+    toggle = {"stats": game.toggle_stats,
+              "profiler": game.profiler.toggle}[overlay]
+    toggle()
+    game.render()
+    toggle()
+    game.render()
+    assert matches_full_draw(game)
@@ -0,0 +1,56 @@
+"""Recordings replay to the same match, on the engine and in the game."""
+import os
+import random
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pytest
+
+from engine import CHOOSE_STATE, PLAYING_STATE, Format, Match
+from replay import (BALL, CALL, CHOOSE, TOSS, Recording, fast_forward,
+                    match_result, replay_match)
+
+
+def record(seed, format=None):
+    """Play a match with random inputs, recording them as a live game does."""
+    inputs = random.Random(seed + 1000)
+    match = Match(random.Random(seed), format=format)
+    recording = Recording(seed, format=format and [format.wickets,
+                                                   format.overs])
+    call = inputs.choice(["Odd", "Even"])
+    match.call_toss(call)
+    recording.add(0, CALL, call)
+    number = inputs.randint(1, 6)
+    match.play_toss(number)
+    recording.add(0, TOSS, number)
+    if match.state == CHOOSE_STATE:
+        choice = inputs.choice(["Bat", "Bowl"])
+        match.choose(choice)
+        recording.add(0, CHOOSE, choice)
+    while match.state == PLAYING_STATE:
+        number = inputs.randint(1, 6)
+        match.deliver(number)
+        recording.add(0, BALL, [number, match.computer_number])
+    recording.result = match_result(match)
+    return recording
+
+
+@pytest.mark.parametrize("format", [None, Format(wickets=3, overs=2)])
+def test_replay_match_is_deterministic(format):
+    for seed in range(50):
+        recording = record(seed, format)
+        again = Recording.from_json(recording.to_json())
+        assert match_result(replay_match(recording)) == recording.result
+        assert match_result(replay_match(again)) == recording.result
+
+
+def test_fast_forward_matches_engine():
+    from replay import headless_game
+
+    game = headless_game()
+    for seed in range(10):
+        recording = record(seed)
+        game = fast_forward(recording, game)
+        assert match_result(game.match) == recording.result
+    game.close()
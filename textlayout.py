@@ -0,0 +1,59 @@
+"""
+Wrapped, pre-rendered text for multi-line messages.
+
+Text is broken into lines at explicit newlines and then at spaces, so that
+every line fits a width in pixels as measured with the font itself. The
+rendered lines are cached by text, font, colour and width, so showing the
+same message again costs one dictionary lookup.
+
+    text = TextLayout()
+    for i, line in enumerate(text.lines(message, font, WHITE, 380)):
+        surface.blit(line, (x, y + i * 20))
+"""
+from collections import OrderedDict
+
+TEXT_LAYOUT_CACHE_SIZE = 32
+
+
+def wrap(text, font, width):
+    """Split text into lines no wider than width pixels where possible."""
+    lines = []
+    for paragraph in text.split("\n"):
+        line = ""
+        for word in paragraph.split(" "):
+            candidate = f"{line} {word}" if line else word
+            if not line or font.size(candidate)[0] <= width:
+                line = candidate
+            else:
+                # A word wider than width gets a line of its own
+                lines.append(line)
+                line = word
+        lines.append(line)
+    return lines
+
+
+class TextLayout:
+    """LRU cache of wrapped text rendered as one surface per line."""
+
+    def __init__(self, size=TEXT_LAYOUT_CACHE_SIZE):
+        self.size = size
+        self.layouts = OrderedDict()
+        self.renders = 0
+
+    def lines(self, text, font, color, width):
+        key = (text, font, color, width)
+        lines = self.layouts.get(key)
+        if lines is not None:
+            self.layouts.move_to_end(key)
+            return lines
+        lines = tuple(font.render(line, True, color)
+                      for line in wrap(text, font, width))
+        self.renders += len(lines)
+        self.layouts[key] = lines
+        if len(self.layouts) > self.size:
+            self.layouts.popitem(last=False)
+        return lines
+
+    def clear(self):
+        """Drop every cached layout, e.g. once its fonts are replaced."""
+        self.layouts.clear()
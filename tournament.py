@@ -0,0 +1,210 @@
+"""
+Round-robin tournaments between bot strategies, spread over all cores.
+
+Strategies are batched strategies.Strategy objects. Every pairing is split
+into fixed-size batches of matches, each played at once by
+montecarlo.simulate_strategies in a worker process with its own Generator
+seeded from (seed, pairing, batch), so a tournament gives the same tables
+whatever the core count or scheduling order. Batch results are merged into
+the league table as they arrive.
+
+    python tournament.py --matches 20000 --workers 8
+"""
+import argparse
+import math
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from montecarlo import COMPUTER_WIN, PLAYER_WIN, TIE, simulate_strategies
+from strategies import STRATEGIES, WeightedStrategy
+
+# Matches played per worker task; large enough to hide the IPC cost
+BATCH_SIZE = 2000
+
+# z for a 95% confidence interval
+Z_95 = 1.959964
+
+DEFAULT_STRATEGIES = [
+    STRATEGIES["uniform"],
+    STRATEGIES["highbat"],
+    STRATEGIES["lowrisk"],
+    WeightedStrategy("Mirror", (4, 3, 2, 1, 1, 1), (1, 1, 1, 2, 3, 4)),
+    STRATEGIES["fixed6"],
+]
+
+
+def winner_counts(count, player, computer, rng):
+    """Matches won by neither, the player and the computer, indexed by code."""
+    if count == 0:
+        return np.zeros(3, dtype=np.int64)
+    result = simulate_strategies(count, player, computer, rng)
+    return np.bincount(result.winner, minlength=3)
+
+
+def play_batch(task):
+    """
+    Worker entry point: play one batch of a pairing.
+
+    Sides alternate between matches so neither strategy always has the
+    Player seat. Returns (a, b, wins_a, wins_b, ties).
+    """
+    a, b, strategy_a, strategy_b, seed, batch, size = task
+    rng = np.random.default_rng([seed, a, b, batch])
+    # a has the Player seat in the first half, b in the second
+    first = winner_counts((size + 1) // 2, strategy_a, strategy_b, rng)
+    second = winner_counts(size // 2, strategy_b, strategy_a, rng)
+    wins_a = first[PLAYER_WIN] + second[COMPUTER_WIN]
+    wins_b = first[COMPUTER_WIN] + second[PLAYER_WIN]
+    ties = first[TIE] + second[TIE]
+    return a, b, int(wins_a), int(wins_b), int(ties)
+
+
+def wilson_interval(successes, trials, z=Z_95):
+    """Wilson score interval for a proportion."""
+    if trials == 0:
+        return 0.0, 1.0
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    centre = (p + z * z / (2 * trials)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / trials +
+                           z * z / (4 * trials * trials)) / denominator
+    return centre - margin, centre + margin
+
+
+class LeagueTable:
+    """Running totals, updated one batch at a time."""
+
+    def __init__(self, strategies):
+        self.names = [strategy.name for strategy in strategies]
+        size = len(strategies)
+        self.wins = [0] * size
+        self.losses = [0] * size
+        self.ties = [0] * size
+        # pairings[(a, b)] = [wins_a, wins_b, ties] with a < b
+        self.pairings = {}
+
+    def add(self, a, b, wins_a, wins_b, ties):
+        self.wins[a] += wins_a
+        self.losses[a] += wins_b
+        self.wins[b] += wins_b
+        self.losses[b] += wins_a
+        self.ties[a] += ties
+        self.ties[b] += ties
+        totals = self.pairings.setdefault((a, b), [0, 0, 0])
+        totals[0] += wins_a
+        totals[1] += wins_b
+        totals[2] += ties
+
+    def played(self, i):
+        return self.wins[i] + self.losses[i] + self.ties[i]
+
+    def points(self, i):
+        """Two points for a win, one for a tie."""
+        return 2 * self.wins[i] + self.ties[i]
+
+    def standings(self):
+        """Rows of (name, played, wins, ties, losses, win rate, ci low, ci high)."""
+        rows = []
+        order = sorted(range(len(self.names)),
+                       key=lambda i: (-self.points(i), self.names[i]))
+        for i in order:
+            played = self.played(i)
+            low, high = wilson_interval(self.wins[i], played)
+            rows.append((self.names[i], played, self.wins[i], self.ties[i],
+                         self.losses[i], self.wins[i] / max(played, 1), low,
+                         high))
+        return rows
+
+    def pairing_win_rate(self, a, b):
+        """Share of the a vs b matches won by a, with its interval."""
+        if a > b:
+            wins_b, wins_a, ties = self.pairings.get((b, a), (0, 0, 0))
+        else:
+            wins_a, wins_b, ties = self.pairings.get((a, b), (0, 0, 0))
+        played = wins_a + wins_b + ties
+        return (wins_a / max(played, 1),) + wilson_interval(wins_a, played)
+
+    def format(self):
+        lines = [f"{'Strategy':<12}{'P':>9}{'W':>9}{'T':>8}{'L':>9}"
+                 f"{'Win%':>8}  95% CI"]
+        for name, played, wins, ties, losses, rate, low, high in \
+                self.standings():
+            lines.append(f"{name:<12}{played:>9}{wins:>9}{ties:>8}"
+                         f"{losses:>9}{rate:>8.1%}  "
+                         f"[{low:.1%}, {high:.1%}]")
+        lines.append("")
+        lines.append("Pairing win rate (row beats column)")
+        lines.append(" " * 12 + "".join(f"{name[:9]:>10}"
+                                        for name in self.names))
+        for a, name in enumerate(self.names):
+            cells = []
+            for b in range(len(self.names)):
+                cells.append(f"{'-':>10}" if a == b else
+                             f"{self.pairing_win_rate(a, b)[0]:>10.1%}")
+            lines.append(f"{name:<12}" + "".join(cells))
+        return "\n".join(lines)
+
+
+def tasks(strategies, matches, seed, batch_size):
+    """Yield one task per batch of every pairing."""
+    for a in range(len(strategies)):
+        for b in range(a + 1, len(strategies)):
+            for batch, start in enumerate(range(0, matches, batch_size)):
+                yield (a, b, strategies[a], strategies[b], seed, batch,
+                       min(batch_size, matches - start))
+
+
+def run_tournament(strategies, matches, seed=0, workers=None,
+                   batch_size=BATCH_SIZE, on_batch=None):
+    """
+    Play `matches` games for every pairing and return the LeagueTable.
+
+    At most a few tasks per worker are in flight, so memory stays flat no
+    matter how many strategies take part. on_batch(table) is called after
+    each merged batch.
+    """
+    table = LeagueTable(strategies)
+    workers = workers or os.cpu_count() or 1
+    pending = tasks(strategies, matches, seed, batch_size)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = set()
+        for task in pending:
+            in_flight.add(executor.submit(play_batch, task))
+            if len(in_flight) >= workers * 4:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    table.add(*future.result())
+                    if on_batch:
+                        on_batch(table)
+        for future in wait(in_flight).done:
+            table.add(*future.result())
+            if on_batch:
+                on_batch(table)
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--matches", type=int, default=10000,
+                        help="matches per pairing")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    table = run_tournament(DEFAULT_STRATEGIES, args.matches, args.seed,
+                           args.workers, args.batch_size)
+    elapsed = time.perf_counter() - started
+    total = sum(map(sum, table.pairings.values()))
+    print(table.format())
+    print(f"\n{total} matches in {elapsed:.2f}s "
+          f"({total / elapsed:,.0f} matches/s)")
+
+
+if __name__ == "__main__":
+    main()